@@ -3,11 +3,9 @@ from typing import List
 import requests
 import json
 # project
-from src.tools.tools import open_app_tool, close_app_tool, turn_off_pc_tool, restart_pc_tool, get_weather_tool
-from src.tools.computer_state_tools.monitoring_tools.monitoring_tool import start_monitoring_cpu_tool, stop_monitoring_cpu_tool, start_monitoring_gpu_tool, stop_monitoring_gpu_tool
-from src.tools.computer_state_tools.drives_info import get_drives_info
-from src.tools.web_work_tools import tavily_web_search_tool
-from src.tools.internet_speed import test_internet_speed
+from src.tools.tool_guard import guard_tools
+from src.tools.tool_output import budget_tools
+from src.tools.tools_list import lazy_tools
 from langchain_core.prompts import ChatPromptTemplate
 from src.schemas.schemas import Settings
 # 3rd party
@@ -57,20 +55,9 @@ class SlothAgent:
         Returns:
             None: None
         """
-        self.tools = [
-            test_internet_speed,
-            open_app_tool,
-            close_app_tool,
-            turn_off_pc_tool,
-            restart_pc_tool,
-            tavily_web_search_tool,
-            start_monitoring_cpu_tool,
-            stop_monitoring_cpu_tool,
-            start_monitoring_gpu_tool,
-            stop_monitoring_gpu_tool,
-            get_weather_tool,
-            get_drives_info,
-        ]
+        # Tool modules are imported on the first call of one of their tools,
+        # every call runs with a timeout and a circuit breaker
+        self.tools = budget_tools(guard_tools(lazy_tools()), budget=config.user_settings.agent_settings.tool_output_budget)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", '''Your name is Slothy. {agent_settings.prompt}'''.format(
                 agent_settings=config.user_settings.agent_settings)),
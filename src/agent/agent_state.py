@@ -1,3 +1,5 @@
+# python
+from typing import List
 # project
 from src.schemas.classes import ChatState
 from src.models.models import Models
@@ -58,6 +60,112 @@ def create_message_bubble(message: Message) -> ft.Container:
     )
 
 
+class ChatList:
+    """
+    Virtualized chat message list.
+
+    Only a window of at most `max_live` messages has controls, in an
+    ft.ListView that builds the visible ones on demand. Scrolling to the top
+    of the window pages older messages in and drops the newest ones, scrolling
+    back down does the opposite, so the control tree and every update stay
+    the same size however long the chat gets.
+
+    Attributes:
+        messages: all messages of the chat, shared with the ChatState
+        view: the ListView to put on the page
+        start: index of the first message with a control
+    """
+
+    def __init__(self, messages: List[Message], max_live: int = 60, page_size: int = 20):
+        self.messages = messages
+        self.max_live = max_live
+        self.page_size = page_size
+        self.start = max(0, len(messages) - max_live)
+        # Controls below the messages, such as the thinking bubble
+        self._transient: List[ft.Control] = []
+        self.view = ft.ListView(
+            controls=[self._bubble(i) for i in range(self.start, len(messages))],
+            spacing=8,
+            expand=True,
+            build_controls_on_demand=True,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll,
+        )
+
+    @property
+    def end(self) -> int:
+        """Index after the last message with a control."""
+        return self.start + len(self.view.controls) - len(self._transient)
+
+    def _bubble(self, index: int) -> ft.Control:
+        bubble = create_message_bubble(self.messages[index])
+        bubble.key = f"message-{index}"
+        return bubble
+
+    def add_message(self, message: Message) -> None:
+        """Add a message to the chat, call scroll_to_end once it is on the page."""
+        self.messages.append(message)
+        if self.end < len(self.messages) - 1:
+            # Paged back into older messages, jump to the newest ones
+            self._show_latest()
+        else:
+            self.view.controls.insert(len(self.view.controls) - len(self._transient), self._bubble(len(self.messages) - 1))
+            self._trim_top()
+
+    def add_control(self, control: ft.Control) -> None:
+        """Show a control below the messages until remove_control is called."""
+        self._transient.append(control)
+        self.view.controls.append(control)
+
+    def scroll_to_end(self) -> None:
+        self.view.scroll_to(offset=-1, duration=200)
+
+    def remove_control(self, control: ft.Control) -> None:
+        if control in self._transient:
+            self._transient.remove(control)
+            self.view.controls.remove(control)
+
+    def _show_latest(self) -> None:
+        self.start = max(0, len(self.messages) - self.max_live)
+        self.view.controls = [self._bubble(i) for i in range(self.start, len(self.messages))] + self._transient
+
+    def _trim_top(self) -> None:
+        extra = self.end - self.start - self.max_live
+        if extra > 0:
+            del self.view.controls[:extra]
+            self.start += extra
+
+    def _on_scroll(self, e: ft.OnScrollEvent) -> None:
+        if e.pixels <= e.min_scroll_extent + 50 and self.start > 0:
+            self._page_older()
+        elif e.pixels >= e.max_scroll_extent - 50 and self.end < len(self.messages):
+            self._page_newer()
+
+    def _page_older(self) -> None:
+        first_key = f"message-{self.start}"
+        new_start = max(0, self.start - self.page_size)
+        self.view.controls[0:0] = [self._bubble(i) for i in range(new_start, self.start)]
+        self.start = new_start
+        # Drop the newest messages beyond the cap, they are paged in again when scrolling down
+        extra = self.end - self.start - self.max_live
+        if extra > 0:
+            keep = len(self.view.controls) - len(self._transient) - extra
+            self.view.controls = self.view.controls[:keep] + self._transient
+        self.view.update()
+        # Keep the message that was on top in place
+        self.view.scroll_to(key=first_key)
+
+    def _page_newer(self) -> None:
+        end = self.end
+        new_end = min(len(self.messages), end + self.page_size)
+        position = len(self.view.controls) - len(self._transient)
+        self.view.controls[position:position] = [self._bubble(i) for i in range(end, new_end)]
+        self._trim_top()
+        self.view.update()
+        # Keep the message that was at the bottom in place
+        self.view.scroll_to(key=f"message-{end - 1}")
+
+
 def initialize_chat_state(chat_state: ChatState):
     """Initialize the chat state with default values."""
     if chat_state.agent is None:
@@ -84,12 +192,5 @@ def initialize_chat_state(chat_state: ChatState):
             chat_state.agent = None
             chat_state.current_model = ""
 
-        # Initialize chat container
-        chat_state.chat_container = ft.Column(
-            controls=[create_message_bubble(msg)
-                      for msg in chat_state.messages],
-            scroll=ft.ScrollMode.AUTO,
-            spacing=8,
-            expand=False,
-            width=float('inf')
-        )
+        # Initialize chat list
+        chat_state.chat_list = ChatList(chat_state.messages)
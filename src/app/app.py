@@ -3,7 +3,16 @@ from src.schemas.classes import ChatState
 from src.pages.settings_page_assets import create_settings_view
 from src.schemas.schemas import Settings
 from src.pages.main_page_assets import create_main_view
+from src.pages.monitor_page_assets import (create_monitor_view, monitor_kind, set_monitor_visible,
+                                           start_monitor, stop_monitor)
+from src.pages.view_router import get_view_router
+from src.tools.computer_state_tools.monitoring_tools.dashboard import MONITORS
 from src.agent.agent_state import initialize_chat_state
+from src.tools.computer_state_tools.monitoring_tools.metrics_sampler import close_sampler, get_sampler
+from src.tools.computer_state_tools.monitoring_tools.alerts import AlertEngine, AlertRule
+from src.tools.computer_state_tools.monitoring_tools.monitoring_tool import set_app_page
+from src.tools.file_search import get_file_index
+from src.pages.update_scheduler import get_update_scheduler
 # 3rd party
 import flet as ft
 
@@ -20,14 +29,66 @@ def on_route_change(e) -> None:
         e: Route change event
     """
     page = e.page
-    page.views.clear()
+    stop_monitor()
 
-    if page.route == "/settings":
-        page.views.append(create_settings_view(page, chat_state))
-    else:
-        page.views.append(create_main_view(page, chat_state, micr_state))
+    # The chat view stays below the other views, so the chat keeps updating,
+    # and every view is built once and shown again on later visits
+    route = page.route
+    if route.startswith("/monitor"):
+        route = f"/monitor/{monitor_kind(route)}"
+    get_view_router(page).show(route)
 
     page.update()
+    if route.startswith("/monitor"):
+        start_monitor(monitor_kind(route))
+
+
+def on_app_lifecycle_state_change(e) -> None:
+    """Pause the dashboards while the window is hidden or minimized.
+
+    Args:
+        e: App lifecycle state change event
+    """
+    if e.state in (ft.AppLifecycleState.HIDE, ft.AppLifecycleState.PAUSE):
+        set_monitor_visible(False)
+    elif e.state in (ft.AppLifecycleState.SHOW, ft.AppLifecycleState.RESUME):
+        set_monitor_visible(True)
+
+
+def on_view_pop(e) -> None:
+    """Go back to the chat when the top view is closed.
+
+    Args:
+        e: View pop event
+    """
+    e.page.go("/")
+
+
+def start_alerts(page: ft.Page) -> None:
+    """Show a notification when a monitoring alert rule fires.
+
+    Args:
+        page (ft.Page): Page the notifications are shown on
+    """
+    monitoring = config.user_settings.monitoring_settings
+    if not monitoring.alerts_enabled:
+        return
+    sampler = get_sampler()
+    engine = AlertEngine.from_settings(monitoring, sampler.fields())
+
+    def notify(rule: AlertRule) -> None:
+        page.open(
+            ft.SnackBar(
+                content=ft.Text(rule.describe(), color=ft.Colors.WHITE),
+                bgcolor=ft.Colors.ORANGE_700,
+                behavior=ft.SnackBarBehavior.FLOATING,
+                action="OK",
+            )
+        )
+
+    engine.add_handler(notify)
+    sampler.add_listener(engine.process)
+    sampler.subscribe("alerts", monitoring.background_interval)
 
 
 def app_page(page: ft.Page) -> None:
@@ -49,11 +110,27 @@ def app_page(page: ft.Page) -> None:
     # Initialize chat state
     initialize_chat_state(chat_state=chat_state)
 
+    # Start recording system metrics so the agent can answer questions about the past
+    get_sampler()
+    start_alerts(page)
+    # Keep the file search index up to date in the background
+    get_file_index()
+
     # Navigation setup
     page.on_route_change = on_route_change
-    page.on_resized = lambda _: page.update()
+    page.on_view_pop = on_view_pop
+    page.on_app_lifecycle_state_change = on_app_lifecycle_state_change
+    # Free the sampler's shared memory when the session ends, atexit covers a killed window
+    page.on_close = lambda _: close_sampler()
+    set_app_page(page)
+    # Resize events come in bursts while the window is dragged
+    page.on_resized = lambda _: get_update_scheduler(page).schedule()
 
-    # Initialize views
-    page.views.clear()
-    page.views.append(create_main_view(page, chat_state, micr_state))
+    # Initialize views, they are built on their first visit
+    router = get_view_router(page)
+    router.add("/", lambda: create_main_view(page, chat_state, micr_state))
+    router.add("/settings", lambda: create_settings_view(page, chat_state))
+    for kind in MONITORS:
+        router.add(f"/monitor/{kind}", lambda kind=kind: create_monitor_view(page, kind))
+    router.show("/")
     page.update()
@@ -1,10 +1,15 @@
 # project
+import threading
 import flet as ft
 from src.schemas.classes import Message, ChatState
 from src.models.models import Models
 from src.voice.voice_recognition import VoiceRecognition
+from src.voice.wake_word import WakeWordDetector
 from src.agent.agent_state import initialize_chat_state, create_message_bubble
 from src.schemas.schemas import Settings
+from src.tools.tool_guard import tool_guard
+from src.pages.update_scheduler import get_update_scheduler
+from src.pages.view_router import get_view_router
 
 # settings
 config = Settings.from_json_file('src/app/settings.json')
@@ -18,10 +23,12 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
     """
     # Get available models
     available_models = Models.get_available_models()
+    # Changes of the chat are sent to the client together, at most once per frame
+    updates = get_update_scheduler(page)
 
     # Create chat container using global state
     chat_container = ft.Container(
-        content=chat_state.chat_container,
+        content=chat_state.chat_list.view if chat_state.chat_list else None,
         bgcolor=ft.Colors.GREY_800,
         border_radius=ft.border_radius.all(12),
         padding=ft.padding.all(16),
@@ -64,6 +71,62 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                                   scale=ft.Scale(scale=1.0),
                                   animate_scale=ft.Animation(600, ft.AnimationCurve.BOUNCE_OUT),)
 
+    # Tool health indicator, red while a tool is switched off by its circuit breaker
+    tool_health_button = ft.IconButton(
+        icon=ft.Icons.HEALTH_AND_SAFETY,
+        icon_color=ft.Colors.GREEN_400,
+        tooltip="All tools are working",
+        on_click=lambda e: show_tool_health(e)
+    )
+
+    def update_tool_health() -> None:
+        """Color the tool health indicator by the state of the tools."""
+        health = tool_guard.health()
+        unavailable = [tool["tool"] for tool in health if tool["state"] != "closed"]
+        failing = [tool["tool"] for tool in health if tool["state"] == "closed" and tool["failures_in_a_row"]]
+        if unavailable:
+            tool_health_button.icon_color = ft.Colors.RED_400
+            tool_health_button.tooltip = f"Unavailable tools: {', '.join(unavailable)}"
+        elif failing:
+            tool_health_button.icon_color = ft.Colors.ORANGE_400
+            tool_health_button.tooltip = f"Failing tools: {', '.join(failing)}"
+        else:
+            tool_health_button.icon_color = ft.Colors.GREEN_400
+            tool_health_button.tooltip = "All tools are working"
+
+    def show_tool_health(e) -> None:
+        """Show the state, failures and timing of every tool used so far.
+
+        Args:
+            e : The event triggered by the button click.
+        """
+        colors = {"open": ft.Colors.RED_400, "half_open": ft.Colors.ORANGE_400, "closed": ft.Colors.GREEN_400}
+        health = tool_guard.health()
+        if health:
+            content = ft.DataTable(
+                columns=[ft.DataColumn(ft.Text(title)) for title in ("Tool", "State", "Failures", "Avg s", "Last error")],
+                rows=[
+                    ft.DataRow(cells=[
+                        ft.DataCell(ft.Text(tool["tool"])),
+                        ft.DataCell(ft.Text(tool["state"].replace("_", " "), color=colors[tool["state"]])),
+                        ft.DataCell(ft.Text(str(tool["failures_in_a_row"]))),
+                        ft.DataCell(ft.Text(str(tool["average_seconds"]))),
+                        ft.DataCell(ft.Text(tool.get("last_error", ""), max_lines=2,
+                                            overflow=ft.TextOverflow.ELLIPSIS, width=300)),
+                    ])
+                    for tool in health
+                ]
+            )
+        else:
+            content = ft.Text("No tool has been used yet.")
+        dialog = ft.AlertDialog(
+            title=ft.Text("Tool health"),
+            content=ft.Column([content], scroll=ft.ScrollMode.AUTO, tight=True),
+            actions=[ft.TextButton("Close", on_click=lambda _: page.close(dialog))]
+        )
+        update_tool_health()
+        page.open(dialog)
+
     microphone_on_message = ft.SnackBar(
         content=ft.Text(
             "Microphone enabled. You can say your command", color=ft.Colors.WHITE),
@@ -89,14 +152,8 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                 message=transcribed_text,
                 is_user=True
             )
-            chat_state.messages.append(user_message)
-
-            if chat_state.chat_container:
-                chat_state.chat_container.controls.append(
-                    create_message_bubble(user_message))
-                chat_state.chat_container.scroll_to(
-                    offset=-1, duration=200)
-                page.update()
+            if chat_state.chat_list:
+                chat_state.chat_list.add_message(user_message)
 
             thinking_message = Message(
                 name="Slothy",
@@ -106,10 +163,10 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
 
             thinking_container = create_message_bubble(thinking_message)
 
-            if chat_state.chat_container:
-                chat_state.chat_container.controls.append(thinking_container)
-                chat_state.chat_container.scroll_to(offset=-1, duration=200)
-                page.update()
+            if chat_state.chat_list:
+                chat_state.chat_list.add_control(thinking_container)
+                # Sent with the user message in one update
+                updates.schedule(after=chat_state.chat_list.scroll_to_end)
 
             if chat_state.agent:
                 text = transcribed_text.strip()
@@ -121,16 +178,11 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                     is_user=False
                 )
 
-                if chat_state.chat_container:
-                    chat_state.chat_container.controls.remove(
-                        thinking_container)
-                    chat_state.chat_container.controls.append(
-                        create_message_bubble(ai_message)
-                    )
-                    chat_state.messages.append(ai_message)
-                    chat_state.chat_container.scroll_to(
-                        offset=-1, duration=200)
-                    page.update()
+                if chat_state.chat_list:
+                    chat_state.chat_list.remove_control(thinking_container)
+                    chat_state.chat_list.add_message(ai_message)
+                    update_tool_health()
+                    updates.schedule(after=chat_state.chat_list.scroll_to_end)
 
     def reconnect_to_ollama(e) -> None:
         """Attempt to reconnect to Ollama service.
@@ -173,8 +225,10 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                         action="OK",
                     )
                 )
-            page.views.clear()
-            page.views.append(create_main_view(page, chat_state, micr_state))
+            # The models and the agent changed, build the chat view with them. The
+            # new view has its own voice recognition, so this one stops listening
+            voice_recognition.stop_recording()
+            get_view_router(page).rebuild("/")
 
         except Exception as err:
             page.open(
@@ -195,9 +249,36 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
 
         page.update()
 
+    voice_settings = config.user_settings.voice_settings
+    wake_word = None
+    if voice_settings.wake_word_enabled:
+        wake_word = WakeWordDetector(phrase=voice_settings.wake_word_phrase,
+                                     sensitivity=voice_settings.wake_word_sensitivity)
+
+    wake_word_message = ft.SnackBar(
+        content=ft.Text(
+            "I'm listening...", color=ft.Colors.WHITE),
+        bgcolor=ft.Colors.BLUE_400,
+        behavior=ft.SnackBarBehavior.FLOATING,
+    )
+
+    def on_wake_word() -> None:
+        """Notify the user that the wake word was heard."""
+        page.open(wake_word_message)
+        page.update()
+
     voice_recognition = VoiceRecognition(
-        on_transcribe_callback=process_voice_input
+        on_transcribe_callback=process_voice_input,
+        wake_word=wake_word,
+        awake_timeout=voice_settings.awake_timeout,
+        on_wake_callback=on_wake_word,
+        wake_word_fallback=voice_settings.wake_word_whisper_fallback
     )
+    if wake_word is not None and not wake_word.ready:
+        print("Warning: wake word mode needs enrolled templates (python -m src.voice.wake_word enroll) "
+              "or wake_word_whisper_fallback, using the microphone button instead.")
+        voice_recognition.wake_word = None
+        voice_recognition.awake = True
 
     def change_microphone_state(e) -> None:
         """Toggle the microphone state.
@@ -313,14 +394,8 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                 message=text,
                 is_user=True
             )
-            chat_state.messages.append(user_message)
-
-            if chat_state.chat_container:
-                chat_state.chat_container.controls.append(
-                    create_message_bubble(user_message)
-                )
-                chat_state.chat_container.scroll_to(offset=-1, duration=200)
-                page.update()
+            if chat_state.chat_list:
+                chat_state.chat_list.add_message(user_message)
 
             thinking_message = Message(
                 name="Slothy",
@@ -329,10 +404,10 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
             )
             thinking_container = create_message_bubble(thinking_message)
 
-            if chat_state.chat_container:
-                chat_state.chat_container.controls.append(thinking_container)
-                chat_state.chat_container.scroll_to(offset=-1, duration=200)
-                page.update()
+            if chat_state.chat_list:
+                chat_state.chat_list.add_control(thinking_container)
+                # Sent with the user message in one update
+                updates.schedule(after=chat_state.chat_list.scroll_to_end)
 
             if chat_state.agent:
                 response = chat_state.agent.invoke_agent(text)
@@ -343,16 +418,11 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                     is_user=False
                 )
 
-                if chat_state.chat_container:
-                    chat_state.chat_container.controls.remove(
-                        thinking_container)
-                    chat_state.chat_container.controls.append(
-                        create_message_bubble(ai_message)
-                    )
-                    chat_state.messages.append(ai_message)
-                    chat_state.chat_container.scroll_to(
-                        offset=-1, duration=200)
-                    page.update()
+                if chat_state.chat_list:
+                    chat_state.chat_list.remove_control(thinking_container)
+                    chat_state.chat_list.add_message(ai_message)
+                    update_tool_health()
+                    updates.schedule(after=chat_state.chat_list.scroll_to_end)
 
     def model_switch(e) -> None:
         """Switch the model used by the SlothAgent.
@@ -403,7 +473,8 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
                     ],
                     alignment=ft.MainAxisAlignment.CENTER,
                     expand=True
-                )
+                ),
+                tool_health_button
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN
         ),
@@ -440,8 +511,23 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
         border_radius=ft.border_radius.all(12)
     )
 
+    if voice_recognition.wake_word is not None:
+        # Wake word mode listens from the start, the microphone button turns it off
+        micr_state = True
+        microphone_button.icon = ft.Icons.MIC
+        threading.Thread(target=voice_recognition.start_recording, args=(micr_container, page),
+                         daemon=True, name="wake-word").start()
+
+    def refresh() -> None:
+        """Bring the view up to date when it is shown again."""
+        if chat_state.chat_list:
+            chat_container.content = chat_state.chat_list.view
+        if isinstance(model_switch_dropdown, ft.Dropdown):
+            model_switch_dropdown.value = chat_state.current_model
+        update_tool_health()
+
     # Return the main view with all components
-    return ft.View(
+    main_view = ft.View(
         route="/",
         controls=[
             header,
@@ -453,3 +539,6 @@ def create_main_view(page: ft.Page, chat_state: ChatState, micr_state: bool) ->
         padding=ft.padding.all(16),
         spacing=20
     )
+    # Called by the view router when the view is shown again
+    main_view.data = refresh
+    return main_view
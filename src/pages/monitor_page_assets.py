@@ -0,0 +1,137 @@
+# python
+from typing import Dict, Optional
+# project
+from src.tools.computer_state_tools.monitoring_tools.dashboard import MONITORS
+from src.tools.computer_state_tools.monitoring_tools.metrics_sampler import get_sampler
+from src.tools.computer_state_tools.monitoring_tools.monitoring_class import Monitor
+# 3rd party
+import flet as ft
+
+MONITOR_TITLES = {
+    "system": "System",
+    "cpu": "CPU & Memory",
+    "cores": "CPU Cores",
+    "disk": "Disk",
+    "network": "Network",
+    "gpu": "GPU",
+}
+
+# Monitor of the currently shown monitoring view
+active_monitor: Optional[Monitor] = None
+# Monitors of the built monitoring views by kind, they keep their charts while hidden
+monitors: Dict[str, Monitor] = {}
+# Sampler subscription name of the visible dashboard
+SUBSCRIPTION = "dashboard"
+
+
+def monitor_kind(route: str) -> str:
+    """Return the monitor kind of a route, e.g. "/monitor/gpu" -> "gpu".
+
+    Args:
+        route (str): Page route starting with "/monitor".
+
+    Returns:
+        str: Key of MONITORS, "system" for "/monitor" or an unknown kind.
+    """
+    kind = route.rstrip("/").split("/")[-1]
+    return kind if kind in MONITORS else "system"
+
+
+def create_monitor_view(page: ft.Page, kind: str) -> ft.View:
+    """Create the monitoring view with the charts of one monitor.
+
+    The charts read from the app's shared metrics sampler, so the view opens
+    without starting a process. Call start_monitor after the view is shown.
+
+    Returns:
+        ft.View: The monitoring view
+    """
+    monitor = monitors[kind] = MONITORS[kind](get_sampler().buffer)
+
+    # Header with back button and monitor selector
+    header = ft.Row(
+        controls=[
+            ft.IconButton(
+                icon=ft.Icons.ARROW_BACK,
+                icon_color=ft.Colors.BLUE_400,
+                on_click=lambda _: page.go("/")
+            ),
+            ft.Text(
+                "Monitoring",
+                size=24,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE
+            ),
+            ft.Dropdown(
+                options=[
+                    ft.dropdown.Option(name, title)
+                    for name, title in MONITOR_TITLES.items()
+                ],
+                value=kind,
+                width=180,
+                text_size=14,
+                on_change=lambda e: page.go(f"/monitor/{e.control.value}")
+            ),
+        ],
+        alignment=ft.MainAxisAlignment.START
+    )
+
+    monitor_view = ft.View(
+        route=f"/monitor/{kind}",
+        controls=[
+            header,
+            ft.Divider(height=1, color=ft.Colors.GREY_700),
+            *monitor.build_dashboard(page),
+        ],
+        bgcolor=ft.Colors.GREY_900,
+        padding=ft.padding.all(16),
+        spacing=20,
+        scroll=ft.ScrollMode.AUTO
+    )
+    # Called by the view router when the view is shown again
+    monitor_view.data = monitor.redraw
+    return monitor_view
+
+
+def start_monitor(kind: str) -> None:
+    """Start updating the charts of the shown monitoring view.
+
+    The sampler runs at its full rate only while a dashboard is shown.
+
+    Args:
+        kind (str): Key of MONITORS of the shown view
+    """
+    global active_monitor
+    stop_monitor()
+    active_monitor = monitors.get(kind)
+    if active_monitor is not None:
+        get_sampler().subscribe(SUBSCRIPTION)
+        active_monitor.start_monitoring()
+
+
+def stop_monitor() -> None:
+    """Stop the monitoring view updates, if a monitor is running.
+
+    The monitor keeps its charts, so showing its view again continues them.
+    """
+    global active_monitor
+    if active_monitor is not None:
+        active_monitor.stop_monitoring(keep_dashboard=True)
+        active_monitor = None
+        get_sampler().unsubscribe(SUBSCRIPTION)
+
+
+def set_monitor_visible(visible: bool) -> None:
+    """Pause the monitoring view while the window is hidden or minimized.
+
+    Args:
+        visible (bool): Whether the app window is visible
+    """
+    if active_monitor is None:
+        return
+    if visible:
+        get_sampler().subscribe(SUBSCRIPTION)
+        active_monitor.resume()
+    else:
+        active_monitor.pause()
+        get_sampler().unsubscribe(SUBSCRIPTION)
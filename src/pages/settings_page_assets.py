@@ -1,9 +1,13 @@
+# python
+import os
 # project
 from src.schemas.classes import ChatState
 from src.schemas.schemas import Settings
 # 3rd party
 import flet as ft
 
+SETTINGS_PATH = 'src/app/settings.json'
+
 
 def create_settings_view(page: ft.Page, chat_state: ChatState) -> ft.View:
     """Create the settings view with all its controls.
@@ -11,7 +15,9 @@ def create_settings_view(page: ft.Page, chat_state: ChatState) -> ft.View:
     Returns:
         ft.View: The settings view
     """
-    config = Settings.from_json_file('src/app/settings.json')
+    config = Settings.from_json_file(SETTINGS_PATH)
+    # The file is read again only if it changed since the view was built
+    loaded_mtime = os.path.getmtime(SETTINGS_PATH)
     saved_bar = ft.SnackBar(
         content=ft.Text("Saved",
                         color=ft.Colors.WHITE),
@@ -180,8 +186,21 @@ def create_settings_view(page: ft.Page, chat_state: ChatState) -> ft.View:
         border=ft.border.all(1, ft.Colors.GREY_700)
     )
 
+    def refresh() -> None:
+        """Show the values of settings.json if it changed since it was last read."""
+        nonlocal loaded_mtime
+        mtime = os.path.getmtime(SETTINGS_PATH)
+        if mtime == loaded_mtime:
+            return
+        loaded_mtime = mtime
+        agent_settings = Settings.from_json_file(SETTINGS_PATH).user_settings.agent_settings
+        temperature_bar.value = agent_settings.temperature
+        top_k_bar.value = agent_settings.top_k
+        top_p_bar.value = agent_settings.top_p
+        num_predict_bar.value = agent_settings.num_predict
+
     # Combine all elements in a view
-    return ft.View(
+    settings_view = ft.View(
         route="/settings",
         controls=[
             header,
@@ -192,3 +211,6 @@ def create_settings_view(page: ft.Page, chat_state: ChatState) -> ft.View:
         padding=ft.padding.all(16),
         spacing=20
     )
+    # Called by the view router when the view is shown again
+    settings_view.data = refresh
+    return settings_view
@@ -0,0 +1,113 @@
+# python
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+# 3rd party
+import flet as ft
+
+# Seconds between two updates sent to the Flet client, about 30 frames per second
+FRAME_INTERVAL = 1 / 30
+
+
+class UpdateScheduler:
+    """
+    Coalesces page updates into at most one per frame.
+
+    Any thread marks controls as changed with schedule(). A background
+    thread sends them together at most once every `interval` seconds, so
+    several changes in the same frame cost one message to the Flet client
+    and controls changed many times are sent once. Calling schedule()
+    without controls updates the whole page.
+
+    Attributes:
+        page: page the updates are sent to
+        interval: minimum seconds between two updates
+        requested: number of schedule() calls
+        sent: number of updates sent to the client
+    """
+
+    def __init__(self, page: ft.Page, interval: float = FRAME_INTERVAL):
+        self.page = page
+        self.interval = interval
+        self.requested = 0
+        self.sent = 0
+        self._dirty: Dict[int, ft.Control] = {}
+        self._full = False
+        self._after: List[Callable[[], None]] = []
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name="ui-updates")
+        self._thread.start()
+
+    def schedule(self, *controls: ft.Control, after: Optional[Callable[[], None]] = None) -> None:
+        """Send the changes of `controls`, or of the whole page, with the next frame.
+
+        Args:
+            controls (ft.Control): Changed controls, none for the whole page.
+            after (Optional[Callable[[], None]]): Called once the update was sent, e.g. to
+                scroll to a control that has to reach the client first.
+        """
+        with self._lock:
+            self.requested += 1
+            if after is not None:
+                self._after.append(after)
+            if controls:
+                for control in controls:
+                    self._dirty[id(control)] = control
+            else:
+                self._full = True
+        self._wake_event.set()
+
+    def flush(self) -> None:
+        """Send the scheduled changes now."""
+        with self._lock:
+            controls = list(self._dirty.values())
+            full = self._full
+            after, self._after = self._after, []
+            self._dirty.clear()
+            self._full = False
+        if not controls and not full and not after:
+            return
+        try:
+            if full:
+                self.page.update()
+            elif controls:
+                self.page.update(*controls)
+            self.sent += 1
+            for callback in after:
+                callback()
+        except Exception as e:
+            print(f"Warning: UI update failed: {e}")
+        self._last_flush = time.monotonic()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake_event.wait()
+            self._wake_event.clear()
+            # Changes scheduled during the wait join this frame
+            delay = self._last_flush + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.flush()
+
+    def stats(self) -> dict:
+        """Updates requested and sent so far."""
+        return {
+            "requested": self.requested,
+            "sent": self.sent,
+            "coalesced_percent": round(100 * (1 - self.sent / self.requested), 1) if self.requested else 0.0,
+        }
+
+
+_schedulers: Dict[int, UpdateScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_update_scheduler(page: ft.Page) -> UpdateScheduler:
+    """Return the update scheduler of a page, creating it on first use."""
+    with _schedulers_lock:
+        scheduler: Optional[UpdateScheduler] = _schedulers.get(id(page))
+        if scheduler is None or scheduler.page is not page:
+            scheduler = _schedulers[id(page)] = UpdateScheduler(page)
+        return scheduler
@@ -0,0 +1,89 @@
+# python
+import threading
+from typing import Callable, Dict, Optional
+# 3rd party
+import flet as ft
+
+
+class ViewRouter:
+    """
+    Builds every view of the app once and keeps it across route changes.
+
+    Views are registered with a function that builds them. The first visit
+    of a route builds its view, later visits show the same view again, so
+    navigation does not query Ollama, read settings.json or create controls.
+    A view whose `data` is a function without arguments is refreshed by
+    calling it every time it is shown again, so it only updates the parts
+    whose data changed. Every view but the root one is shown on top of the
+    root view, which is never removed from the page.
+
+    Attributes:
+        page: page the views are shown on
+        root: route of the view below all others
+        builds: number of views built so far
+    """
+
+    def __init__(self, page: ft.Page, root: str = "/"):
+        self.page = page
+        self.root = root
+        self.builds = 0
+        self._builders: Dict[str, Callable[[], ft.View]] = {}
+        self._views: Dict[str, ft.View] = {}
+
+    def add(self, route: str, build: Callable[[], ft.View]) -> None:
+        """Register the function that builds the view of a route."""
+        self._builders[route] = build
+
+    def view(self, route: str) -> ft.View:
+        """Return the view of a route, building it on first use.
+
+        Raises:
+            KeyError: If no view is registered for the route.
+        """
+        view = self._views.get(route)
+        if view is None:
+            view = self._views[route] = self._builders[route]()
+            self.builds += 1
+        return view
+
+    def show(self, route: str) -> ft.View:
+        """Put the view of a route on the page, unknown routes show the root view.
+
+        The page is not updated, call page.update() afterwards.
+        """
+        if route not in self._builders:
+            route = self.root
+        cached = route in self._views
+        view = self.view(route)
+        if cached and callable(view.data):
+            view.data()
+        stack = [view] if route == self.root else [self.view(self.root), view]
+        if self.page.views != stack:
+            self.page.views[:] = stack
+        return view
+
+    def rebuild(self, route: str) -> Optional[ft.View]:
+        """Build the view of a route again, e.g. after the data it was built from changed.
+
+        Returns:
+            Optional[ft.View]: The new view if the route was shown, None otherwise.
+        """
+        old = self._views.pop(route, None)
+        if old is None or old not in self.page.views:
+            return None
+        view = self.view(route)
+        self.page.views[self.page.views.index(old)] = view
+        return view
+
+
+_routers: Dict[int, ViewRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_view_router(page: ft.Page) -> ViewRouter:
+    """Return the view router of a page, creating it on first use."""
+    with _routers_lock:
+        router: Optional[ViewRouter] = _routers.get(id(page))
+        if router is None or router.page is not page:
+            router = _routers[id(page)] = ViewRouter(page)
+        return router
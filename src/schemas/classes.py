@@ -1,10 +1,10 @@
 # python
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 # project
 from src.agent.agent import SlothAgent
-# 3rd party
-import flet as ft
+if TYPE_CHECKING:
+    from src.agent.agent_state import ChatList
 
 
 class Message:
@@ -22,4 +22,4 @@ class ChatState:
         self.messages: list[Message] = []
         self.current_model: str = ""
         self.agent: Optional[SlothAgent] = None
-        self.chat_container: Optional[ft.Column] = None
+        self.chat_list: Optional["ChatList"] = None
@@ -1,4 +1,5 @@
 import json
+from typing import List
 from pydantic import BaseModel, Field
 from pathlib import Path
 
@@ -17,6 +18,55 @@ class AgentSettings(BaseModel):
     num_predict: int = Field(default=128)
     top_k: int = Field(default=40)
     top_p: float = Field(default=0.95)
+    tool_output_budget: int = Field(default=800)
+
+
+class VoiceSettings(BaseModel):
+    """Voice settings model."""
+    wake_word_enabled: bool = Field(default=False)
+    wake_word_phrase: str = Field(default="hey slothy")
+    wake_word_sensitivity: float = Field(default=1.3)
+    wake_word_whisper_fallback: bool = Field(default=False)
+    awake_timeout: float = Field(default=8.0)
+
+
+class AlertRuleSettings(BaseModel):
+    """Alert rule settings model."""
+    name: str
+    metric: str
+    operator: str = Field(default=">")
+    threshold: float
+    duration: float = Field(default=0.0)
+
+
+def default_alert_rules() -> List[AlertRuleSettings]:
+    return [
+        AlertRuleSettings(name="High CPU usage", metric="cpu_percent",
+                          operator=">", threshold=90, duration=60),
+        AlertRuleSettings(name="Low disk space", metric="disk_free_gb",
+                          operator="<", threshold=5),
+    ]
+
+
+class MonitoringSettings(BaseModel):
+    """Monitoring settings model."""
+    sample_interval: float = Field(default=1.0)
+    background_interval: float = Field(default=5.0)
+    buffer_size: int = Field(default=300)
+    store_enabled: bool = Field(default=True)
+    store_dir: str = Field(default="data/metrics")
+    gpu_backend: str = Field(default="auto")
+    alerts_enabled: bool = Field(default=True)
+    alert_cooldown: float = Field(default=300.0)
+    alert_rules: List[AlertRuleSettings] = Field(default_factory=default_alert_rules)
+
+
+class FileSearchSettings(BaseModel):
+    """File search settings model."""
+    enabled: bool = Field(default=True)
+    roots: List[str] = Field(default_factory=list)
+    index_path: str = Field(default="data/file_index.sqlite")
+    rescan_interval: float = Field(default=900.0)
 
 
 class UserSettings(BaseModel):
@@ -27,6 +77,9 @@ class UserSettings(BaseModel):
     """
     app_settings: AppSettings = Field(default_factory=AppSettings)
     agent_settings: AgentSettings = Field(default_factory=AgentSettings)
+    voice_settings: VoiceSettings = Field(default_factory=VoiceSettings)
+    monitoring_settings: MonitoringSettings = Field(default_factory=MonitoringSettings)
+    file_search_settings: FileSearchSettings = Field(default_factory=FileSearchSettings)
 
 
 class DefaultSettings(BaseModel):
@@ -37,6 +90,9 @@ class DefaultSettings(BaseModel):
     """
     app_settings: AppSettings = Field(default_factory=AppSettings)
     agent_settings: AgentSettings = Field(default_factory=AgentSettings)
+    voice_settings: VoiceSettings = Field(default_factory=VoiceSettings)
+    monitoring_settings: MonitoringSettings = Field(default_factory=MonitoringSettings)
+    file_search_settings: FileSearchSettings = Field(default_factory=FileSearchSettings)
 
 
 class Settings(BaseModel):
@@ -0,0 +1,342 @@
+# python
+import os
+import re
+import shlex
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+# 3rd party
+import psutil
+
+# Seconds between checks of the application folders for changes
+REFRESH_INTERVAL = 10.0
+# Lowest trigram similarity accepted as a match
+MIN_SCORE = 0.35
+# Field codes of the Exec key of .desktop files, replaced by files or URLs when launched
+FIELD_CODES = re.compile(r"%[fFuUdDnNickvm]")
+# Shells whose -c command is read for the program they run
+SHELLS = {"sh", "bash", "dash", "zsh"}
+# Programs that start other programs, their process name says nothing about the application
+LAUNCHERS = re.compile(r"sh|bash|dash|zsh|env|flatpak|snap|gtk-launch|python[\d.]*|pythonw?")
+
+
+def normalize(name: str) -> str:
+    """Lowercase a name and keep only letters and digits separated by single spaces."""
+    return " ".join(re.findall(r"[^\W_]+", name.lower()))
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def executable_name(path: str) -> str:
+    """Return the lowercase file name of an executable without .exe, e.g. "C:/x/Code.exe" -> "code"."""
+    name = os.path.basename(path.replace("\\", "/")).lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def is_launcher(name: str) -> bool:
+    """Return True for shells, interpreters and launchers like "python3" or "flatpak"."""
+    return LAUNCHERS.fullmatch(executable_name(name)) is not None
+
+
+def command_program(command: List[str]) -> Optional[str]:
+    """Return the program a command line runs, None if only a launcher or interpreter is known.
+
+    Environment assignments and env are skipped and the command of `sh -c` is
+    read, e.g. ["env", "A=1", "sh", "-c", "viewer %f"] -> "viewer".
+    """
+    args = list(command)
+    while args:
+        arg = args.pop(0)
+        name = executable_name(arg)
+        if arg.startswith("-") or ("=" in arg and "/" not in arg.split("=", 1)[0]) or name == "env":
+            continue
+        if name in SHELLS and "-c" in args[:-1]:
+            try:
+                args = shlex.split(args[args.index("-c") + 1])
+            except ValueError:
+                return None
+            continue
+        return None if is_launcher(name) else arg
+    return None
+
+
+class AppEntry:
+    """One installed application."""
+
+    __slots__ = ("id", "name", "path", "command", "aliases", "executables")
+
+    def __init__(self, id: str, name: str, path: str, command: Optional[List[str]] = None,
+                 executables: Optional[Set[str]] = None):
+        self.id = id
+        self.name = name
+        self.path = path
+        # Command line for .desktop entries, None where the path is opened directly
+        self.command = command
+        self.aliases = {normalize(name), normalize(Path(path).stem.split(".")[-1])}
+        self.executables = executables or set()
+        self.aliases.update(normalize(executable) for executable in self.executables)
+        self.aliases.discard("")
+
+
+def parse_desktop_file(path: Path) -> Optional[AppEntry]:
+    """Read the [Desktop Entry] group of a .desktop file, None if it is hidden or not an application."""
+    values: Dict[str, str] = {}
+    group = None
+    try:
+        with path.open(encoding="utf-8", errors="replace") as file:
+            for line in file:
+                line = line.strip()
+                if line.startswith("["):
+                    if group == "Desktop Entry":
+                        break
+                    group = line[1:-1]
+                elif group == "Desktop Entry" and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip()
+    except OSError:
+        return None
+    if (values.get("Type", "Application") != "Application" or "Exec" not in values
+            or values.get("NoDisplay") == "true" or values.get("Hidden") == "true"):
+        return None
+    try:
+        command = [arg for arg in shlex.split(values["Exec"].replace("%%", "\0"))
+                   if not FIELD_CODES.fullmatch(arg)]
+    except ValueError:
+        return None
+    command = [FIELD_CODES.sub("", arg).replace("\0", "%") for arg in command]
+    # The window class and TryExec name the application itself, the Exec program can be a wrapper
+    # like "flatpak run ..." or "python3 app.py" whose process name is shared with other programs
+    programs = [values.get("StartupWMClass", ""), values.get("TryExec", ""), command_program(command) or ""]
+    executables = {executable_name(program) for program in programs if program and not is_launcher(program)}
+    return AppEntry(path.name, values.get("Name", path.stem), str(path), command, executables)
+
+
+def shortcut_target(path: Path) -> Optional[str]:
+    """Return the local target path of a Windows .lnk shortcut, None if it has none."""
+    try:
+        data = path.read_bytes()
+        flags = struct.unpack_from("<I", data, 0x14)[0]
+        offset = 0x4C
+        if flags & 0x01:  # HasLinkTargetIDList
+            offset += 2 + struct.unpack_from("<H", data, offset)[0]
+        if not flags & 0x02:  # HasLinkInfo
+            return None
+        base_path_offset = struct.unpack_from("<I", data, offset + 16)[0]
+        start = offset + base_path_offset
+        return data[start:data.index(b"\0", start)].decode("mbcs" if os.name == "nt" else "latin-1")
+    except (OSError, struct.error, ValueError, LookupError):
+        return None
+
+
+def parse_shortcut(path: Path) -> Optional[AppEntry]:
+    """Create the entry of a Start Menu shortcut, skipping uninstallers and help links."""
+    name = path.stem
+    if re.search(r"\b(uninstall|readme|help|documentation|website)\b", name, re.IGNORECASE):
+        return None
+    target = shortcut_target(path) if path.suffix.lower() == ".lnk" else None
+    executables = {executable_name(target)} if target else set()
+    return AppEntry(str(path), name, str(path), None, executables)
+
+
+def parse_app_bundle(path: Path) -> AppEntry:
+    return AppEntry(str(path), path.stem, str(path), ["open", "-a", str(path)], {path.stem.lower()})
+
+
+def application_dirs() -> List[Path]:
+    """Folders with installed applications, the ones with higher priority first."""
+    home = Path.home()
+    if sys.platform == "win32":
+        return [Path(os.environ.get(variable, "")) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
+                for variable in ("APPDATA", "PROGRAMDATA") if os.environ.get(variable)]
+    if sys.platform == "darwin":
+        return [home / "Applications", Path("/Applications"), Path("/System/Applications")]
+    data_home = os.environ.get("XDG_DATA_HOME") or str(home / ".local" / "share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    dirs = [data_home] + data_dirs.split(":") + [
+        str(home / ".local/share/flatpak/exports/share"),
+        "/var/lib/flatpak/exports/share",
+        "/var/lib/snapd/desktop",
+    ]
+    return [Path(directory) / "applications" for directory in dict.fromkeys(dirs) if directory]
+
+
+class AppIndex:
+    """
+    Index of the installed applications for opening and closing them by name.
+
+    The application folders (.desktop files on Linux, Start Menu shortcuts on
+    Windows, .app bundles on macOS) are scanned once. Later refreshes only
+    stat the folders and re-read the ones whose modification time changed,
+    at most every REFRESH_INTERVAL seconds. Names are resolved with an exact
+    lookup first, then by trigram similarity over the candidates that share
+    a trigram with the query.
+
+    Attributes:
+        entries: applications by id, the first one found wins
+    """
+
+    def __init__(self, dirs: Optional[List[Path]] = None):
+        self.dirs = dirs if dirs is not None else application_dirs()
+        self.entries: Dict[str, AppEntry] = {}
+        self._dir_entries: Dict[Path, List[AppEntry]] = {}
+        self._dir_mtimes: Dict[Path, Optional[float]] = {}
+        self._names: Dict[str, AppEntry] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _scan_dir(self, directory: Path) -> List[Path]:
+        """Read the applications directly in a folder and return its sub folders."""
+        entries, sub_dirs = [], []
+        try:
+            self._dir_mtimes[directory] = directory.stat().st_mtime
+            children = list(os.scandir(directory))
+        except OSError:
+            # Missing folders are remembered too, so they only count as changed once they appear
+            self._dir_mtimes[directory] = None
+            self._dir_entries.pop(directory, None)
+            return []
+        for child in children:
+            path = Path(child.path)
+            suffix = path.suffix.lower()
+            if suffix == ".app":
+                entries.append(parse_app_bundle(path))
+            elif child.is_dir():
+                sub_dirs.append(path)
+            elif suffix == ".desktop":
+                entries.append(parse_desktop_file(path))
+            elif suffix in (".lnk", ".url"):
+                entries.append(parse_shortcut(path))
+        self._dir_entries[directory] = [entry for entry in entries if entry is not None]
+        return [sub_dir for sub_dir in sub_dirs if sub_dir not in self._dir_mtimes]
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-read the application folders that changed since the last check."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < REFRESH_INTERVAL:
+                return
+            self._checked_at = now
+            changed = False
+            pending = [directory for directory in self.dirs if directory not in self._dir_mtimes]
+            for directory in list(self._dir_mtimes):
+                try:
+                    mtime = directory.stat().st_mtime
+                except OSError:
+                    mtime = None
+                if force or mtime != self._dir_mtimes[directory]:
+                    pending.append(directory)
+            while pending:
+                directory = pending.pop()
+                changed = True
+                pending.extend(self._scan_dir(directory))
+            if changed:
+                self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Rebuild the name lookups from the entries of all folders."""
+        entries: Dict[str, AppEntry] = {}
+        for root in self.dirs:
+            for directory, dir_entries in self._dir_entries.items():
+                if directory == root or root in directory.parents:
+                    for entry in dir_entries:
+                        entries.setdefault(entry.id, entry)
+        names: Dict[str, AppEntry] = {}
+        index: Dict[str, Set[str]] = {}
+        for entry in entries.values():
+            for alias in entry.aliases:
+                names.setdefault(alias, entry)
+                for trigram in trigrams(alias):
+                    index.setdefault(trigram, set()).add(alias)
+        self.entries, self._names, self._trigrams = entries, names, index
+
+    def resolve(self, name: str, exact: bool = False) -> Optional[AppEntry]:
+        """Return the installed application best matching a name, None if nothing is close.
+
+        Args:
+            name (str): Application name as said by the user, e.g. "vs code".
+            exact (bool): Only accept an application whose name or executable is `name`.
+        """
+        self.refresh()
+        query = normalize(name)
+        if not query:
+            return None
+        entry = self._names.get(query)
+        if entry is not None or exact:
+            return entry
+        query_trigrams = trigrams(query)
+        shared: Dict[str, int] = {}
+        for trigram in query_trigrams:
+            for alias in self._trigrams.get(trigram, ()):
+                shared[alias] = shared.get(alias, 0) + 1
+        best, best_score = None, MIN_SCORE
+        for alias, count in shared.items():
+            score = 2 * count / (len(query_trigrams) + len(alias) + 1)
+            if f" {query} " in f" {alias} ":
+                score += 0.3  # All words of the query appear in the name
+            if score > best_score or (score == best_score and best and len(alias) < len(best)):
+                best, best_score = alias, score
+        return self._names[best] if best else None
+
+    def launch(self, entry: AppEntry) -> None:
+        """Start an application without waiting for it."""
+        if entry.command:
+            kwargs = {"start_new_session": True} if os.name != "nt" else {}
+            subprocess.Popen(entry.command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, **kwargs)
+        else:
+            os.startfile(entry.path)
+
+    def processes(self, entry: Optional[AppEntry], name: str = "") -> List[psutil.Process]:
+        """Return the running processes of an application.
+
+        Shells, interpreters and launchers are never matched, so closing an
+        application started through them cannot stop unrelated programs.
+
+        Args:
+            entry (Optional[AppEntry]): Resolved application, or None to match processes by name only.
+            name (str): Name used when the application is not installed, e.g. "notepad".
+        """
+        executables = set(entry.executables) if entry else set()
+        if name:
+            executables.add(normalize(name).replace(" ", ""))
+        executables = {executable for executable in executables if executable and not is_launcher(executable)}
+        if not executables:
+            return []
+        found = []
+        for process in psutil.process_iter(["name", "exe"]):
+            if process.pid == os.getpid():
+                continue
+            names = {executable_name(process.info["name"] or ""), executable_name(process.info["exe"] or "")}
+            if names & executables:
+                found.append(process)
+        return found
+
+    def close(self, processes: List[psutil.Process], timeout: float = 3.0) -> int:
+        """Terminate processes, killing the ones still running after `timeout` seconds.
+
+        Returns:
+            int: Number of processes that were stopped.
+        """
+        for process in processes:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        gone, alive = psutil.wait_procs(processes, timeout=timeout)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        return len(gone) + len(alive)
+
+
+app_index = AppIndex()
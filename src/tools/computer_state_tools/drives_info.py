@@ -1,26 +1,137 @@
+# python
+import os
+import threading
+import time
+from typing import Dict, Optional
+# 3rd party
 import psutil
 from langchain.tools import tool
 
+GB = 1024 ** 3
+# Filesystems that are not drives: snap images, RAM disks and container layers
+PSEUDO_FSTYPES = {"squashfs", "tmpfs", "devtmpfs", "ramfs", "overlay", "autofs", "nsfs", "fuse.snapfuse"}
+PSEUDO_MOUNT_PREFIXES = ("/snap/", "/var/snap/", "/var/lib/docker/", "/sys/", "/proc/", "/dev/")
+PSEUDO_DEVICE_PREFIXES = ("/dev/loop",)
+
+
+def is_pseudo(partition) -> bool:
+    """Return True for mounts that are not real drives, such as snap loop images."""
+    return (partition.fstype in PSEUDO_FSTYPES
+            or partition.device.startswith(PSEUDO_DEVICE_PREFIXES)
+            or partition.mountpoint.startswith(PSEUDO_MOUNT_PREFIXES))
+
+
+def probe(partition) -> dict:
+    """Read the space and inode usage of one mount."""
+    usage = psutil.disk_usage(partition.mountpoint)
+    info = {
+        "mountpoint": partition.mountpoint,
+        "fstype": partition.fstype,
+        "total": round(usage.total / GB, 2),  # Convert to GB
+        "used": round(usage.used / GB, 2),    # Convert to GB
+        "free": round(usage.free / GB, 2),    # Convert to GB
+        "percent": usage.percent,
+    }
+    if hasattr(os, "statvfs"):
+        stats = os.statvfs(partition.mountpoint)
+        if stats.f_files:
+            info["inodes_used_percent"] = round(100 * (stats.f_files - stats.f_ffree) / stats.f_files, 1)
+    return info
+
+
+class DriveProber:
+    """
+    Probes all mounts at once, each with its own timeout.
+
+    Every mount is read on its own daemon thread, so a hung network or
+    removable drive only costs its timeout and is reported as not responding
+    while the other drives are answered. A probe that is still hung is not
+    started again, so dead mounts do not pile up threads. Results are cached
+    for a few seconds.
+
+    Attributes:
+        timeout: seconds to wait for all mounts
+        ttl: seconds a result is reused
+    """
+
+    def __init__(self, timeout: float = 2.0, ttl: float = 10.0):
+        self.timeout = timeout
+        self.ttl = ttl
+        self._cache: Optional[Dict[str, dict]] = None
+        self._cached_at = 0.0
+        self._hung: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def drives(self, include_all: bool = False) -> Dict[str, dict]:
+        """Return the drives by device, probing again if the cache is old.
+
+        Args:
+            include_all (bool): Also list pseudo filesystems such as snap images and tmpfs.
+        """
+        with self._lock:
+            if include_all or self._cache is None or time.monotonic() - self._cached_at > self.ttl:
+                drives = self._probe_all(include_all)
+                if include_all:
+                    return drives
+                self._cache, self._cached_at = drives, time.monotonic()
+            return self._cache
+
+    def _probe_all(self, include_all: bool) -> Dict[str, dict]:
+        partitions = [partition for partition in psutil.disk_partitions(all=include_all)
+                      if include_all or not is_pseudo(partition)]
+        results: Dict[str, dict] = {}
+        threads: Dict[str, threading.Thread] = {}
+
+        def run(partition):
+            try:
+                results[partition.mountpoint] = probe(partition)
+            except Exception as e:
+                results[partition.mountpoint] = {"mountpoint": partition.mountpoint,
+                                                 "fstype": partition.fstype, "error": str(e)}
+
+        for partition in partitions:
+            hung = self._hung.get(partition.mountpoint)
+            if hung is not None and hung.is_alive():
+                continue  # Still stuck since an earlier call, reported as not responding
+            self._hung.pop(partition.mountpoint, None)
+            if not partition.fstype:
+                # Windows card readers and optical drives without media
+                results[partition.mountpoint] = {"mountpoint": partition.mountpoint, "error": "No media"}
+                continue
+            thread = threading.Thread(target=run, args=(partition,), daemon=True,
+                                      name=f"drive-probe {partition.mountpoint}")
+            thread.start()
+            threads[partition.mountpoint] = thread
+
+        deadline = time.monotonic() + self.timeout
+        for thread in threads.values():
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        drives = {}
+        for partition in partitions:
+            info = results.get(partition.mountpoint)
+            if info is None:
+                if partition.mountpoint in threads:
+                    self._hung[partition.mountpoint] = threads[partition.mountpoint]
+                info = {"mountpoint": partition.mountpoint, "fstype": partition.fstype,
+                        "error": "Not responding"}
+            key = partition.device if partition.device not in drives else f"{partition.device} ({partition.mountpoint})"
+            drives[key] = info
+        return drives
+
+
+drive_prober = DriveProber()
+
 
 @tool
-def get_drives_info() -> dict:
+def get_drives_info(include_all: bool = False) -> dict:
     """Get information about all drives on the system.
 
+    Args:
+        include_all (bool, optional): Also list virtual filesystems such as snap images and tmpfs. Defaults to False.
     Returns:
-        dict: A dictionary where keys are drive letters and values are dictionaries with 'total', 'used', and 'free' space in GB.
+        dict: A dictionary where keys are drive names and values are dictionaries with the mountpoint, filesystem type,
+            'total', 'used' and 'free' space in GB, used percent and, where available, inode usage.
+            Drives that do not answer in time have an 'error'.
     """
-    drives = {}
-    partitions = psutil.disk_partitions()
-
-    for partition in partitions:
-        try:
-            usage = psutil.disk_usage(partition.mountpoint)
-            drives[partition.device] = {
-                "total": round(usage.total / (1024 ** 3), 2),  # Convert to GB
-                "used": round(usage.used / (1024 ** 3), 2),    # Convert to GB
-                "free": round(usage.free / (1024 ** 3), 2)     # Convert to GB
-            }
-        except Exception as e:
-            drives[partition.device] = {"error": str(e)}
-
-    return drives
+    return drive_prober.drives(include_all)
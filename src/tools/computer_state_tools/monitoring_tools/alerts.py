@@ -0,0 +1,194 @@
+# python
+import math
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+OPERATORS = {
+    ">": "above",
+    "<": "below",
+}
+
+
+class RollingWindow:
+    """
+    Time-based sliding window with O(1) amortized statistics.
+
+    The mean comes from a running sum, min and max from monotonic deques, so
+    the cost of a push does not depend on the window length.
+
+    Attributes:
+        seconds: window length
+        full: whether the window has seen samples older than its length,
+            i.e. it covers the whole period
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.full = False
+        self._values: Deque[Tuple[float, float]] = deque()
+        self._min: Deque[Tuple[float, float]] = deque()
+        self._max: Deque[Tuple[float, float]] = deque()
+        self._sum = 0.0
+
+    def push(self, timestamp: float, value: float) -> None:
+        """Add one sample and drop the samples that left the window."""
+        if self._values and timestamp - self._values[-1][0] > self.seconds:
+            # Sampling paused for longer than the window, start over
+            self.clear()
+
+        self._values.append((timestamp, value))
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+
+        cutoff = timestamp - self.seconds
+        while self._values[0][0] < cutoff:
+            self._sum -= self._values.popleft()[1]
+            self.full = True
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._min.clear()
+        self._max.clear()
+        self._sum = 0.0
+        self.full = False
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self._values) if self._values else math.nan
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else math.nan
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else math.nan
+
+
+class AlertRule:
+    """
+    Threshold rule over a rolling window, e.g. "cpu_percent > 90 for 60 s".
+
+    The rule holds when every sample of the last `duration` seconds is on the
+    wrong side of the threshold, so a single spike never triggers it.
+
+    Attributes:
+        name: text shown to the user
+        metric: sampler field the rule watches
+        operator: ">" or "<"
+        threshold: limit value
+        duration: seconds the condition must hold, 0 for the latest sample
+    """
+
+    def __init__(self, name: str, metric: str, operator: str, threshold: float, duration: float = 0.0):
+        if operator not in OPERATORS:
+            raise ValueError(f"Unknown operator '{operator}'. Choose from {list(OPERATORS)}.")
+        self.name = name
+        self.metric = metric
+        self.operator = operator
+        self.threshold = threshold
+        self.duration = duration
+        self.window = RollingWindow(duration)
+
+    def update(self, timestamp: float, value: float) -> bool:
+        """Add one sample.
+
+        Returns:
+            bool: True if the rule holds.
+        """
+        self.window.push(timestamp, value)
+        if self.duration > 0 and not self.window.full:
+            return False
+        if self.operator == ">":
+            return self.window.min > self.threshold
+        return self.window.max < self.threshold
+
+    def describe(self) -> str:
+        """Human readable alert message."""
+        period = f" for {self.duration:g} s" if self.duration else ""
+        return (f"{self.name}: {self.metric} is {OPERATORS[self.operator]} "
+                f"{self.threshold:g}{period} (average {self.window.mean:.1f})")
+
+
+class AlertEngine:
+    """
+    Evaluates alert rules on every sampled row and notifies the handlers.
+
+    A rule that keeps holding is reported again only after `cooldown` seconds.
+
+    Attributes:
+        rules: the evaluated rules
+        handlers: callbacks receiving the rule that fired
+    """
+
+    def __init__(self, fields: List[str], rules: List[AlertRule], cooldown: float = 300.0):
+        """
+        Initializes the AlertEngine class.
+
+        Args:
+            fields: names of the sampled fields, without the timestamp
+            rules: rules to evaluate, rules on unknown fields are ignored
+            cooldown: minimum seconds between two alerts of one rule
+        """
+        index = {field: i + 1 for i, field in enumerate(fields)}
+        self.rules: List[AlertRule] = []
+        self._columns: List[int] = []
+        for rule in rules:
+            if rule.metric not in index:
+                print(f"Warning: alert rule '{rule.name}' uses unknown metric '{rule.metric}'")
+                continue
+            self.rules.append(rule)
+            self._columns.append(index[rule.metric])
+        self.cooldown = cooldown
+        self.handlers: List[Callable[[AlertRule], None]] = []
+        self._last_fired: Dict[int, float] = {}
+
+    @classmethod
+    def from_settings(cls, settings, fields: List[str]) -> "AlertEngine":
+        """Create the engine from MonitoringSettings."""
+        rules = [AlertRule(r.name, r.metric, r.operator, r.threshold, r.duration)
+                 for r in settings.alert_rules]
+        return cls(fields, rules, cooldown=settings.alert_cooldown)
+
+    def add_handler(self, handler: Callable[[AlertRule], None]) -> None:
+        """Register a callback that is called with every rule that fires."""
+        self.handlers.append(handler)
+
+    def process(self, row: List[float]) -> List[AlertRule]:
+        """Evaluate all rules on one sampled row, timestamp first.
+
+        Returns:
+            List[AlertRule]: The rules that fired.
+        """
+        timestamp = row[0]
+        fired = []
+        for i, (rule, column) in enumerate(zip(self.rules, self._columns)):
+            value = row[column]
+            if math.isnan(value):
+                continue
+            if not rule.update(timestamp, value):
+                continue
+            last: Optional[float] = self._last_fired.get(i)
+            if last is not None and timestamp - last < self.cooldown:
+                continue
+            self._last_fired[i] = timestamp
+            fired.append(rule)
+            for handler in self.handlers:
+                try:
+                    handler(rule)
+                except Exception as e:
+                    print(f"Error in alert handler: {e}")
+        return fired
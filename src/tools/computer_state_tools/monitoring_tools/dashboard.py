@@ -0,0 +1,203 @@
+# python
+import math
+from typing import Dict, List, Optional
+# 3rd party
+import flet as ft  # type: ignore
+import numpy as np
+# project
+from src.tools.computer_state_tools.monitoring_tools.monitoring_class import Monitor
+from src.tools.computer_state_tools.monitoring_tools.metrics_sampler import MetricsRingBuffer, get_sampler
+
+
+MB = 1024 ** 2
+CORE_COLORS = [
+    ft.Colors.BLUE, ft.Colors.GREEN, ft.Colors.ORANGE, ft.Colors.PURPLE,
+    ft.Colors.RED, ft.Colors.TEAL, ft.Colors.AMBER, ft.Colors.PINK,
+    ft.Colors.CYAN, ft.Colors.LIME, ft.Colors.INDIGO, ft.Colors.BROWN,
+]
+
+
+def core_fields(buffer: MetricsRingBuffer) -> List[str]:
+    """Names of the per-core CPU fields in the buffer."""
+    return [field for field in buffer.fields if field.startswith("cpu_core_")]
+
+
+class SamplerMonitor(Monitor):
+    """
+    Monitor that reads its values from a MetricsRingBuffer instead of sampling.
+    Longer ranges are drawn from the history of the sampler, which records
+    in the background, so they cover the time before the dashboard opened.
+
+    Attributes:
+        fields: buffer fields shown, one per series in chart order
+        scales: divisors applied to fields before they are drawn
+    """
+
+    fields: List[str] = []
+    scales: Dict[str, float] = {}
+
+    def __init__(self, buffer: MetricsRingBuffer, chart_names: List[str], colors: List, **kwargs):
+        """
+        Initializes the SamplerMonitor class.
+
+        Args:
+            buffer: ring buffer filled by the MetricsSampler
+            chart_names: list of chart names
+            colors: list of colors for each graph
+            **kwargs: other Monitor arguments such as units and series_names
+        """
+        super().__init__(chart_names=chart_names, colors=colors, **kwargs)
+        self.buffer = buffer
+        self._divisors = [self.scales.get(field, 1.0) for field in self.fields]
+        self.history = get_sampler().history
+
+    def _get_monitor_values(self) -> List[float]:
+        """
+        Reads the latest sample of the monitor fields.
+
+        Returns:
+            List[float]: List of values, NaN replaced with 0
+        """
+        return [0.0 if math.isnan(value) else value / divisor
+                for value, divisor in zip(self.buffer.latest(self.fields), self._divisors)]
+
+    def _query_series(self, series: int, seconds: float, now: float) -> Dict[str, np.ndarray]:
+        """Return the sampler history buckets of one field, scaled like the live values."""
+        buckets = self.history.query(self.fields[series], seconds, now=now)
+        return {"start": buckets["start"], "mean": buckets["mean"] / self._divisors[series]}
+
+
+class CPUMonitor(SamplerMonitor):
+    """
+    Class for monitoring CPU and memory usage.
+    """
+
+    fields = ["cpu_percent", "memory_percent"]
+
+    def __init__(self, buffer: MetricsRingBuffer):
+        """
+        Initializes the CPUMonitor class.
+        """
+        super().__init__(
+            buffer,
+            chart_names=["CPU Usage", "Memory Usage"],
+            colors=[ft.Colors.BLUE, ft.Colors.GREEN]
+        )
+
+
+class GPUMonitor(SamplerMonitor):
+    """
+    Class for monitoring GPU load and temperature.
+    """
+
+    fields = ["gpu_load", "gpu_temperature"]
+
+    def __init__(self, buffer: MetricsRingBuffer):
+        super().__init__(
+            buffer,
+            chart_names=["GPU Usage", "GPU Temperature"],
+            colors=[ft.Colors.GREEN, ft.Colors.RED]
+        )
+
+
+class CoreMonitor(SamplerMonitor):
+    """
+    Class for monitoring the usage of every CPU core in one chart.
+    """
+
+    def __init__(self, buffer: MetricsRingBuffer):
+        self.fields = core_fields(buffer)
+        super().__init__(
+            buffer,
+            chart_names=["Per-core CPU Usage"],
+            colors=[[CORE_COLORS[i % len(CORE_COLORS)] for i in range(len(self.fields))]]
+        )
+
+
+class DiskMonitor(SamplerMonitor):
+    """
+    Class for monitoring disk read and write throughput.
+    """
+
+    fields = ["disk_read_bps", "disk_write_bps"]
+    scales = {field: MB for field in fields}
+
+    def __init__(self, buffer: MetricsRingBuffer):
+        super().__init__(
+            buffer,
+            chart_names=["Disk I/O"],
+            colors=[[ft.Colors.BLUE, ft.Colors.ORANGE]],
+            units=[" MB/s"],
+            series_names=[["Read", "Write"]]
+        )
+
+
+class NetworkMonitor(SamplerMonitor):
+    """
+    Class for monitoring network send and receive throughput.
+    """
+
+    fields = ["net_recv_bps", "net_sent_bps"]
+    scales = {field: MB for field in fields}
+
+    def __init__(self, buffer: MetricsRingBuffer):
+        super().__init__(
+            buffer,
+            chart_names=["Network"],
+            colors=[[ft.Colors.GREEN, ft.Colors.PURPLE]],
+            units=[" MB/s"],
+            series_names=[["Received", "Sent"]]
+        )
+
+
+class SystemMonitor(SamplerMonitor):
+    """
+    Class for monitoring CPU, cores, memory, disk, network and, if present,
+    the GPU in one window.
+    """
+
+    scales = {field: MB for field in DiskMonitor.fields + NetworkMonitor.fields}
+
+    def __init__(self, buffer: MetricsRingBuffer, gpu: Optional[bool] = None):
+        """
+        Initializes the SystemMonitor class.
+
+        Args:
+            buffer: ring buffer filled by the MetricsSampler
+            gpu: whether to show the GPU chart, by default if the sampler's GPU backend found a GPU
+        """
+        if gpu is None:
+            # A missing sample, e.g. right after startup, must not hide the chart
+            gpu = get_sampler().has_gpu
+        cores = core_fields(buffer)
+        self.fields = (["cpu_percent"] + cores + ["memory_percent"]
+                       + DiskMonitor.fields + NetworkMonitor.fields)
+        chart_names = ["CPU Usage", "Per-core CPU Usage", "Memory Usage", "Disk I/O", "Network"]
+        colors = [
+            ft.Colors.BLUE,
+            [CORE_COLORS[i % len(CORE_COLORS)] for i in range(len(cores))],
+            ft.Colors.GREEN,
+            [ft.Colors.BLUE, ft.Colors.ORANGE],
+            [ft.Colors.GREEN, ft.Colors.PURPLE],
+        ]
+        units = ["%", "%", "%", " MB/s", " MB/s"]
+        series_names = [None, None, None, ["Read", "Write"], ["Received", "Sent"]]
+        if gpu:
+            self.fields += ["gpu_load"]
+            chart_names.append("GPU Usage")
+            colors.append(ft.Colors.RED)
+            units.append("%")
+            series_names.append(None)
+        super().__init__(buffer, chart_names=chart_names, colors=colors,
+                         units=units, series_names=series_names)
+
+
+MONITORS = {
+    "cpu": CPUMonitor,
+    "gpu": GPUMonitor,
+    "cores": CoreMonitor,
+    "disk": DiskMonitor,
+    "network": NetworkMonitor,
+    "system": SystemMonitor,
+}
+
@@ -0,0 +1,144 @@
+# python
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+NAN = float("nan")
+
+
+class GPUBackend(ABC):
+    """
+    Base abstract class for GPU metric backends.
+
+    Backends open their device handles once and keep them, so a sample is a
+    couple of library calls instead of a new process.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def device_count(self) -> int:
+        """Number of GPUs the backend can read."""
+        pass
+
+    @abstractmethod
+    def sample(self, index: int = 0) -> Tuple[float, float]:
+        """
+        Read one GPU.
+
+        Args:
+            index: GPU index
+
+        Returns:
+            Tuple[float, float]: load in percent and temperature in °C, NaN when unknown
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the backend resources."""
+        pass
+
+
+class NoGPUBackend(GPUBackend):
+    """Backend for hosts without a supported GPU. Every value is NaN."""
+
+    name = "none"
+
+    def device_count(self) -> int:
+        return 0
+
+    def sample(self, index: int = 0) -> Tuple[float, float]:
+        return NAN, NAN
+
+
+class NVMLBackend(GPUBackend):
+    """NVIDIA backend on top of NVML with handles opened once."""
+
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml  # type: ignore
+
+        self._nvml = pynvml
+        self._handles = []
+        pynvml.nvmlInit()
+        self._initialized = True
+        try:
+            self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i)
+                             for i in range(pynvml.nvmlDeviceGetCount())]
+        except Exception:
+            self.close()
+            raise
+
+    def device_count(self) -> int:
+        return len(self._handles)
+
+    def sample(self, index: int = 0) -> Tuple[float, float]:
+        handle = self._handles[index]
+        try:
+            load = float(self._nvml.nvmlDeviceGetUtilizationRates(handle).gpu)
+        except self._nvml.NVMLError:
+            load = NAN
+        try:
+            temperature = float(self._nvml.nvmlDeviceGetTemperature(
+                handle, self._nvml.NVML_TEMPERATURE_GPU))
+        except self._nvml.NVMLError:
+            temperature = NAN
+        return load, temperature
+
+    def close(self) -> None:
+        # nvmlInit is reference counted, shut down even when no device was found
+        self._handles = []
+        if self._initialized:
+            self._initialized = False
+            self._nvml.nvmlShutdown()
+
+
+class FakeGPUBackend(GPUBackend):
+    """
+    Backend that replays scripted samples, for tests and demos.
+
+    Attributes:
+        samples: (load, temperature) pairs returned in a loop
+    """
+
+    name = "fake"
+
+    def __init__(self, samples: Optional[Sequence[Tuple[float, float]]] = None, devices: int = 1):
+        self.samples: List[Tuple[float, float]] = list(samples or [(35.0, 55.0)])
+        self.devices = devices
+        self.calls = 0
+
+    def device_count(self) -> int:
+        return self.devices
+
+    def sample(self, index: int = 0) -> Tuple[float, float]:
+        if index >= self.devices:
+            raise IndexError(f"GPU {index} does not exist")
+        value = self.samples[self.calls % len(self.samples)]
+        self.calls += 1
+        return value
+
+
+def get_gpu_backend(preferred: str = "auto") -> GPUBackend:
+    """Create a GPU backend.
+
+    Args:
+        preferred (str): "auto", "nvml", "fake" or "none". "auto" picks NVML
+            when an NVIDIA GPU is present and falls back to "none".
+
+    Returns:
+        GPUBackend: The backend, never raising on hosts without a GPU.
+    """
+    if preferred == "none":
+        return NoGPUBackend()
+    if preferred == "fake":
+        return FakeGPUBackend()
+    try:
+        backend = NVMLBackend()
+        if backend.device_count() > 0:
+            return backend
+        backend.close()
+    except Exception as e:
+        if preferred == "nvml":
+            print(f"Warning: NVML is not available: {e}")
+    return NoGPUBackend()
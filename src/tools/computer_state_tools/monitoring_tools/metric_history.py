@@ -0,0 +1,234 @@
+# python
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+# 3rd party
+import numpy as np
+
+# (bucket size in seconds, number of buckets): 1 s for 5 min, 10 s for 1 h, 1 min for 24 h
+DEFAULT_TIERS = ((1, 300), (10, 360), (60, 1440))
+
+
+class HistoryTier:
+    """
+    Ring buffer of fixed-size time buckets with min/max/mean per field.
+    NaN values, e.g. a missing GPU reading, are left out of the aggregates;
+    a field without any value in a bucket has NaN mean, min and max.
+
+    Attributes:
+        resolution: bucket size in seconds
+        capacity: number of buckets kept
+    """
+
+    def __init__(self, resolution: float, capacity: int, n_fields: int):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.starts = np.full(capacity, np.nan)
+        self.means = np.zeros((capacity, n_fields))
+        self.mins = np.zeros((capacity, n_fields))
+        self.maxs = np.zeros((capacity, n_fields))
+        self.counts = np.zeros((capacity, n_fields), dtype=np.int64)
+        self.written = 0
+        # Bucket that is still being filled
+        self._start: Optional[float] = None
+        self._sum = np.zeros(n_fields)
+        self._min = np.full(n_fields, np.inf)
+        self._max = np.full(n_fields, -np.inf)
+        self._finite = np.zeros(n_fields, dtype=np.int64)
+        self._count = 0
+
+    @property
+    def span(self) -> float:
+        """Seconds of history the tier can hold."""
+        return self.resolution * self.capacity
+
+    def add(self, timestamp: float, values: np.ndarray) -> bool:
+        """Add one sample.
+
+        Returns:
+            bool: True if the sample closed the previous bucket.
+        """
+        start = math.floor(timestamp / self.resolution) * self.resolution
+        committed = False
+        if self._start is not None and start != self._start:
+            self._commit()
+            committed = True
+        if self._start is None or committed:
+            self._start = start
+        finite = np.isfinite(values)
+        self._sum[finite] += values[finite]
+        self._finite += finite
+        # fmin and fmax ignore NaN
+        np.fmin(self._min, values, out=self._min)
+        np.fmax(self._max, values, out=self._max)
+        self._count += 1
+        return committed
+
+    def _aggregates(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Mean, min and max of the bucket that is being filled, NaN for fields without values."""
+        has_data = self._finite > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(has_data, self._sum / self._finite, np.nan)
+        return (mean, np.where(has_data, self._min, np.nan),
+                np.where(has_data, self._max, np.nan))
+
+    def _commit(self) -> None:
+        row = self.written % self.capacity
+        self.starts[row] = self._start
+        self.means[row], self.mins[row], self.maxs[row] = self._aggregates()
+        self.counts[row] = self._finite
+        self.written += 1
+        self._sum[:] = 0
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+        self._finite[:] = 0
+        self._count = 0
+
+    def buckets(self, since: float) -> Dict[str, np.ndarray]:
+        """Return buckets starting at or after `since`, oldest first, including
+        the bucket that is still being filled.
+
+        Returns:
+            Dict[str, np.ndarray]: "start", "mean", "min", "max" and "count" arrays,
+                "count" holds the number of values of every field.
+        """
+        size = min(self.written, self.capacity)
+        rows = np.arange(self.written - size, self.written) % self.capacity
+        keep = rows[self.starts[rows] >= since]
+        result = {
+            "start": self.starts[keep],
+            "mean": self.means[keep],
+            "min": self.mins[keep],
+            "max": self.maxs[keep],
+            "count": self.counts[keep],
+        }
+        if self._count and self._start is not None and self._start >= since:
+            mean, low, high = self._aggregates()
+            result = {
+                "start": np.append(result["start"], self._start),
+                "mean": np.vstack((result["mean"], mean)),
+                "min": np.vstack((result["min"], low)),
+                "max": np.vstack((result["max"], high)),
+                "count": np.vstack((result["count"], self._finite)),
+            }
+        return result
+
+
+class TieredHistory:
+    """
+    Multi-resolution metric history.
+
+    Every sample is aggregated into all tiers at once, so long windows are
+    answered from coarse buckets without touching raw samples.
+
+    Attributes:
+        fields: names of the stored metrics
+        tiers: tiers ordered from the finest to the coarsest
+    """
+
+    def __init__(self, fields: List[str], tiers: Sequence[Tuple[float, int]] = DEFAULT_TIERS):
+        self.fields = list(fields)
+        self._index = {field: i for i, field in enumerate(self.fields)}
+        self.tiers = [HistoryTier(resolution, capacity, len(self.fields))
+                      for resolution, capacity in sorted(tiers)]
+        self.last_timestamp: Optional[float] = None
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        """Add one sample with a value for every field."""
+        row = np.asarray(values, dtype=np.float64)
+        for tier in self.tiers:
+            tier.add(timestamp, row)
+        self.last_timestamp = timestamp
+
+    def tier_for(self, seconds: float) -> HistoryTier:
+        """Return the finest tier that covers `seconds`."""
+        for tier in self.tiers:
+            if tier.span >= seconds:
+                return tier
+        return self.tiers[-1]
+
+    def query(self, field: str, seconds: float, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Return the buckets of one field over the last `seconds`.
+
+        Args:
+            field (str): Metric name.
+            seconds (float): Window length.
+            now (Optional[float]): End of the window, the last sample by default.
+
+        Returns:
+            Dict[str, np.ndarray]: "start", "mean", "min", "max" and "count" arrays.
+        """
+        column = self._index[field]
+        now = now if now is not None else (self.last_timestamp or 0.0)
+        tier = self.tier_for(seconds)
+        buckets = tier.buckets(now - seconds)
+        return {
+            "start": buckets["start"],
+            "mean": buckets["mean"][:, column],
+            "min": buckets["min"][:, column],
+            "max": buckets["max"][:, column],
+            "count": buckets["count"][:, column],
+        }
+
+    def summary(self, field: str, seconds: float, threshold: Optional[float] = None) -> dict:
+        """Aggregate one field over the last `seconds`.
+
+        Args:
+            field (str): Metric name.
+            seconds (float): Window length.
+            threshold (Optional[float]): If set, also report the share of
+                buckets whose mean was above it.
+
+        Returns:
+            dict: mean, min, max, covered seconds and bucket resolution.
+        """
+        buckets = self.query(field, seconds)
+        # Buckets without a value for the field have NaN aggregates
+        keep = buckets["count"] > 0
+        if not keep.any():
+            return {"samples": 0}
+        counts = buckets["count"][keep]
+        means = buckets["mean"][keep]
+        result = {
+            "mean": float(np.average(means, weights=counts)),
+            "min": float(buckets["min"][keep].min()),
+            "max": float(buckets["max"][keep].max()),
+            "samples": int(counts.sum()),
+            "covered_seconds": float(keep.sum() * self.tier_for(seconds).resolution),
+            "resolution_seconds": self.tier_for(seconds).resolution,
+        }
+        if threshold is not None:
+            result["percent_time_above"] = float(
+                np.average(means > threshold, weights=counts) * 100)
+        return result
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x (np.ndarray): Increasing x values.
+        y (np.ndarray): y values.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The selected points.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return x[selected], y[selected]
@@ -0,0 +1,440 @@
+# python
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional
+# 3rd party
+import numpy as np
+import psutil
+# project
+from src.tools.computer_state_tools.monitoring_tools.metric_history import TieredHistory
+from src.tools.computer_state_tools.monitoring_tools.gpu_backends import GPUBackend, get_gpu_backend
+
+HEADER_SIZE = 64
+NAMES_SIZE = 4096
+RATE_FIELDS = ["disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps"]
+# Columns of psutil.cpu_times(), guest time is already part of user time
+CPU_COLUMNS = [name for name in psutil.cpu_times()._fields if name not in ("guest", "guest_nice")]
+IDLE_COLUMNS = [i for i, name in enumerate(CPU_COLUMNS) if name in ("idle", "iowait")]
+
+
+class MetricsRingBuffer:
+    """
+    Fixed-size ring buffer of metric samples in shared memory.
+
+    Layout: an int64 header (write count, capacity, field count, interval in
+    ms), the JSON encoded field names and a float64 array of shape
+    (capacity, fields). The writer fills a row and then bumps the write count,
+    so readers in any process can copy recent rows without locking.
+
+    Attributes:
+        name: shared memory block name, used by readers to attach
+        fields: names of the columns, the first one is always "timestamp"
+        capacity: number of rows kept
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf[:HEADER_SIZE])
+        raw_names = bytes(shm.buf[HEADER_SIZE:HEADER_SIZE + NAMES_SIZE]).rstrip(b"\0")
+        self.fields: List[str] = json.loads(raw_names.decode("utf-8"))
+        self.capacity = int(self.header[1])
+        self.data = np.ndarray((self.capacity, len(self.fields)), dtype=np.float64,
+                               buffer=shm.buf[HEADER_SIZE + NAMES_SIZE:])
+        self._index = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    def create(cls, fields: List[str], capacity: int = 300, interval: float = 1.0,
+               name: Optional[str] = None) -> "MetricsRingBuffer":
+        """Allocate a new ring buffer.
+
+        Args:
+            fields (List[str]): Column names, "timestamp" is prepended.
+            capacity (int): Number of rows kept.
+            interval (float): Sampling interval in seconds, stored for readers.
+            name (Optional[str]): Shared memory name, random if omitted.
+
+        Returns:
+            MetricsRingBuffer: The writable buffer.
+        """
+        fields = ["timestamp"] + [f for f in fields if f != "timestamp"]
+        names = json.dumps(fields).encode("utf-8")
+        if len(names) > NAMES_SIZE:
+            raise ValueError("Too many metric fields for the ring buffer header")
+        size = HEADER_SIZE + NAMES_SIZE + capacity * len(fields) * 8
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a run that was killed, its data is stale
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:HEADER_SIZE + NAMES_SIZE] = bytes(HEADER_SIZE + NAMES_SIZE)
+        shm.buf[HEADER_SIZE:HEADER_SIZE + len(names)] = names
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf[:HEADER_SIZE])
+        header[1] = capacity
+        header[2] = len(fields)
+        header[3] = int(interval * 1000)
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "MetricsRingBuffer":
+        """Attach to a ring buffer created by another process.
+
+        Args:
+            name (str): Shared memory name.
+
+        Returns:
+            MetricsRingBuffer: A read-only view of the buffer.
+        """
+        # Readers are children of the app and share its resource tracker, so
+        # the block is only unlinked once, by the owner
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def count(self) -> int:
+        """Total number of rows ever written."""
+        return int(self.header[0])
+
+    @property
+    def interval(self) -> float:
+        """Sampling interval in seconds."""
+        return self.header[3] / 1000
+
+    def append(self, values: List[float]) -> None:
+        """Write one row. Only the owning sampler should call this."""
+        count = int(self.header[0])
+        self.data[count % self.capacity] = values
+        self.header[0] = count + 1
+
+    def window(self, size: int, fields: Optional[List[str]] = None) -> np.ndarray:
+        """Copy the most recent rows, oldest first.
+
+        Args:
+            size (int): Maximum number of rows.
+            fields (Optional[List[str]]): Columns to return, all by default.
+
+        Returns:
+            np.ndarray: Array of shape (rows, columns).
+        """
+        columns = [self._index[f] for f in fields] if fields else slice(None)
+        while True:
+            count = self.count
+            # The row after the newest one may be mid-write, so it is never read
+            size = min(size, count, self.capacity - 1)
+            rows = np.arange(count - size, count) % self.capacity
+            result = self.data[rows][:, columns]
+            # Retry if the writer wrapped over the rows while they were copied
+            if self.count - count < self.capacity - size:
+                return result
+
+    def latest(self, fields: Optional[List[str]] = None) -> List[float]:
+        """Return the most recent row, or NaNs if nothing was written yet."""
+        window = self.window(1, fields)
+        if len(window) == 0:
+            return [float("nan")] * (len(fields) if fields else len(self.fields))
+        return window[0].tolist()
+
+    def close(self) -> None:
+        """Release the mapping and, for the owner, the shared memory block."""
+        self.header = self.data = None  # type: ignore
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class MetricsSampler:
+    """
+    Background sampler that writes CPU, memory, GPU, disk and network metrics
+    into a MetricsRingBuffer, so dashboards and agent tools never sample on
+    their own.
+
+    Per-core CPU usage and disk and network throughput are computed from
+    cumulative counters: every tick takes one snapshot of all counters as a
+    NumPy array and derives the rates from the difference with the previous
+    snapshot in a single vectorized step.
+
+    Sampling is demand driven: consumers subscribe with the interval they
+    need, the sampler runs at the fastest requested rate and blocks without
+    any cost while nobody is subscribed.
+
+    Attributes:
+        interval: seconds between samples at the full rate
+        subscriptions: requested interval of every subscriber by name
+        buffer: shared ring buffer with the samples
+        history: multi-resolution history of the samples, kept in this process
+        store: optional on-disk MetricsStore the samples are persisted to
+        has_gpu: whether GPU metrics are available
+    """
+
+    def __init__(self, interval: float = 1.0, capacity: int = 300,
+                 gpu_backend: Optional[GPUBackend] = None):
+        """
+        Initializes the MetricsSampler class.
+
+        Args:
+            interval: seconds between samples at the full rate
+            capacity: number of samples kept in the ring buffer
+            gpu_backend: GPU backend, detected automatically if omitted
+        """
+        self.interval = interval
+        self.core_count = len(psutil.cpu_times(percpu=True))
+        # Root of the drive the app runs from, "/" or e.g. "C:\\"
+        self.system_drive = os.path.abspath(os.sep)
+        self._cpu_times: Optional[np.ndarray] = None
+        self._counters: Optional[np.ndarray] = None
+        self._counters_time = 0.0
+        self.gpu_backend = gpu_backend or get_gpu_backend()
+        self.has_gpu = self.gpu_backend.device_count() > 0
+        self.buffer = MetricsRingBuffer.create(self.fields(), capacity=capacity, interval=interval)
+        self.history = TieredHistory(self.fields())
+        self.store = None
+        self.listeners: List[Callable[[List[float]], None]] = []
+        self.subscriptions: Dict[str, float] = {}
+        self.samples = 0
+        self.cpu_time = 0.0
+        self.is_sampling = False
+        self.sampling_thread = None
+        self._started_at = time.monotonic()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._sample_lock = threading.Lock()
+
+    def fields(self) -> List[str]:
+        """Names of the sampled metrics."""
+        return (["cpu_percent", "memory_percent", "gpu_load", "gpu_temperature"]
+                + [f"cpu_core_{i}" for i in range(self.core_count)]
+                + RATE_FIELDS + ["disk_free_gb"])
+
+    def _core_percents(self) -> np.ndarray:
+        """Busy percent of every core since the previous call."""
+        times = np.array([[getattr(core, name) for name in CPU_COLUMNS]
+                          for core in psutil.cpu_times(percpu=True)], dtype=np.float64)
+        previous, self._cpu_times = self._cpu_times, times
+        if previous is None:
+            return np.zeros(len(times))
+        delta = times - previous
+        total = delta.sum(axis=1)
+        idle = delta[:, IDLE_COLUMNS].sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            busy = np.where(total > 0, (total - idle) / total * 100, 0.0)
+        return np.clip(busy, 0, 100)
+
+    def _rates(self) -> np.ndarray:
+        """Disk read/write and network sent/received bytes per second."""
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        counters = np.array([
+            disk.read_bytes if disk else 0,
+            disk.write_bytes if disk else 0,
+            net.bytes_sent if net else 0,
+            net.bytes_recv if net else 0,
+        ], dtype=np.float64)
+        now = time.monotonic()
+        previous, self._counters = self._counters, counters
+        elapsed, self._counters_time = now - self._counters_time, now
+        if previous is None or elapsed <= 0:
+            return np.zeros(len(counters))
+        # Counters can wrap or reset when a device disappears
+        return np.maximum(counters - previous, 0) / elapsed
+
+    def _sample(self) -> List[float]:
+        """Collect one row of metrics, timestamp first."""
+        gpu_load = gpu_temperature = float("nan")
+        if self.has_gpu:
+            try:
+                gpu_load, gpu_temperature = self.gpu_backend.sample(0)
+            except Exception:
+                pass
+        cores = self._core_percents()
+        return [
+            time.time(),
+            float(cores.mean()),
+            psutil.virtual_memory().percent,
+            gpu_load,
+            gpu_temperature,
+            *cores.tolist(),
+            *self._rates().tolist(),
+            psutil.disk_usage(self.system_drive).free / 1024 ** 3,
+        ]
+
+    def _reset_baselines(self) -> None:
+        """Take new counter snapshots so the next rates cover a fresh interval."""
+        with self._sample_lock:
+            self._core_percents()
+            self._rates()
+
+    def _record(self) -> List[float]:
+        """Take one sample and hand it to the buffer, the history and the listeners."""
+        with self._sample_lock:
+            row = self._sample()
+            self.buffer.append(row)
+            self.history.append(row[0], row[1:])
+            self.samples += 1
+            for listener in self.listeners:
+                try:
+                    listener(row)
+                except Exception as e:
+                    print(f"Error in metrics listener: {e}")
+        return row
+
+    def _sample_loop(self) -> None:
+        """Main sampling loop"""
+        last_sample: Optional[float] = None
+        while not self._stop_event.is_set():
+            interval = self.current_interval
+            if interval is None:
+                # Nobody needs data, block until somebody subscribes
+                self._wake_event.wait()
+                self._wake_event.clear()
+                continue
+
+            now = time.monotonic()
+            if last_sample is None or now - last_sample > 2 * interval:
+                # After a pause the counters are stale, rates would average the pause
+                self._reset_baselines()
+                last_sample = now
+                continue
+            due = last_sample + interval
+            if due > now:
+                # A subscription change wakes the loop up to recompute the due time
+                self._wake_event.wait(due - now)
+                self._wake_event.clear()
+                continue
+
+            self._record()
+            # Keep the cadence, but never try to catch up on missed ticks
+            last_sample = due if now - due < interval else now
+            self.cpu_time = time.thread_time()
+
+    @property
+    def current_interval(self) -> Optional[float]:
+        """Interval the sampler runs at, None while nobody is subscribed."""
+        intervals = list(self.subscriptions.values())
+        return min(intervals) if intervals else None
+
+    def subscribe(self, name: str, interval: Optional[float] = None) -> None:
+        """Request samples at least every `interval` seconds.
+
+        Args:
+            name (str): Subscriber name, subscribing again replaces the interval.
+            interval (Optional[float]): Seconds between samples, the full rate if omitted.
+        """
+        self.subscriptions[name] = max(interval or self.interval, self.interval)
+        self._wake_event.set()
+
+    def unsubscribe(self, name: str) -> None:
+        """Remove a subscription, the sampler slows down or stops accordingly."""
+        self.subscriptions.pop(name, None)
+        self._wake_event.set()
+
+    def latest_row(self, max_age: Optional[float] = None) -> List[float]:
+        """Return the latest sample, sampling on demand if it is too old.
+
+        Args:
+            max_age (Optional[float]): Maximum age in seconds, two full-rate
+                intervals by default.
+
+        Returns:
+            List[float]: Sampled row, timestamp first.
+        """
+        row = self.buffer.latest()
+        max_age = max_age if max_age is not None else 2 * self.interval
+        if math.isnan(row[0]) or time.time() - row[0] > max_age:
+            self._reset_baselines()
+            time.sleep(min(self.interval, 0.5))
+            row = self._record()
+        return row
+
+    def overhead(self) -> dict:
+        """CPU time used by the sampling thread since the sampler started.
+
+        Returns:
+            dict: Number of samples, CPU seconds and the average share of one core.
+        """
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "samples": self.samples,
+            "cpu_seconds": self.cpu_time,
+            "percent_of_one_core": self.cpu_time / elapsed * 100,
+            "current_interval": self.current_interval,
+        }
+
+    def add_listener(self, listener: Callable[[List[float]], None]) -> None:
+        """Register a callback that receives every sampled row, timestamp first."""
+        self.listeners.append(listener)
+
+    def start(self) -> None:
+        """Starts the sampling thread"""
+        if not self.is_sampling:
+            self.is_sampling = True
+            self._stop_event.clear()
+            self._started_at = time.monotonic()
+            self.sampling_thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self.sampling_thread.start()
+
+    def stop(self) -> None:
+        """Stops the sampling thread"""
+        self.is_sampling = False
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.sampling_thread:
+            self.sampling_thread.join()
+            self.sampling_thread = None
+        if self.store is not None:
+            self.store.flush(final=True)
+
+    def close(self) -> None:
+        """Stop sampling and release the ring buffer, removing its shared memory block."""
+        self.stop()
+        if self.buffer.header is not None:
+            self.buffer.close()
+
+
+_sampler: Optional[MetricsSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> MetricsSampler:
+    """Return the process-wide sampler, starting it on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            # Imported here so the sampler can be used without the settings stack
+            from src.schemas.schemas import Settings
+            settings = Settings.from_json_file('src/app/settings.json')
+            monitoring = settings.user_settings.monitoring_settings
+            _sampler = MetricsSampler(interval=monitoring.sample_interval,
+                                      capacity=monitoring.buffer_size,
+                                      gpu_backend=get_gpu_backend(monitoring.gpu_backend))
+            if monitoring.store_enabled:
+                from src.tools.computer_state_tools.monitoring_tools.metrics_store import MetricsStore
+                store = MetricsStore(monitoring.store_dir, _sampler.fields())
+                _sampler.store = store
+                _sampler.add_listener(lambda row: store.append(row[0], row[1:]))
+                _sampler.subscribe("recording", monitoring.background_interval)
+            # The shared memory block outlives the process on POSIX unless it is unlinked
+            atexit.register(close_sampler)
+        _sampler.start()
+        return _sampler
+
+
+def close_sampler() -> None:
+    """Stop the process-wide sampler and free its shared memory, e.g. when the app closes."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None:
+            _sampler.close()
+            _sampler = None
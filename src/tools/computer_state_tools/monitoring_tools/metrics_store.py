@@ -0,0 +1,284 @@
+# python
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+# 3rd party
+import numpy as np
+
+
+class MetricsStore:
+    """
+    Append-only on-disk time series of metric samples.
+
+    Samples are fixed-width NumPy records appended to one file per day, next
+    to a file of per-minute min/max/mean rollups. File names carry a hash of
+    the field list, so a schema change starts new files instead of breaking
+    old ones. Reads memory-map the files and locate ranges with binary
+    search on the timestamp column, so queries never scan whole files.
+
+    Attributes:
+        directory: folder with the day files
+        fields: names of the stored metrics
+    """
+
+    RAW_SUFFIX = ".bin"
+    ROLLUP_SUFFIX = ".min.bin"
+    # Ranges longer than this are answered from minute rollups
+    ROLLUP_AFTER = 6 * 3600
+
+    def __init__(self, directory: str | Path, fields: List[str], flush_every: int = 10):
+        """
+        Initializes the MetricsStore class.
+
+        Args:
+            directory: folder with the day files
+            fields: names of the stored metrics
+            flush_every: number of samples buffered before they are written
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fields = list(fields)
+        self.raw_dtype = raw_dtype(self.fields)
+        self.rollup_dtype = rollup_dtype(self.fields)
+        self.schema = hashlib.sha1(json.dumps(self.fields).encode("utf-8")).hexdigest()[:8]
+        schema_path = self.directory / f"{self.schema}.json"
+        if not schema_path.exists():
+            schema_path.write_text(json.dumps(self.fields), encoding="utf-8")
+
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._pending = np.zeros(flush_every, dtype=self.raw_dtype)
+        self._pending_count = 0
+        self._pending_rollups: List[np.void] = []
+        self._minute: Optional[float] = None
+        self._sum = np.zeros(len(self.fields))
+        self._min = np.full(len(self.fields), np.inf)
+        self._max = np.full(len(self.fields), -np.inf)
+        # Finite values per field in the current minute, metrics without data are NaN
+        self._finite = np.zeros(len(self.fields))
+        self._count = 0
+        self._memmaps: Dict[Path, np.memmap] = {}
+
+    def append(self, timestamp: float, values: List[float]) -> None:
+        """Buffer one sample, writing the buffer to disk when it is full."""
+        row = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            record = self._pending[self._pending_count]
+            record["timestamp"] = timestamp
+            for field, value in zip(self.fields, row):
+                record[field] = value
+            self._pending_count += 1
+            self._add_to_rollup(timestamp, row)
+            if self._pending_count == self.flush_every:
+                self._flush_locked()
+
+    def _add_to_rollup(self, timestamp: float, row: np.ndarray) -> None:
+        minute = timestamp // 60 * 60
+        if self._minute is not None and minute != self._minute:
+            self._close_minute()
+        self._minute = minute
+        finite = np.isfinite(row)
+        self._sum[finite] += row[finite]
+        self._finite += finite
+        # fmin and fmax ignore NaN
+        np.fmin(self._min, row, out=self._min)
+        np.fmax(self._max, row, out=self._max)
+        self._count += 1
+
+    def _close_minute(self) -> None:
+        rollup = np.zeros(1, dtype=self.rollup_dtype)[0]
+        rollup["timestamp"] = self._minute
+        rollup["count"] = self._count
+        for i, field in enumerate(self.fields):
+            has_data = self._finite[i] > 0
+            rollup[f"{field}_mean"] = self._sum[i] / self._finite[i] if has_data else np.nan
+            rollup[f"{field}_min"] = self._min[i] if has_data else np.nan
+            rollup[f"{field}_max"] = self._max[i] if has_data else np.nan
+            rollup[f"{field}_count"] = self._finite[i]
+        self._pending_rollups.append(rollup)
+        self._sum[:] = 0
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+        self._finite[:] = 0
+        self._count = 0
+
+    def flush(self, final: bool = False) -> None:
+        """Write buffered samples and closed minutes to disk.
+
+        Args:
+            final: also close the minute in progress, e.g. when sampling stops
+        """
+        with self._lock:
+            if final and self._count:
+                self._close_minute()
+                self._minute = None
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._pending_count:
+            self._write(self._pending[:self._pending_count], self.RAW_SUFFIX)
+            self._pending_count = 0
+        if self._pending_rollups:
+            self._write(np.array(self._pending_rollups, dtype=self.rollup_dtype), self.ROLLUP_SUFFIX)
+            self._pending_rollups = []
+
+    def _write(self, records: np.ndarray, suffix: str) -> None:
+        # Records are split by local day, usually there is only one group
+        days = [day_of(ts) for ts in records["timestamp"]]
+        for day in sorted(set(days)):
+            mask = np.array([d == day for d in days])
+            with open(self._path(day, suffix), "ab") as file:
+                # A write cut off by a crash leaves a partial record, drop it so
+                # the records appended now stay aligned
+                partial = file.tell() % records.dtype.itemsize
+                if partial:
+                    file.truncate(file.tell() - partial)
+                    file.seek(0, 2)
+                file.write(records[mask].tobytes())
+
+    def _path(self, day: str, suffix: str, schema: Optional[str] = None) -> Path:
+        return self.directory / f"{day}-{schema or self.schema}{suffix}"
+
+    def _files(self, day: str, suffix: str) -> List[Tuple[Path, List[str]]]:
+        """Return the files of a day with their field lists, across schemas."""
+        files = []
+        for path in sorted(self.directory.glob(f"{day}-*{suffix}")):
+            schema = path.name[len(day) + 1:-len(suffix)]
+            if "." in schema:
+                continue  # a rollup file matched the raw suffix
+            schema_path = self.directory / f"{schema}.json"
+            if schema_path.exists():
+                files.append((path, json.loads(schema_path.read_text(encoding="utf-8"))))
+        return files
+
+    def _open(self, path: Path, dtype: np.dtype, today: str) -> Optional[np.memmap]:
+        """Memory-map a day file. Files of past days never change and are cached."""
+        if path in self._memmaps:
+            return self._memmaps[path]
+        rows = path.stat().st_size // dtype.itemsize
+        if rows == 0:
+            return None
+        data = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+        if not path.name.startswith(today):
+            self._memmaps[path] = data
+        return data
+
+    def query(self, field: str, start: float, end: float) -> dict:
+        """Aggregate one field over a time range.
+
+        Args:
+            field (str): Metric name.
+            start (float): Range start, unix time.
+            end (float): Range end, unix time.
+
+        Returns:
+            dict: mean, min, max, sample count and whether rollups were used. Samples
+                without a value (NaN, e.g. GPU metrics without a GPU) are not counted,
+                mean, min and max are None if no sample has a value.
+        """
+        self.flush()
+        use_rollups = end - start > self.ROLLUP_AFTER
+        suffix = self.ROLLUP_SUFFIX if use_rollups else self.RAW_SUFFIX
+        today = day_of(datetime.now().timestamp())
+        total = weighted = 0.0
+        low, high = np.inf, -np.inf
+
+        day = datetime.fromtimestamp(start).date()
+        last_day = datetime.fromtimestamp(end).date()
+        while day <= last_day:
+            for path, fields in self._files(day.isoformat(), suffix):
+                if field not in fields:
+                    continue
+                dtype = rollup_dtype(fields) if use_rollups else raw_dtype(fields)
+                data = self._open(path, dtype, today)
+                if data is None:
+                    continue
+                timestamps = data["timestamp"]
+                left = int(np.searchsorted(timestamps, start, side="left"))
+                right = int(np.searchsorted(timestamps, end, side="right"))
+                if right <= left:
+                    continue
+                part = data[left:right]
+                if use_rollups:
+                    counts = part[f"{field}_count"].astype(np.float64)
+                    finite = counts > 0
+                    if not finite.any():
+                        continue
+                    means = part[f"{field}_mean"][finite].astype(np.float64)
+                    total += counts[finite].sum()
+                    weighted += float(np.sum(means * counts[finite]))
+                    low = min(low, float(np.nanmin(part[f"{field}_min"][finite])))
+                    high = max(high, float(np.nanmax(part[f"{field}_max"][finite])))
+                else:
+                    values = part[field].astype(np.float64)
+                    values = values[np.isfinite(values)]
+                    if not len(values):
+                        continue
+                    total += len(values)
+                    weighted += float(np.sum(values))
+                    low = min(low, float(np.min(values)))
+                    high = max(high, float(np.max(values)))
+            day += timedelta(days=1)
+
+        if total == 0:
+            return {"mean": None, "min": None, "max": None, "samples": 0, "from_minute_rollups": use_rollups}
+        return {
+            "mean": float(weighted / total),
+            "min": low,
+            "max": high,
+            "samples": int(total),
+            "from_minute_rollups": use_rollups,
+        }
+
+
+def raw_dtype(fields: List[str]) -> np.dtype:
+    """Record layout of raw samples."""
+    return np.dtype([("timestamp", "<f8")] + [(field, "<f4") for field in fields])
+
+
+def rollup_dtype(fields: List[str]) -> np.dtype:
+    """Record layout of per-minute rollups, `count` is the samples of the minute and
+    `<field>_count` the ones with a value for the field."""
+    columns = [("timestamp", "<f8"), ("count", "<i4")]
+    for field in fields:
+        columns += [(f"{field}_mean", "<f4"), (f"{field}_min", "<f4"), (f"{field}_max", "<f4"),
+                    (f"{field}_count", "<i4")]
+    return np.dtype(columns)
+
+
+def day_of(timestamp: float) -> str:
+    """Local calendar day of a unix timestamp, as YYYY-MM-DD."""
+    return datetime.fromtimestamp(timestamp).date().isoformat()
+
+
+def parse_time(value: str, now: Optional[datetime] = None) -> datetime:
+    """Parse an ISO 8601 date/time or a relative expression.
+
+    Supported relative forms: "now", "today", "yesterday" and offsets such as
+    "-30m", "-2h", "-1d" or "-1w".
+
+    Args:
+        value (str): Time expression.
+        now (Optional[datetime]): Reference time, the current time by default.
+
+    Returns:
+        datetime: Local naive datetime.
+    """
+    now = now or datetime.now()
+    text = value.strip().lower()
+    if text == "now":
+        return now
+    if text == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if text == "yesterday":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    if text.startswith("-") and text[-1:] in units:
+        return now - timedelta(**{units[text[-1]]: float(text[1:-1])})
+    parsed = datetime.fromisoformat(value.strip())
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
@@ -3,95 +3,340 @@ import time
 from collections import deque
 import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional, Sequence, Union
 # 3rd party
 import flet as ft  # type: ignore
+import numpy as np
+# project
+from src.tools.computer_state_tools.monitoring_tools.metric_history import TieredHistory, lttb
+from src.pages.update_scheduler import get_update_scheduler
+
+# Selectable chart ranges, None is the live incremental window
+RANGES = {"Live": None, "5 min": 300, "1 hour": 3600, "24 hours": 86400}
+# Samples between vertical grid lines of the live window
+LIVE_GRID_INTERVAL = 5
+# Vertical grid lines drawn over a longer range
+RANGE_GRID_LINES = 12
 
 
 class Monitor(ABC):
     """
     Base abstract class for all monitors.
 
+    Each chart shows one or more series. Charts are updated incrementally: on
+    every tick the oldest point of each series is dropped, one new point is
+    appended and the x range slides, so only the changed controls are sent
+    to the client no matter how long the window is. Longer ranges are drawn
+    from the TieredHistory of a subclass, downsampled with LTTB to a fixed
+    point budget.
+    Percent charts have a fixed 0-100 scale, charts with other units are
+    rescaled to the largest visible value.
+
     Attributes:
         is_monitoring: flag for monitoring status
         monitoring_thread: monitoring thread
         page: Flet page
         charts: list of charts
-        histories: list of histories of values for each graph
+        histories: list of histories of values for each series
+        window: number of samples shown per series
+        history: multi-resolution history longer ranges are drawn from, None if the monitor has none
     """
 
-    def __init__(self, chart_names: List[str], colors: List[str]):
+    def __init__(self, chart_names: List[str], colors: Sequence[Union[str, List[str]]],
+                 window: int = 30, interval: float = 1.0, point_budget: int = 120,
+                 units: Optional[Sequence[str]] = None,
+                 series_names: Optional[Sequence[Optional[List[str]]]] = None):
         """
         Initializes the Monitor class.
 
         Args:
             chart_names: list of chart names
-            colors: list of colors for each graph
+            colors: color of each chart, or a list of colors for a chart with several series
+            window: number of samples shown per series
+            interval: seconds between samples
+            point_budget: maximum points per series for long ranges
+            units: unit of each chart, "%" by default
+            series_names: legend labels of each chart, None for no legend
         """
         if len(chart_names) != len(colors):
             raise ValueError(
                 "The number of chart names must match the number of colors")
+        if units is not None and len(units) != len(chart_names):
+            raise ValueError(
+                "The number of chart names must match the number of units")
 
         self.is_monitoring = False
         self.monitoring_thread = None
+        self._stop_event = threading.Event()
+        self._visible = threading.Event()
         self.page = None
         self.charts = []
-        self.histories = [deque([0.0]*30, maxlen=30) for _ in chart_names]
         self.chart_names = chart_names
+        self.series_colors = [[c] if isinstance(c, str) else list(c) for c in colors]
         self.colors = colors
+        self.window = window
+        self.interval = interval
+        self.series_count = sum(len(c) for c in self.series_colors)
+        self.units = list(units) if units is not None else ["%"] * len(chart_names)
+        self.series_names = list(series_names) if series_names is not None else [None] * len(chart_names)
+        self.histories = [deque([0.0]*window, maxlen=window)
+                          for _ in range(self.series_count)]
+        # x coordinate of the newest point
+        self.tick = window - 1
+        self.history: Optional[TieredHistory] = None
+        self.point_budget = point_budget
+        self.range_seconds: Optional[int] = None
 
     def start_monitoring(self):
         """Starts the monitoring process"""
         if not self.is_monitoring:
             self.is_monitoring = True
+            self._stop_event.clear()
+            self._visible.set()
             self.monitoring_thread = threading.Thread(
                 target=self._monitor_loop)
             self.monitoring_thread.daemon = True
             self.monitoring_thread.start()
 
-    def stop_monitoring(self):
-        """Stops the monitoring process"""
+    def stop_monitoring(self, keep_dashboard: bool = False):
+        """Stops the monitoring process
+
+        Args:
+            keep_dashboard: keep the charts, so start_monitoring continues them
+        """
         self.is_monitoring = False
+        self._stop_event.set()
+        self._visible.set()
         if self.monitoring_thread:
             self.monitoring_thread.join()
+            self.monitoring_thread = None
 
-        if self.page:
+        if self.page and not keep_dashboard:
             self.page = None
             self.charts = []
 
+    def pause(self):
+        """Stop sampling and updating the charts while they are not visible"""
+        self._visible.clear()
+
+    def resume(self):
+        """Continue updating the charts after pause"""
+        self._visible.set()
+
+    def _push_values(self, values: List[float]) -> bool:
+        """Append one sample per series and slide the charts by one point.
+
+        Args:
+            values: one value per series, in chart order
+
+        Returns:
+            bool: True if the charts changed and need an update
+        """
+        self.tick += 1
+        for history, value in zip(self.histories, values):
+            history.append(value)
+
+        if not self.charts:
+            return False
+        if self.range_seconds is not None:
+            if self.history is None:
+                return False
+            # Long ranges only change when a new bucket is added
+            resolution = self.history.tier_for(self.range_seconds).resolution
+            if self.tick % max(1, round(resolution / self.interval)) != 0:
+                return False
+            self._render_range()
+            return True
+        series = iter(values)
+        histories = iter(self.histories)
+        for chart, unit in zip(self.charts, self.units):
+            for data in chart.data_series:
+                points = data.data_points
+                points.pop(0)
+                points.append(ft.LineChartDataPoint(self.tick, next(series)))
+            chart.min_x = self.tick - self.window + 1
+            chart.max_x = self.tick
+            self._slide_labels(chart.bottom_axis)
+            chart_histories = [next(histories) for _ in chart.data_series]
+            if unit != "%":
+                self._rescale(chart, unit, max(max(h) for h in chart_histories))
+        return True
+
+    def _slide_labels(self, axis: ft.ChartAxis) -> None:
+        """Keep bottom axis labels every 5 samples inside the visible range."""
+        low = self.tick - self.window + 1
+        while axis.labels and axis.labels[0].value < low:
+            axis.labels.pop(0)
+        if self.tick % 5 == 0:
+            axis.labels.append(self._time_label(self.tick))
+
+    def _time_label(self, x: int) -> ft.ChartAxisLabel:
+        return ft.ChartAxisLabel(value=x, label=ft.Text(f"{round(x * self.interval)}s"))
+
+    @staticmethod
+    def _nice_max(peak: float) -> float:
+        """Round a peak value up to 1, 2 or 5 times a power of ten."""
+        if not peak > 0:
+            return 1.0
+        magnitude = 10 ** np.floor(np.log10(peak))
+        for step in (1, 2, 5, 10):
+            if peak <= step * magnitude:
+                return float(step * magnitude)
+        return float(10 * magnitude)
+
+    def _value_labels(self, unit: str, max_y: float) -> List[ft.ChartAxisLabel]:
+        return [ft.ChartAxisLabel(value=y, label=ft.Text(f"{y:g}{unit}"))
+                for y in np.linspace(0, max_y, 6).round(6)]
+
+    def _rescale(self, chart: ft.LineChart, unit: str, peak: float) -> None:
+        """Fit the y axis of a chart to its largest visible value."""
+        max_y = self._nice_max(peak)
+        if chart.max_y == max_y:
+            return
+        chart.max_y = max_y
+        chart.horizontal_grid_lines.interval = max_y / 5
+        chart.left_axis.labels = self._value_labels(unit, max_y)
+
+    def _render_live(self) -> None:
+        """Rebuild the charts from the live window."""
+        first_x = self.tick - self.window + 1
+        histories = iter(self.histories)
+        for chart, unit in zip(self.charts, self.units):
+            peak = 0.0
+            for data in chart.data_series:
+                history = next(histories)
+                data.data_points = [ft.LineChartDataPoint(first_x + x, y)
+                                    for x, y in enumerate(history)]
+                peak = max(peak, max(history))
+            if unit != "%":
+                self._rescale(chart, unit, peak)
+            chart.min_x, chart.max_x = first_x, self.tick
+            chart.vertical_grid_lines.interval = LIVE_GRID_INTERVAL
+            chart.bottom_axis.labels = [self._time_label(x)
+                                        for x in range(first_x, self.tick + 1) if x % 5 == 0]
+
+    def _query_series(self, series: int, seconds: float, now: float) -> Dict[str, np.ndarray]:
+        """Return the history buckets of one series over the last `seconds`.
+
+        Args:
+            series: index of the series in chart order
+            seconds: window length
+            now: end of the window
+
+        Returns:
+            Dict[str, np.ndarray]: "start" and "mean" arrays, empty if the monitor has no history
+        """
+        return {"start": np.empty(0), "mean": np.empty(0)}
+
+    def _render_range(self) -> None:
+        """Rebuild the charts from the history for the selected range."""
+        seconds = self.range_seconds or 0
+        now = (self.history.last_timestamp if self.history else None) or time.time()
+        series = iter(range(self.series_count))
+        for chart, unit in zip(self.charts, self.units):
+            peak = 0.0
+            for data in chart.data_series:
+                buckets = self._query_series(next(series), seconds, now)
+                # Buckets without a single valid sample, e.g. no GPU reading, are gaps
+                valid = np.isfinite(buckets["mean"])
+                x, y = lttb(buckets["start"][valid] - now, buckets["mean"][valid], self.point_budget)
+                data.data_points = [ft.LineChartDataPoint(float(px), float(py))
+                                    for px, py in zip(x, y)]
+                if len(y):
+                    peak = max(peak, float(np.max(y)))
+            if unit != "%":
+                self._rescale(chart, unit, peak)
+            chart.min_x, chart.max_x = -seconds, 0
+            # One line every 5 seconds would be thousands of lines over 24 hours
+            chart.vertical_grid_lines.interval = max(seconds / RANGE_GRID_LINES, LIVE_GRID_INTERVAL)
+            chart.bottom_axis.labels = [
+                ft.ChartAxisLabel(value=float(x), label=ft.Text(self._format_ago(-x)))
+                for x in np.linspace(-seconds, 0, 5)
+            ]
+
+    @staticmethod
+    def _format_ago(seconds: float) -> str:
+        if seconds >= 3600:
+            return f"-{seconds / 3600:g}h"
+        if seconds >= 60:
+            return f"-{seconds / 60:g}m"
+        return f"-{seconds:g}s" if seconds else "now"
+
+    def set_range(self, seconds: Optional[int]) -> None:
+        """Switch the charts between the live window and a longer range.
+
+        Args:
+            seconds: range in seconds, None for the live window
+        """
+        self.range_seconds = seconds
+        if not self.charts:
+            return
+        self.redraw()
+        if self.page:
+            get_update_scheduler(self.page).schedule(*self.charts)
+
+    def redraw(self) -> None:
+        """Rebuild the charts of the selected range without sending them."""
+        if not self.charts:
+            return
+        if self.range_seconds is None:
+            self._render_live()
+        else:
+            self._render_range()
+
     def _monitor_loop(self):
         """Main monitoring loop"""
         while self.is_monitoring:
+            if not self._visible.is_set():
+                # Paused, block without sampling until resumed or stopped
+                self._visible.wait()
+                continue
             values = self._get_monitor_values()
-            for history, value in zip(self.histories, values):
-                history.append(value)
-
-            if self.page and self.charts:
-                try:
-                    for chart, history in zip(self.charts, self.histories):
-                        chart.data_series[0].data_points = [
-                            ft.LineChartDataPoint(x, y)
-                            for x, y in enumerate(history)
-                        ]
-                    self.page.update()
-                except Exception:
-                    pass
-
-            time.sleep(1)
-
-    def create_dashboard(self, page: ft.Page):
-        """Creates a dashboard with graphs"""
+            try:
+                changed = self._push_values(values)
+                if changed and self.page and self.charts:
+                    # Only the charts are diffed, not the whole page, and ticks of
+                    # several monitors in the same frame are sent together
+                    get_update_scheduler(self.page).schedule(*self.charts)
+            except Exception:
+                pass
+
+            # Waiting on the event lets stop_monitoring return immediately
+            self._stop_event.wait(self.interval)
+
+    def build_dashboard(self, page: ft.Page) -> List[ft.Control]:
+        """Creates the dashboard controls with graphs.
+
+        Args:
+            page: page the charts are updated on once the controls are shown
+
+        Returns:
+            List[ft.Control]: range selector, chart titles and charts
+        """
         self.page = page
-        page.title = "System Monitor"
-        page.theme_mode = ft.ThemeMode.DARK
-        page.padding = 20
+        self.charts = []
+        controls: List[ft.Control] = [ft.Dropdown(
+            label="Range",
+            width=150,
+            value="Live",
+            options=[ft.dropdown.Option(name) for name in RANGES],
+            on_change=lambda e: self.set_range(RANGES[e.control.value]),
+        )]
 
-        for name, color, history in zip(self.chart_names, self.colors, self.histories):
-            chart = self._create_chart(history, color)
+        histories = iter(self.histories)
+        for name, colors, unit, legend in zip(self.chart_names, self.series_colors,
+                                              self.units, self.series_names):
+            chart = self._create_chart([next(histories) for _ in colors], colors, unit)
             self.charts.append(chart)
 
-            page.add(
-                ft.Text(name, size=20, weight=ft.FontWeight.BOLD),
+            title = ft.Text(name, size=20, weight=ft.FontWeight.BOLD)
+            if legend:
+                title = ft.Row([title] + [
+                    ft.Text(label, color=color)
+                    for label, color in zip(legend, colors)
+                ], spacing=15)
+            controls.extend([
+                title,
                 ft.Container(
                     content=chart,
                     border=ft.border.all(1, ft.Colors.GREY_400),
@@ -100,21 +345,25 @@ class Monitor(ABC):
                     margin=ft.margin.only(bottom=20),
                     height=300,
                 )
-            )
+            ])
+        return controls
 
-    def _create_chart(self, history: deque, color: str) -> ft.LineChart:
+    def _create_chart(self, histories: List[deque], colors: List[str], unit: str = "%") -> ft.LineChart:
         """Creates a graph with given parameters"""
+        first_x = self.tick - self.window + 1
+        max_y = 100 if unit == "%" else self._nice_max(max(max(h) for h in histories))
         return ft.LineChart(
             data_series=[
                 ft.LineChartData(
                     data_points=[
-                        ft.LineChartDataPoint(x, y)
+                        ft.LineChartDataPoint(first_x + x, y)
                         for x, y in enumerate(history)
                     ],
-                    stroke_width=2,
+                    stroke_width=2 if len(colors) == 1 else 1,
                     color=color,
-                    curved=True,
-                ),
+                    curved=len(colors) == 1,
+                )
+                for history, color in zip(histories, colors)
             ],
             border=ft.Border(
                 top=ft.BorderSide(width=1, color=ft.Colors.GREY_400),
@@ -123,40 +372,32 @@ class Monitor(ABC):
                 right=ft.BorderSide(width=1, color=ft.Colors.GREY_400),
             ),
             horizontal_grid_lines=ft.ChartGridLines(
-                interval=10,
+                interval=10 if unit == "%" else max_y / 5,
                 color=ft.Colors.GREY_400,
                 width=1,
             ),
             vertical_grid_lines=ft.ChartGridLines(
-                interval=5,
+                interval=LIVE_GRID_INTERVAL,
                 color=ft.Colors.GREY_400,
                 width=1,
             ),
             left_axis=ft.ChartAxis(
-                labels=[
-                    ft.ChartAxisLabel(
-                        value=x,
-                        label=ft.Text(f"{x}%"),
-                    )
-                    for x in range(0, 101, 20)
-                ],
-                labels_size=40,
+                labels=self._value_labels(unit, max_y),
+                labels_size=60 if unit != "%" else 40,
             ),
             bottom_axis=ft.ChartAxis(
                 labels=[
-                    ft.ChartAxisLabel(
-                        value=x,
-                        label=ft.Text(f"{x}s"),
-                    )
-                    for x in range(0, 31, 5)
+                    self._time_label(x)
+                    for x in range(first_x, self.tick + 1)
+                    if x % 5 == 0
                 ],
                 labels_size=40,
             ),
             tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.BLUE_GREY),
             min_y=0,
-            max_y=100,
-            min_x=0,
-            max_x=30,
+            max_y=max_y,
+            min_x=first_x,
+            max_x=self.tick,
             expand=True,
         )
 
@@ -164,6 +405,6 @@ class Monitor(ABC):
     def _get_monitor_values(self) -> List[float]:
         """
         Abstract method for getting values for monitoring.
-        Must return a list of values for each graph.
+        Must return a list of values for each series, in chart order.
         """
         pass
@@ -1,217 +1,198 @@
 # python
-import os
-import signal
-import multiprocessing
-from typing import List
+import math
+from datetime import datetime
+from typing import Optional
 # 3rd party
 import flet as ft  # type: ignore
-import psutil
 from langchain.tools import tool  # type: ignore
-from src.tools.computer_state_tools.monitoring_tools.monitoring_class import Monitor
-import GPUtil  # type: ignore
+# project
+from src.tools.computer_state_tools.monitoring_tools.metrics_sampler import get_sampler
+from src.tools.computer_state_tools.monitoring_tools.metrics_store import parse_time
 
+# TODO Change methods for monitoring cpu and gpu (combine into one)
 
-class CPUMonitor(Monitor):
-    """
-    Class for monitoring CPU and memory usage.
-    """
+# Page of the app window, the dashboards are shown on its /monitor route
+app_page: Optional[ft.Page] = None
 
-    def __init__(self):
-        """
-        Initializes the CPUMonitor class.
-        """
-        super().__init__(
-            chart_names=["CPU Usage", "Memory Usage"],
-            colors=[ft.Colors.BLUE, ft.Colors.GREEN]
-        )
-
-    def _get_monitor_values(self) -> List[float]:
-        """
-        Gets the current values of CPU and memory.
-
-        Returns:
-            List[float]: List of values [cpu_percent, memory_percent]
-        """
-        return [
-            psutil.cpu_percent(),
-            psutil.virtual_memory().percent
-        ]
-
-
-class GPUMonitor(Monitor):
-    def __init__(self):
-        super().__init__(
-            chart_names=["GPU Usage", "GPU Temperature"],
-            colors=[ft.Colors.GREEN, ft.Colors.RED]
-        )
-
-    def _get_monitor_values(self) -> List[float]:
-        """
-        Gets the current values of GPU.
-
-        Returns:
-            List[float]: List of values [gpu_percent, gpu_temperature]
-        """
-        try:
-            gpu_usage = GPUtil.getGPUs()
-            return [
-                gpu_usage[0].load * 100,
-                gpu_usage[0].temperature,
-            ]
-        except Exception as e:
-            raise Exception(
-                f"Error getting GPU usage: {e}, do you have a GPU?")
-
-
-cpu_monitor = CPUMonitor()
-gpu_monitor = GPUMonitor()
 
-# TODO Change methods for monitoring cpu and gpu (combine into one)
+def set_app_page(page: ft.Page) -> None:
+    """Register the app page the monitoring tools navigate."""
+    global app_page
+    app_page = page
 
 
-def run_flet_dashboard_cpu(page: ft.Page):
-    """Function to run Flet dashboard."""
-    def on_window_close(e):
-        cpu_monitor.stop_monitoring()
+def open_monitor(kind: str, name: str) -> str:
+    """Show a monitoring dashboard in the app window.
 
-    page.on_close = on_window_close
-    cpu_monitor.create_dashboard(page)
-    cpu_monitor.start_monitoring()
+    Args:
+        kind (str): Monitor kind, the last part of the /monitor route.
+        name (str): Name of the monitoring used in the messages.
 
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    if app_page is None:
+        return "Monitoring can only be shown in the app window."
+    route = f"/monitor/{kind}"
+    if app_page.route == route:
+        return f"{name} monitoring is already open."
+    app_page.go(route)
+    return f"{name} monitoring opened. Charts are updated in real time in the app window."
 
-def run_flet_dashboard_gpu(page: ft.Page):
 
-    def on_window_close(e):
-        gpu_monitor.stop_monitoring()
+def close_monitor(kind: str, name: str) -> str:
+    """Close a monitoring dashboard and go back to the chat.
 
-    page.on_close = on_window_close
-    gpu_monitor.create_dashboard(page)
-    gpu_monitor.start_monitoring()
+    Args:
+        kind (str): Monitor kind, the last part of the /monitor route.
+        name (str): Name of the monitoring used in the messages.
 
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    if app_page is None or app_page.route != f"/monitor/{kind}":
+        return f"{name} monitoring is not open."
+    app_page.go("/")
+    return f"{name} monitoring stopped and closed."
 
-def run_flet_app_process_cpu():
-    """Function to run Flet application in a separate process."""
-    try:
-        ft.app(target=run_flet_dashboard_cpu, view=ft.AppView.FLET_APP)
-    finally:
-        cpu_monitor.stop_monitoring()
 
+@tool
+def start_monitoring_cpu_tool() -> str:
+    """Tool to start system resource monitoring.
 
-def run_flet_app_process_gpu():
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    return open_monitor("cpu", "System")
 
-    try:
-        ft.app(target=run_flet_dashboard_gpu, view=ft.AppView.FLET_APP)
-    finally:
-        gpu_monitor.stop_monitoring()
 
+@tool
+def stop_monitoring_cpu_tool() -> str:
+    """Tool to stop system resource monitoring.
 
-monitoring_process_cpu = None
-monitoring_process_gpu = None
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    return close_monitor("cpu", "System")
 
 
 @tool
-def start_monitoring_cpu_tool() -> str:
-    """Tool to start system resource monitoring.
+def start_monitoring_gpu_tool() -> str:
+    """Tool to start GPU monitoring.
 
     Returns:
         str: Message indicating the status of the operation
     """
-    global monitoring_process_cpu
+    if not get_sampler().has_gpu:
+        return "No GPU was detected on this computer, GPU monitoring is not available."
+    return open_monitor("gpu", "GPU")
 
-    if monitoring_process_cpu and monitoring_process_cpu.is_alive():
-        return "Monitoring is already running."
 
-    monitoring_process_cpu = multiprocessing.Process(
-        target=run_flet_app_process_cpu)
-    monitoring_process_cpu.daemon = True
-    monitoring_process_cpu.start()
+@tool
+def stop_monitoring_gpu_tool() -> str:
+    """Tool to stop GPU monitoring.
 
-    return "System monitoring started. Charts are updated in real time in a separate window."
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    return close_monitor("gpu", "GPU")
 
 
 @tool
-def stop_monitoring_cpu_tool() -> str:
-    """Tool to stop system resource monitoring.
+def start_monitoring_system_tool() -> str:
+    """Tool to open one page with all system charts: CPU, every CPU core, memory, disk I/O, network and GPU. Use it to find where a performance problem comes from.
 
     Returns:
         str: Message indicating the status of the operation
     """
-    global monitoring_process_cpu
-    try:
-        cpu_monitor.stop_monitoring()
-
-        def kill_process(process):
-            """Helper function to kill a process"""
-            if process and process.is_alive():
-                process.terminate()
-                process.join(timeout=1)
+    return open_monitor("system", "System overview")
 
-        if monitoring_process_cpu:
-            kill_process(monitoring_process_cpu)
-            monitoring_process_cpu = None
 
-        for process in multiprocessing.active_children():
-            kill_process(process)
+@tool
+def stop_monitoring_system_tool() -> str:
+    """Tool to close the system overview.
 
-        return "System monitoring stopped and window closed."
-    except Exception as e:
-        try:
-            if monitoring_process_cpu and monitoring_process_cpu.pid:
-                os.kill(monitoring_process_cpu.pid, signal.SIGTERM)
-        except Exception:
-            pass
-        return f"Error while stopping monitoring: {str(e)}"
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    return close_monitor("system", "System overview")
 
 
 @tool
-def start_monitoring_gpu_tool() -> str:
-    """Tool to start GPU monitoring.
+def get_system_metrics_tool() -> dict:
+    """Tool to get the current CPU, memory, disk, network and GPU usage of the computer.
 
     Returns:
-        str: Message indicating the status of the operation
+        dict: Latest CPU, busiest core and memory usage in percent, disk and network throughput in MB/s, free space of the system drive in GB, the CPU used by monitoring itself and, if a GPU is present, GPU load and temperature
     """
-    global monitoring_process_gpu
+    sampler = get_sampler()
+    values = dict(zip(sampler.buffer.fields, sampler.latest_row()))
+    cores = [value for field, value in values.items() if field.startswith("cpu_core_")]
+    metrics = {
+        "cpu_percent": values["cpu_percent"],
+        "busiest_core_percent": max(cores) if cores else float("nan"),
+        "memory_percent": values["memory_percent"],
+        "disk_read_mb_s": values["disk_read_bps"] / 1024 ** 2,
+        "disk_write_mb_s": values["disk_write_bps"] / 1024 ** 2,
+        "network_received_mb_s": values["net_recv_bps"] / 1024 ** 2,
+        "network_sent_mb_s": values["net_sent_bps"] / 1024 ** 2,
+        "system_disk_free_gb": values["disk_free_gb"],
+        "monitoring_overhead_percent_of_one_core": sampler.overhead()["percent_of_one_core"],
+    }
+    if sampler.has_gpu:
+        metrics["gpu_load_percent"] = values["gpu_load"]
+        metrics["gpu_temperature_c"] = values["gpu_temperature"]
+    return {key: None if math.isnan(value) else round(value, 1) for key, value in metrics.items()}
 
-    if monitoring_process_gpu and monitoring_process_gpu.is_alive():
-        return "Monitoring is already running."
 
-    monitoring_process_gpu = multiprocessing.Process(
-        target=run_flet_app_process_gpu)
-    monitoring_process_gpu.daemon = True
-    monitoring_process_gpu.start()
+@tool
+def get_metric_history_tool(metric: str, minutes: int = 60, threshold: Optional[float] = None) -> dict:
+    """Tool to summarize the recent history of a system metric, for questions like "was the CPU pegged in the last hour?".
 
-    return "GPU monitoring started. Charts are updated in real time in a separate window."
+    Args:
+        metric (str): One of "cpu_percent", "memory_percent", "gpu_load", "gpu_temperature", "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps", "disk_free_gb" or "cpu_core_N" for core N.
+        minutes (int, optional): How far back to look, up to 1440 (24 hours). Defaults to 60.
+        threshold (Optional[float], optional): If given, also return the percent of time the metric was above it.
+    Returns:
+        dict: Mean, min and max of the metric over the window and how much of the window is covered
+    """
+    sampler = get_sampler()
+    if metric not in sampler.history.fields:
+        return {"error": f"Unknown metric '{metric}'. Choose from {sampler.history.fields}."}
+    summary = sampler.history.summary(metric, minutes * 60, threshold=threshold)
+    if not summary.get("samples"):
+        return {"error": "No samples have been recorded yet."}
+    return {key: round(value, 2) if isinstance(value, float) else value
+            for key, value in summary.items()}
 
 
 @tool
-def stop_monitoring_gpu_tool() -> str:
-    """Tool to stop GPU monitoring.
+def query_metrics_store_tool(metric: str, start: str, end: str = "now") -> dict:
+    """Tool to get the average, minimum and maximum of a system metric over any past time range, for questions like "average RAM yesterday afternoon".
 
+    Args:
+        metric (str): One of "cpu_percent", "memory_percent", "gpu_load", "gpu_temperature", "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps", "disk_free_gb" or "cpu_core_N" for core N.
+        start (str): Range start as ISO date/time (e.g. "2025-01-31T13:00") or relative ("-2h", "-3d", "yesterday", "today").
+        end (str, optional): Range end in the same format. Defaults to "now".
     Returns:
-        str: Message indicating the status of the operation
+        dict: Mean, min and max of the metric over the range, the number of samples and the current local time
     """
-    global monitoring_process_gpu
+    sampler = get_sampler()
+    if sampler.store is None:
+        return {"error": "Metrics recording is disabled in the settings."}
+    if metric not in sampler.store.fields:
+        return {"error": f"Unknown metric '{metric}'. Choose from {sampler.store.fields}."}
     try:
-        gpu_monitor.stop_monitoring()
-
-        def kill_process(process):
-            """Helper function to kill a process"""
-            if process and process.is_alive():
-                process.terminate()
-                process.join(timeout=1)
-
-        if monitoring_process_gpu:
-            kill_process(monitoring_process_gpu)
-            monitoring_process_gpu = None
-
-        for process in multiprocessing.active_children():
-            kill_process(process)
-
-        return "System monitoring stopped and window closed."
-    except Exception as e:
-        try:
-            if monitoring_process_gpu and monitoring_process_gpu.pid:
-                os.kill(monitoring_process_gpu.pid, signal.SIGTERM)
-        except Exception:
-            pass
-        return f"Error while stopping monitoring: {str(e)}"
+        start_time, end_time = parse_time(start), parse_time(end)
+    except ValueError as e:
+        return {"error": f"Could not parse the time range: {e}"}
+
+    result = sampler.store.query(metric, start_time.timestamp(), end_time.timestamp())
+    result = {key: round(value, 2) if isinstance(value, float) else value
+              for key, value in result.items()}
+    result["start"] = start_time.isoformat(timespec="minutes")
+    result["end"] = end_time.isoformat(timespec="minutes")
+    result["now"] = datetime.now().isoformat(timespec="minutes")
+    if not result.get("samples"):
+        result["error"] = "No samples were recorded in this range."
+    return result
@@ -0,0 +1,155 @@
+# python
+import threading
+import time
+from typing import Dict, List, Optional
+# 3rd party
+import psutil
+from langchain.tools import tool
+
+# Snapshots older than this many windows are too old to measure "right now" against
+STALE_WINDOWS = 3
+
+
+class ProcessEntry:
+    """Last seen counters of one process."""
+
+    __slots__ = ("pid", "name", "cpu_time", "io_bytes", "rss",
+                 "cpu_percent", "io_rate")
+
+    def __init__(self, pid: int, name: str):
+        self.pid = pid
+        self.name = name
+        self.cpu_time: Optional[float] = None
+        self.io_bytes: Optional[int] = None
+        self.rss = 0
+        self.cpu_percent = 0.0
+        self.io_rate = 0.0
+
+
+class ProcessTable:
+    """
+    Incrementally maintained table of running processes.
+
+    Every refresh walks psutil.process_iter with only the needed attributes
+    prefetched (psutil keeps the Process objects between calls) and turns
+    the cumulative CPU time and I/O byte counters into per-process rates
+    using the values cached from the previous refresh.
+
+    Attributes:
+        entries: cached processes by PID
+        refreshed_at: monotonic time of the last refresh
+    """
+
+    ATTRS = ["name", "cpu_times", "memory_info", "io_counters"]
+
+    def __init__(self):
+        self.entries: Dict[int, ProcessEntry] = {}
+        self.refreshed_at: Optional[float] = None
+        self.interval = 0.0
+        self.cpu_count = psutil.cpu_count() or 1
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Take a new snapshot and update the per-process rates."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.refreshed_at if self.refreshed_at else 0.0
+            seen = set()
+            for process in psutil.process_iter(self.ATTRS, ad_value=None):
+                info = process.info
+                pid = process.pid
+                seen.add(pid)
+                entry = self.entries.get(pid)
+                if entry is None or entry.name != info["name"]:
+                    # New process, or the PID was reused by another program
+                    entry = ProcessEntry(pid, info["name"] or "")
+                    self.entries[pid] = entry
+
+                cpu_times = info["cpu_times"]
+                cpu_time = cpu_times.user + cpu_times.system if cpu_times else None
+                io = info["io_counters"]
+                io_bytes = io.read_bytes + io.write_bytes if io else None
+                memory = info["memory_info"]
+                entry.rss = memory.rss if memory else 0
+
+                if elapsed > 0 and cpu_time is not None and entry.cpu_time is not None:
+                    # Share of the whole machine, like the Windows task manager
+                    entry.cpu_percent = max(0.0, (cpu_time - entry.cpu_time)
+                                            / elapsed / self.cpu_count * 100)
+                if elapsed > 0 and io_bytes is not None and entry.io_bytes is not None:
+                    entry.io_rate = max(0.0, (io_bytes - entry.io_bytes) / elapsed)
+                entry.cpu_time = cpu_time
+                entry.io_bytes = io_bytes
+
+            for pid in self.entries.keys() - seen:
+                del self.entries[pid]
+            self.interval = elapsed
+            self.refreshed_at = now
+
+    def top(self, count: int = 5, sort_by: str = "cpu", window: float = 1.0) -> List[dict]:
+        """Return the heaviest processes.
+
+        Rates are measured over at least `window` seconds. A recent snapshot is
+        reused, so repeated calls within the window cost nothing. A snapshot
+        older than STALE_WINDOWS windows is replaced by a new baseline, so the
+        rates never average over a long idle time.
+
+        Args:
+            count (int): Number of processes to return.
+            sort_by (str): "cpu", "memory" or "io".
+            window (float): Minimum measurement window in seconds.
+
+        Returns:
+            List[dict]: Processes with pid, name, CPU %, memory in MB and I/O in MB/s.
+        """
+        keys = {
+            "cpu": lambda e: e.cpu_percent,
+            "memory": lambda e: e.rss,
+            "io": lambda e: e.io_rate,
+        }
+        if sort_by not in keys:
+            raise ValueError(f"Unknown sort key '{sort_by}'. Choose from {list(keys)}.")
+
+        age = time.monotonic() - self.refreshed_at if self.refreshed_at else None
+        if age is None or age > STALE_WINDOWS * window:
+            self.refresh()
+            time.sleep(window)
+            self.refresh()
+        elif age >= window or self.interval == 0:
+            if age < window:
+                time.sleep(window - age)
+            self.refresh()
+
+        with self._lock:
+            entries = sorted(self.entries.values(), key=keys[sort_by], reverse=True)[:count]
+            return [{
+                "pid": e.pid,
+                "name": e.name,
+                "cpu_percent": round(e.cpu_percent, 1),
+                "memory_mb": round(e.rss / 1024 ** 2, 1),
+                "io_mb_per_s": round(e.io_rate / 1024 ** 2, 2),
+            } for e in entries]
+
+
+process_table = ProcessTable()
+
+
+@tool
+def get_top_processes_tool(sort_by: str = "cpu", count: int = 5) -> dict:
+    """Tool to find which programs use the most CPU, memory or disk I/O right now, e.g. to explain why the computer is slow.
+
+    Args:
+        sort_by (str, optional): "cpu", "memory" or "io". Defaults to "cpu".
+        count (int, optional): Number of processes to return. Defaults to 5.
+    Returns:
+        dict: The top processes with pid, name, CPU share of the whole machine in percent, memory in MB and disk I/O in MB/s
+    """
+    try:
+        processes = process_table.top(count=max(1, min(count, 50)), sort_by=sort_by)
+    except ValueError as e:
+        return {"error": str(e)}
+    return {
+        "sorted_by": sort_by,
+        "measured_over_seconds": round(process_table.interval, 1),
+        "processes": processes,
+    }
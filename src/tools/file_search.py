@@ -0,0 +1,330 @@
+# python
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+# 3rd party
+from langchain.tools import tool
+# project
+from src.tools.computer_state_tools.monitoring_tools.metrics_store import parse_time
+from src.tools.token_utils import words
+
+# Folders that are never indexed, besides hidden ones
+EXCLUDED_DIRS = {"node_modules", "__pycache__", "site-packages", "venv", "AppData", "Library",
+                 "$RECYCLE.BIN", "System Volume Information"}
+# A full rescan also catches files edited in place, which do not change their folder's mtime
+FULL_RESCAN_INTERVAL = 24 * 3600
+# Changed folders written per transaction
+BATCH_DIRS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value REAL);
+CREATE TABLE IF NOT EXISTS dirs(path TEXT PRIMARY KEY, parent TEXT, mtime REAL);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files(id INTEGER PRIMARY KEY, dir TEXT, name TEXT, ext TEXT, size INTEGER, mtime REAL);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS files_ext_mtime ON files(ext, mtime);
+CREATE INDEX IF NOT EXISTS files_mtime ON files(mtime);
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name, dir) VALUES (new.id, new.name, new.dir);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name, dir) VALUES ('delete', old.id, old.name, old.dir);
+END;
+"""
+
+
+def date_range(value: str, end: bool = False) -> Optional[float]:
+    """Turn "2024", "2024-03", an ISO date or a relative time like "-30d" into a timestamp.
+
+    A year or month stands for its first moment, or with `end` for the first moment after it.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    parts = value.split("-")
+    if value[:1].isdigit() and len(parts) <= 2 and all(part.isdigit() for part in parts):
+        year, month = int(parts[0]), int(parts[1]) if len(parts) == 2 else None
+        if end:
+            year, month = (year + 1, 1) if month in (None, 12) else (year, month + 1)
+        return datetime(year, month or 1, 1).timestamp()
+    return parse_time(value).timestamp()
+
+
+class FileIndex:
+    """
+    Persistent index of file names for fast local file search.
+
+    File names and folders live in SQLite with an FTS5 trigram index, so any
+    part of a name is found in milliseconds, also over millions of files. A
+    background thread keeps the index up to date: every folder's mtime is
+    stored and a rescan only lists the folders whose mtime changed, which
+    happens when a file in them is created, deleted or renamed. Unchanged
+    folders cost one stat and their sub folders come from the index.
+
+    Attributes:
+        path: SQLite database file
+        roots: folders that are indexed
+        rescan_interval: seconds between rescans
+        ready: set once the first scan has finished
+    """
+
+    def __init__(self, path: Path, roots: List[Path], rescan_interval: float = 900.0):
+        self.path = path
+        self.roots = roots
+        self.rescan_interval = rescan_interval
+        self.ready = threading.Event()
+        self.trigram = True
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            try:
+                connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING "
+                                   "fts5(name, dir, content='files', content_rowid='id', tokenize='trigram')")
+            except sqlite3.OperationalError:
+                # SQLite before 3.34 has no trigram tokenizer, words are matched by prefix instead
+                self.trigram = False
+                connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING "
+                                   "fts5(name, dir, content='files', content_rowid='id')")
+            connection.executescript(SCHEMA)
+            if connection.execute("SELECT value FROM meta WHERE key = 'last_full'").fetchone():
+                self.ready.set()
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        # Readers never wait for the background writer
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def start(self) -> None:
+        """Start indexing in the background."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._index_loop, daemon=True, name="file-index")
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _index_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+                self.ready.set()
+            except Exception as e:
+                print(f"Warning: file indexing failed: {e}")
+            self._stop_event.wait(self.rescan_interval)
+
+    def scan(self, full: Optional[bool] = None) -> int:
+        """Bring the index up to date with the disk.
+
+        Args:
+            full (Optional[bool]): Re-read every folder, by default once every FULL_RESCAN_INTERVAL.
+
+        Returns:
+            int: Number of folders that were re-read.
+        """
+        connection = self._connect()
+        try:
+            last_full = connection.execute("SELECT value FROM meta WHERE key = 'last_full'").fetchone()
+            if full is None:
+                full = last_full is None or time.time() - last_full[0] > FULL_RESCAN_INTERVAL
+            known: Dict[str, float] = {}
+            children: Dict[str, List[str]] = {}
+            for path, parent, mtime in connection.execute("SELECT path, parent, mtime FROM dirs"):
+                known[path] = mtime
+                children.setdefault(parent, []).append(path)
+            changed = 0
+            for root in self.roots:
+                changed += self._scan_root(connection, str(root), known, children, full)
+            if full and not self._stop_event.is_set():
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('last_full', ?)", (time.time(),))
+            connection.commit()
+            return changed
+        finally:
+            connection.close()
+
+    def _scan_root(self, connection: sqlite3.Connection, root: str, known: Dict[str, float],
+                   children: Dict[str, List[str]], full: bool) -> int:
+        changed = 0
+        stack = [(root, None)]
+        while stack and not self._stop_event.is_set():
+            directory, parent = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                self._forget_dir(connection, directory)
+                continue
+            if not full and known.get(directory) == mtime:
+                stack.extend((child, directory) for child in children.get(directory, ()))
+                continue
+            sub_dirs = self._read_dir(connection, directory)
+            for old in set(children.get(directory, ())) - set(sub_dirs):
+                self._forget_dir(connection, old)
+            connection.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (directory, parent, mtime))
+            stack.extend((child, directory) for child in sub_dirs)
+            changed += 1
+            if changed % BATCH_DIRS == 0:
+                connection.commit()
+        return changed
+
+    def _read_dir(self, connection: sqlite3.Connection, directory: str) -> List[str]:
+        """Sync the files of one folder with the index and return its sub folders."""
+        files: Dict[str, Tuple[int, float]] = {}
+        sub_dirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith(".") and entry.name not in EXCLUDED_DIRS:
+                                sub_dirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and not entry.name.startswith("."):
+                            stat = entry.stat(follow_symlinks=False)
+                            files[entry.name] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        indexed = {name: (file_id, size, mtime) for file_id, name, size, mtime in connection.execute(
+            "SELECT id, name, size, mtime FROM files WHERE dir = ?", (directory,))}
+        for name, (file_id, size, mtime) in indexed.items():
+            if files.get(name) != (size, mtime):
+                connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        connection.executemany(
+            "INSERT INTO files(dir, name, ext, size, mtime) VALUES (?, ?, ?, ?, ?)",
+            [(directory, name, os.path.splitext(name)[1][1:].lower(), size, mtime)
+             for name, (size, mtime) in files.items() if indexed.get(name, (None,))[1:] != (size, mtime)])
+        return sub_dirs
+
+    def _forget_dir(self, connection: sqlite3.Connection, directory: str) -> None:
+        """Remove a folder that no longer exists, with everything below it."""
+        # A prefix match, LIKE would treat "_" and "%" in folder names as wildcards
+        below = directory.rstrip("/\\") + os.sep
+        connection.execute("DELETE FROM files WHERE dir = ? OR substr(dir, 1, ?) = ?",
+                           (directory, len(below), below))
+        connection.execute("DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?",
+                           (directory, len(below), below))
+
+    def search(self, query: str = "", extension: str = "", modified_after: Optional[float] = None,
+               modified_before: Optional[float] = None, limit: int = 10) -> List[dict]:
+        """Find files by parts of their name or folder.
+
+        Args:
+            query (str): Words that must all appear in the file name or its folder path.
+            extension (str): File extension without the dot, e.g. "pdf".
+            modified_after (Optional[float]): Earliest modification time as a timestamp.
+            modified_before (Optional[float]): Latest modification time as a timestamp.
+            limit (int): Maximum number of files.
+
+        Returns:
+            List[dict]: Matching files, best name matches and then the newest first.
+        """
+        conditions, parameters = [], []
+        match = []
+        for word in words(query):
+            if self.trigram and len(word) < 3:
+                conditions.append("(f.name LIKE ? OR f.dir LIKE ?)")
+                parameters += [f"%{word}%"] * 2
+            else:
+                match.append(f'"{word}"' if self.trigram else f'"{word}"*')
+        if extension:
+            conditions.append("f.ext = ?")
+            parameters.append(extension.lower().lstrip("."))
+        if modified_after is not None:
+            conditions.append("f.mtime >= ?")
+            parameters.append(modified_after)
+        if modified_before is not None:
+            conditions.append("f.mtime < ?")
+            parameters.append(modified_before)
+        if match:
+            sql = ("SELECT f.dir, f.name, f.size, f.mtime FROM files_fts JOIN files f ON f.id = files_fts.rowid "
+                   "WHERE files_fts MATCH ?" + "".join(f" AND {c}" for c in conditions) +
+                   " ORDER BY bm25(files_fts, 10.0, 1.0), f.mtime DESC LIMIT ?")
+            parameters = [" AND ".join(match)] + parameters
+        else:
+            sql = ("SELECT f.dir, f.name, f.size, f.mtime FROM files f" +
+                   (" WHERE " + " AND ".join(conditions) if conditions else "") +
+                   " ORDER BY f.mtime DESC LIMIT ?")
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql, parameters + [limit]).fetchall()
+        finally:
+            connection.close()
+        return [{
+            "path": os.path.join(directory, name),
+            "size_mb": round(size / 1024 ** 2, 2),
+            "modified": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M"),
+        } for directory, name, size, mtime in rows]
+
+    def count(self) -> int:
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT count(*) FROM files").fetchone()[0]
+        finally:
+            connection.close()
+
+
+_file_index: Optional[FileIndex] = None
+_file_index_lock = threading.Lock()
+
+
+def get_file_index() -> Optional[FileIndex]:
+    """Return the process-wide file index, starting the background indexing on first use.
+
+    Returns:
+        Optional[FileIndex]: The index, None if file search is turned off in the settings.
+    """
+    global _file_index
+    with _file_index_lock:
+        if _file_index is None:
+            from src.schemas.schemas import Settings
+            settings = Settings.from_json_file('src/app/settings.json')
+            file_search = settings.user_settings.file_search_settings
+            if not file_search.enabled:
+                return None
+            roots = [Path(root).expanduser() for root in file_search.roots] or [Path.home()]
+            _file_index = FileIndex(Path(file_search.index_path), roots, file_search.rescan_interval)
+            _file_index.start()
+        return _file_index
+
+
+@tool
+def search_files_tool(query: str = "", extension: str = "", modified_after: str = "",
+                      modified_before: str = "", limit: int = 10) -> dict:
+    """Tool to find files on the computer by name, for requests like "find my tax PDF from last year".
+
+    Args:
+        query (str, optional): Words from the file name or its folder, e.g. "tax". Empty to match any name.
+        extension (str, optional): File type without the dot, e.g. "pdf", "docx", "jpg".
+        modified_after (str, optional): Only files changed at or after this time: a year "2024",
+            a month "2024-03", a date "2024-03-15" or relative like "-7d", "yesterday".
+        modified_before (str, optional): Only files changed before this time, in the same forms.
+            A year or month includes all of it.
+        limit (int, optional): Maximum number of files. Defaults to 10.
+    Returns:
+        dict: The matching files with path, size in MB and modification time
+    """
+    try:
+        after = date_range(modified_after)
+        before = date_range(modified_before, end=True)
+    except ValueError as e:
+        return {"error": f"Could not read the date: {e}"}
+    index = get_file_index()
+    if index is None:
+        return {"error": "File search is turned off in the settings."}
+    files = index.search(query, extension, after, before, limit)
+    result = {"files": files}
+    if not index.ready.is_set():
+        result["note"] = "The file index is still being built, some files may be missing."
+    elif not files:
+        result["note"] = "No indexed file matches. Only the folders in file_search_settings.roots are indexed."
+    return result
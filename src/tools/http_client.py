@@ -0,0 +1,67 @@
+# python
+import threading
+from typing import Optional, Tuple
+# 3rd party
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds used when a call does not pass one
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 20.0)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PooledSession(requests.Session):
+    """
+    HTTP session shared by the network tools.
+
+    Connections are kept alive in a per-host pool, so repeated calls to the
+    same API skip DNS lookup, TCP and TLS setup. Every request gets a default
+    timeout, failed connections and retryable statuses are retried with
+    exponential backoff. Reads and status errors are only retried for
+    idempotent methods, a POST is retried only if it never reached the server.
+
+    Attributes:
+        timeout: default (connect, read) timeout
+    """
+
+    def __init__(self, timeout: Tuple[float, float] = DEFAULT_TIMEOUT, retries: int = 3,
+                 backoff_factor: float = 0.5, pool_size: int = 10):
+        """
+        Initializes the PooledSession class.
+
+        Args:
+            timeout: default (connect, read) timeout in seconds
+            retries: maximum number of retries of one request
+            backoff_factor: base of the exponential delay between retries
+            pool_size: kept-alive connections per host
+        """
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> PooledSession:
+    """Return the process-wide HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
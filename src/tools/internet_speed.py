@@ -1,25 +1,221 @@
+# python
+import json
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
 # 3rd party
 import speedtest
 from langchain.tools import tool
+# project
+from src.tools.jobs import Job, job_manager
 
+# latency: ping only, download: ping and download, quick: capped download and
+# upload, full: the complete speedtest.net test
+MODES = ("latency", "download", "quick", "full")
+# Modes whose results also answer a request for another mode
+SATISFIES = {
+    "latency": {"latency"},
+    "download": {"latency", "download"},
+    "quick": {"latency", "download", "quick"},
+    "full": set(MODES),
+}
+CACHE_PATH = Path("data/speedtest.json")
+SERVERS_TTL = 24 * 3600
+# speedtest.net counts failed pings as 3600 ms, a best server this slow is unreachable
+UNREACHABLE_LATENCY = 1800
 
-@tool
-def test_internet_speed():
-    """Test the internet speed using speedtest.net.
+
+class SpeedTestCache:
+    """
+    Closest speedtest.net servers and the last result of every mode, kept on disk between
+    runs so a test does not download the server list every time and a recent
+    result can be answered without testing again.
+
+    Attributes:
+        path: JSON file of the cache
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        try:
+            self._data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._data), encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: could not save the speed test cache: {e}")
+
+    def servers(self) -> List[dict]:
+        """Return the cached closest servers, or [] if they are too old."""
+        if time.time() - self._data.get("servers_time", 0) > SERVERS_TTL:
+            return []
+        return self._data.get("servers", [])
+
+    def save_servers(self, servers: List[dict]) -> None:
+        with self._lock:
+            self._data["servers"] = servers
+            self._data["servers_time"] = time.time()
+            self._save()
+
+    def result_for(self, mode: str, max_age: float) -> Optional[dict]:
+        """Return the newest result that answers `mode` and is at most `max_age` seconds old."""
+        results = [result for result in self._data.get("results", {}).values()
+                   if mode in SATISFIES.get(result["mode"], ())]
+        if not results:
+            return None
+        result = max(results, key=lambda r: r["timestamp"])
+        age = time.time() - result["timestamp"]
+        if age > max_age:
+            return None
+        return {
+            **result,
+            "measured_at": time.strftime("%Y-%m-%d %H:%M", time.localtime(result["timestamp"])),
+            "age_minutes": round(age / 60, 1),
+            "cached": True,
+        }
+
+    def save_result(self, result: dict) -> None:
+        """Keep a result as the last one of its mode."""
+        with self._lock:
+            self._data.setdefault("results", {})[result["mode"]] = result
+            self._save()
+
+
+speed_test_cache = SpeedTestCache()
+
+
+def connect(shutdown_event: Optional[threading.Event] = None) -> speedtest.Speedtest:
+    """Create a Speedtest client connected to the lowest latency server.
+
+    The cached closest servers are pinged first, the full server list is only
+    downloaded when the cache is empty, old or unreachable.
+    """
+    st = speedtest.Speedtest(shutdown_event=shutdown_event)
+    servers = speed_test_cache.servers()
+    if servers:
+        try:
+            if st.get_best_server(servers)["latency"] < UNREACHABLE_LATENCY:
+                return st
+        except speedtest.SpeedtestException:
+            pass
+    st.get_closest_servers()
+    speed_test_cache.save_servers(st.closest)
+    st.get_best_server()
+    return st
+
+
+def make_quick(st: speedtest.Speedtest) -> None:
+    """Cap a Speedtest client to a few megabytes and seconds per direction."""
+    config = st.config
+    config["sizes"]["download"] = config["sizes"]["download"][:4]
+    config["counts"]["download"] = 1
+    config["sizes"]["upload"] = config["sizes"]["upload"][:2]
+    config["counts"]["upload"] = 2
+    config["upload_max"] = 4
+    config["length"]["download"] = min(config["length"]["download"], 5)
+    config["length"]["upload"] = min(config["length"]["upload"], 5)
+
+
+def measure_latency() -> dict:
+    """Ping the best server, usually within a second or two."""
+    try:
+        st = connect()
+    except Exception as e:
+        raise ConnectionError(f"Failed to connect to speedtest.net: {e}, "
+                              f"please check your internet connection.") from e
+    result = {
+        "mode": "latency",
+        "timestamp": time.time(),
+        "ping (ms)": st.results.ping,
+        "server": st.results.server.get("sponsor"),
+    }
+    speed_test_cache.save_result(result)
+    return result
+
+
+def run_speed_test(job: Job, mode: str = "full", threads: Optional[int] = None) -> dict:
+    """Run a speed test, reporting progress to the job.
+
+    Args:
+        job (Job): The job running the test. Its cancel event stops the
+            download and upload threads of speedtest.
+        mode (str): "download", "quick" or "full".
+        threads (Optional[int]): Transfer threads, the speedtest.net default if None.
 
     Returns:
         dict: A dictionary containing download speed, upload speed, and ping.
     """
+    job.report(0.0, "Looking for the best server")
     try:
-        st = speedtest.Speedtest()
-        st.get_best_server()
+        st = connect(shutdown_event=job.cancel_event)
     except Exception as e:
-        return {"error": f"Failed to connect to speedtest.net: {e}, please check your internet connection."}
-    download_speed = st.download() / 1_000_000  # Convert to Mbps
-    upload_speed = st.upload() / 1_000_000      # Convert to Mbps
-    ping = st.results.ping
+        raise RuntimeError(f"Failed to connect to speedtest.net: {e}, please check your internet connection.")
+    job.check_cancelled()
+    if mode == "quick":
+        make_quick(st)
+    upload = mode != "download"
+    share = 0.45 if upload else 0.9
+
+    def progress(offset: float, message: str):
+        """Build a speedtest callback, it is called with end=True for every finished request."""
+        def callback(i, count, end=False, **kwargs):
+            if end:
+                job.report(offset + share * (i + 1) / count, message)
+        return callback
+
+    job.report(0.05, "Testing download speed")
+    result = {
+        "mode": mode,
+        "timestamp": time.time(),
+        "ping (ms)": st.results.ping,
+        "server": st.results.server.get("sponsor"),
+        "download_speed (Mbps)": st.download(
+            callback=progress(0.05, "Testing download speed"), threads=threads) / 1_000_000,  # Convert to Mbps
+    }
+    job.check_cancelled()
+    if upload:
+        job.report(0.5, "Testing upload speed")
+        result["upload_speed (Mbps)"] = st.upload(
+            callback=progress(0.5, "Testing upload speed"), threads=threads) / 1_000_000  # Convert to Mbps
+        job.check_cancelled()
+    speed_test_cache.save_result(result)
+    return result
+
+
+@tool
+def test_internet_speed(mode: str = "quick", threads: int = 0, max_age_minutes: int = 10):
+    """Test the internet speed using speedtest.net. Use "latency" to quickly check if the internet works or is slow.
+
+    Args:
+        mode (str, optional): "latency" (ping only, 1-2 seconds), "download" (ping and download),
+            "quick" (ping, download and upload with little data, about 10 seconds) or
+            "full" (complete test, about half a minute). Defaults to "quick".
+        threads (int, optional): Number of transfer threads, 0 for the speedtest.net default.
+        max_age_minutes (int, optional): A previous result at most this old is returned instead
+            of testing again, 0 to always test. Defaults to 10.
+    Returns:
+        dict: The ping and speeds, or for download, quick and full tests that are not cached
+            the id of a background job. Get its result with job_status_tool once it is done.
+    """
+    if mode not in MODES:
+        return {"error": f"Unknown mode '{mode}'. Choose from {list(MODES)}."}
+    cached = speed_test_cache.result_for(mode, max_age_minutes * 60)
+    if cached:
+        return cached
+    if mode == "latency":
+        return measure_latency()
+
+    job = job_manager.submit(f"Internet speed test ({mode})", run_speed_test,
+                             mode=mode, threads=threads or None)
     return {
-        "download_speed (Mbps)": download_speed,
-        "upload_speed (Mbps)": upload_speed,
-        "ping (ms)": ping
+        "job_id": job.id,
+        "status": job.status,
+        "message": "The speed test is running in the background. Check it with job_status_tool.",
     }
@@ -0,0 +1,208 @@
+# python
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+# 3rd party
+from langchain.tools import tool
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when the job was cancelled."""
+
+
+class Job:
+    """
+    Long-running tool call executed by the JobManager.
+
+    The job function receives the Job as its first argument and uses it to
+    report progress and to check for cancellation.
+
+    Attributes:
+        id: short job id given to the agent
+        name: human readable job name
+        status: "queued", "running", "done", "failed" or "cancelled"
+        progress: fraction of the work done, from 0 to 1
+        message: last progress message
+        result: return value of the job function once done
+        error: error message if the job failed
+        cancel_event: set when the job is cancelled
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report(self, progress: float, message: Optional[str] = None) -> None:
+        """Update the progress.
+
+        Args:
+            progress (float): Fraction of the work done, from 0 to 1.
+            message (Optional[str]): What the job is doing now.
+        """
+        self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if the job was cancelled."""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def to_dict(self) -> dict:
+        """Job state for the agent."""
+        now = self.finished or time.time()
+        state = {
+            "job_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress_percent": round(self.progress * 100),
+            "elapsed_seconds": round(now - (self.started or now), 1),
+        }
+        if self.message:
+            state["message"] = self.message
+        if self.status == "done":
+            state["result"] = self.result
+        if self.error:
+            state["error"] = self.error
+        return state
+
+
+class JobManager:
+    """
+    Runs long-running tool calls on a worker pool so tools can return a job
+    id immediately and the agent stays responsive.
+
+    Attributes:
+        jobs: known jobs by id, oldest first
+    """
+
+    def __init__(self, max_workers: int = 2, keep: int = 50):
+        """
+        Initializes the JobManager class.
+
+        Args:
+            max_workers: number of jobs that run at the same time
+            keep: number of finished jobs remembered for status queries
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.keep = keep
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, function: Callable[..., Any], *args, **kwargs) -> Job:
+        """Queue a job.
+
+        Args:
+            name (str): Human readable job name.
+            function (Callable[..., Any]): Called as function(job, *args, **kwargs).
+
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(name)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._forget_finished()
+        job.future = self.executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job: Job, function: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        if job.cancelled:
+            return
+        job.status = "running"
+        job.started = time.time()
+        try:
+            job.result = function(job, *args, **kwargs)
+            job.status = "cancelled" if job.cancelled else "done"
+            if job.status == "done":
+                job.progress = 1.0
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self.jobs) - self.keep)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def recent(self, count: int = 5) -> List[Job]:
+        """Return the most recent jobs, newest first."""
+        with self._lock:
+            return list(self.jobs.values())[::-1][:count]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        Running jobs stop at their next cancellation check or, if they watch
+        it, as soon as cancel_event is set.
+
+        Returns:
+            bool: False if the job does not exist or already finished.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # It never started
+            job.status = "cancelled"
+            job.finished = time.time()
+        return True
+
+
+job_manager = JobManager()
+
+
+@tool
+def job_status_tool(job_id: str = "") -> dict:
+    """Tool to check the status, progress and result of a background job, such as a running internet speed test.
+
+    Args:
+        job_id (str, optional): Id of the job. If empty, the most recent jobs are listed.
+    Returns:
+        dict: Status, progress in percent and, when done, the result of the job
+    """
+    if not job_id:
+        return {"jobs": [job.to_dict() for job in job_manager.recent()]}
+    job = job_manager.get(job_id.strip())
+    if job is None:
+        return {"error": f"There is no job with id '{job_id}'."}
+    return job.to_dict()
+
+
+@tool
+def cancel_job_tool(job_id: str) -> str:
+    """Tool to cancel a running background job.
+
+    Args:
+        job_id (str): Id of the job.
+    Returns:
+        str: Message indicating the status of the operation
+    """
+    if job_manager.cancel(job_id.strip()):
+        return f"Job {job_id} is being cancelled."
+    return f"Job {job_id} does not exist or has already finished."
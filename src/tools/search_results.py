@@ -0,0 +1,145 @@
+# python
+import math
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+# project
+from src.tools.token_utils import estimate_tokens, truncate_to_tokens, words
+
+# Tokens of search results given back to the agent per tool call
+SEARCH_TOKEN_BUDGET = 600
+# Word overlap above which two results count as the same page
+DUPLICATE_OVERLAP = 0.8
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where", "which",
+    "who", "why", "with",
+}
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+class SearchHit:
+    """One search result."""
+
+    def __init__(self, title: str, url: str, text: str):
+        self.title = title.strip()
+        self.url = url.strip()
+        self.text = " ".join(text.split())
+
+    def url_key(self) -> str:
+        """URL without scheme, www, query and trailing slash, to spot the same page twice."""
+        parts = urlsplit(self.url.lower())
+        host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+        return host + parts.path.rstrip("/")
+
+
+def terms(text: str) -> List[str]:
+    return [word for word in words(text) if word not in STOPWORDS]
+
+
+def deduplicate(hits: Iterable[SearchHit]) -> List[SearchHit]:
+    """Drop empty results, repeated URLs and results whose text mostly repeats an earlier one."""
+    kept: List[SearchHit] = []
+    seen_urls = set()
+    seen_words: List[set] = []
+    for hit in hits:
+        if not hit.text:
+            continue
+        key = hit.url_key()
+        hit_words = set(words(hit.text))
+        if key and key in seen_urls:
+            continue
+        if any(len(hit_words & other) / max(1, len(hit_words | other)) > DUPLICATE_OVERLAP
+               for other in seen_words):
+            continue
+        if key:
+            seen_urls.add(key)
+        seen_words.append(hit_words)
+        kept.append(hit)
+    return kept
+
+
+def bm25_scores(query: str, documents: List[List[str]]) -> List[float]:
+    """Score tokenized documents against a query with Okapi BM25."""
+    query_terms = set(terms(query))
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+    average_length = sum(len(document) for document in documents) / len(documents) or 1.0
+    document_frequency = Counter(term for document in documents for term in set(document) & query_terms)
+    scores = []
+    for document in documents:
+        counts = Counter(document)
+        score = 0.0
+        for term in query_terms:
+            frequency = counts.get(term)
+            if not frequency:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            score += idf * frequency * (K1 + 1) / (
+                frequency + K1 * (1 - B + B * len(document) / average_length))
+        scores.append(score)
+    return scores
+
+
+def compact_results(query: str, hits: Iterable[SearchHit], budget: int = SEARCH_TOKEN_BUDGET,
+                    answer: Optional[str] = None) -> str:
+    """Turn raw search results into a short text for the agent.
+
+    The results are deduplicated and split into sentences. The sentences are
+    ranked with BM25 against the query and the best ones are kept, in their
+    original order, until the token budget is used. The tokens saved against
+    the raw results are reported on the last line.
+
+    Args:
+        query (str): The search query.
+        hits (Iterable[SearchHit]): Results in the order of the search engine.
+        budget (int): Maximum tokens of the returned text.
+        answer (Optional[str]): Direct answer of the search engine, kept first.
+
+    Returns:
+        str: The compacted results.
+    """
+    hits = list(hits)
+    found = len(hits)
+    raw_tokens = estimate_tokens(" ".join(f"{hit.title} {hit.url} {hit.text}" for hit in hits) + (answer or ""))
+    hits = deduplicate(hits)
+
+    sentences = [(index, position, sentence)
+                 for index, hit in enumerate(hits)
+                 for position, sentence in enumerate(SENTENCE_END.split(hit.text))]
+    scores = bm25_scores(query, [terms(sentence) for _, _, sentence in sentences])
+    # Best sentences first, ties in search engine order. Sentences without a
+    # query term are only used when no sentence has one.
+    ranked = sorted(range(len(sentences)), key=lambda i: (-scores[i], sentences[i][0], sentences[i][1]))
+    if any(scores):
+        ranked = [i for i in ranked if scores[i] > 0]
+
+    header = f"Answer: {truncate_to_tokens(answer, budget // 3)}\n" if answer else ""
+    used = estimate_tokens(header)
+    chosen = {}
+    for i in ranked:
+        index, position, sentence = sentences[i]
+        cost = estimate_tokens(sentence) + 1
+        if index not in chosen:
+            cost += estimate_tokens(f"{hits[index].title} ({hits[index].url})") + 2
+        if used + cost > budget:
+            continue
+        used += cost
+        chosen.setdefault(index, []).append((position, sentence))
+
+    blocks = []
+    for index in sorted(chosen):
+        hit = hits[index]
+        text = " ".join(sentence for _, sentence in sorted(chosen[index]))
+        blocks.append(f"- {hit.title} ({hit.url})\n  {text}")
+    if not blocks and not header:
+        return f"No results found for '{query}'."
+    result = header + "\n".join(blocks)
+    tokens = estimate_tokens(result)
+    return f"{result}\n[{len(chosen)} of {found} results kept, about {tokens} tokens, " \
+           f"{max(0, raw_tokens - tokens)} tokens saved]"
@@ -0,0 +1,36 @@
+# python
+import math
+import re
+from typing import List
+
+# Average characters per token of the Llama style tokenizers used through Ollama
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens of a text without loading a tokenizer.
+
+    Args:
+        text (str): Any text.
+
+    Returns:
+        int: Approximate token count, about one token per four characters.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, budget: int, marker: str = " ...") -> str:
+    """Cut a text to about `budget` tokens, at a word boundary when possible."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:max(0, limit - len(marker))]
+    space = cut.rfind(" ")
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + marker
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words of a text, used for lexical matching."""
+    return re.findall(r"[^\W_]+", text.lower())
@@ -0,0 +1,204 @@
+# python
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, Dict, List, Optional
+# 3rd party
+from langchain_core.tools import BaseTool
+
+# Seconds a tool call may take when the tool has no own timeout
+DEFAULT_TIMEOUT = 20.0
+# Tools that need more or less time than the default
+TOOL_TIMEOUTS = {
+    "test_internet_speed": 15.0,
+    "tavily_web_search_tool": 30.0,
+    "get_weather_tool": 15.0,
+    "open_app_tool": 10.0,
+    "close_app_tool": 10.0,
+    "get_drives_info": 5.0,
+    "job_status_tool": 2.0,
+    "cancel_job_tool": 2.0,
+}
+# Failures in a row that open the circuit of a tool
+FAILURE_THRESHOLD = 3
+# Seconds an open circuit waits before letting one trial call through
+RESET_TIMEOUT = 60.0
+
+
+class CircuitBreaker:
+    """
+    Health of one tool.
+
+    The circuit is "closed" while the tool works. After FAILURE_THRESHOLD
+    failures in a row it is "open" and calls are refused without running the
+    tool. After RESET_TIMEOUT seconds it is "half_open": one trial call runs
+    and closes the circuit again if it succeeds or opens it if it fails.
+
+    Attributes:
+        name: tool name
+        state: "closed", "open" or "half_open"
+        failures: failures in a row
+        last_error: message of the last failure, cleared by a success
+        calls: number of finished calls
+        total_time: seconds spent in finished calls
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.opened_at = 0.0
+        self.calls = 0
+        self.total_time = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may run now."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_running:
+                    return False
+                self._trial_running = True
+            return self.state != "open"
+
+    def record(self, elapsed: float, error: Optional[str] = None) -> None:
+        """Record a finished call, `error` is None if it succeeded."""
+        with self._lock:
+            self._trial_running = False
+            self.calls += 1
+            self.total_time += elapsed
+            if error is None:
+                self.failures = 0
+                self.last_error = None
+                self.state = "closed"
+            else:
+                self.failures += 1
+                self.last_error = error
+                if self.state == "half_open" or self.failures >= self.failure_threshold:
+                    self.state = "open"
+                    self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def to_dict(self) -> dict:
+        state = {
+            "tool": self.name,
+            "state": self.state,
+            "failures_in_a_row": self.failures,
+            "calls": self.calls,
+            "average_seconds": round(self.total_time / self.calls, 2) if self.calls else None,
+        }
+        if self.last_error:
+            state["last_error"] = self.last_error
+        return state
+
+
+class ToolGuard:
+    """
+    Runs tool calls on worker threads with a timeout and a circuit breaker per tool.
+
+    A call that does not finish in time is reported to the agent as failed
+    while its thread finishes in the background, so a hung tool never blocks
+    the agent for longer than its timeout.
+
+    Only exceptions and timeouts count as failures. Tools raise when the
+    service or device they use fails, while errors about their arguments
+    (an unknown metric, an application that is not installed) are returned
+    as results, so the corrected call that usually follows is not refused.
+
+    Attributes:
+        breakers: circuit breakers by tool name
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self.breakers:
+                self.breakers[name] = CircuitBreaker(name)
+            return self.breakers[name]
+
+    def call(self, name: str, function: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run a tool call.
+
+        Args:
+            name (str): Tool name.
+            function (Callable[[], Any]): Runs the tool and returns its output.
+            timeout (Optional[float]): Seconds to wait, the tool's entry of TOOL_TIMEOUTS if None.
+
+        Returns:
+            Any: The tool output, or an error message if the tool failed, timed out or its circuit is open.
+        """
+        breaker = self.breaker(name)
+        if not breaker.allow():
+            return (f"Error: the tool {name} is unavailable after {breaker.failures} failures in a row "
+                    f"(last error: {breaker.last_error}). It will be tried again in {breaker.retry_in():.0f} "
+                    f"seconds, tell the user instead of calling it again now.")
+        timeout = timeout if timeout is not None else TOOL_TIMEOUTS.get(name, DEFAULT_TIMEOUT)
+        start = time.monotonic()
+        future = self.executor.submit(function)
+        error = None
+        try:
+            output = future.result(timeout=timeout)
+        except TimeoutError:
+            # Dropped if it is still queued behind hung calls
+            future.cancel()
+            output = error = f"Error: the tool {name} did not answer within {timeout:g} seconds."
+        except Exception as e:
+            output = error = f"Error running {name}: {e}"
+        breaker.record(time.monotonic() - start, error)
+        return output
+
+    def health(self) -> List[dict]:
+        """Health of every tool called so far, broken tools first."""
+        order = {"open": 0, "half_open": 1, "closed": 2}
+        return [breaker.to_dict() for breaker in sorted(self.breakers.values(), key=lambda b: order[b.state])]
+
+
+tool_guard = ToolGuard()
+
+
+class GuardedTool(BaseTool):
+    """
+    Tool wrapper that runs another tool through the ToolGuard.
+
+    Attributes:
+        tool: wrapped tool
+        timeout: seconds a call may take, the tool's entry of TOOL_TIMEOUTS if None
+    """
+
+    tool: BaseTool
+    timeout: Optional[float] = None
+
+    def _run(self, *args, run_manager=None, **kwargs) -> Any:
+        tool_input = kwargs if kwargs else (args[0] if args else {})
+        callbacks = run_manager.get_child() if run_manager else None
+        return tool_guard.call(self.name, lambda: self.tool.invoke(tool_input, config={"callbacks": callbacks}),
+                               self.timeout)
+
+
+def guard_tools(tools: List[BaseTool]) -> List[BaseTool]:
+    """Wrap tools so they run with a timeout and a circuit breaker.
+
+    Args:
+        tools (List[BaseTool]): Tools given to the agent.
+
+    Returns:
+        List[BaseTool]: The wrapped tools.
+    """
+    return [
+        GuardedTool(name=tool.name, description=tool.description, args_schema=tool.args_schema,
+                    return_direct=tool.return_direct, tool=tool)
+        for tool in tools
+    ]
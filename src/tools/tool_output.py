@@ -0,0 +1,169 @@
+# python
+import json
+from typing import Any, Dict, List, Optional
+# 3rd party
+from langchain_core.tools import BaseTool
+# project
+from src.tools.token_utils import estimate_tokens, truncate_to_tokens
+
+# Tokens a tool output may use in the agent scratchpad
+TOOL_OUTPUT_BUDGET = 800
+# Significant digits kept of floats
+FLOAT_DIGITS = 4
+
+
+def clean(value: Any) -> Any:
+    """Drop None and empty values and round floats, recursively."""
+    if isinstance(value, dict):
+        cleaned = {str(key): clean(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple, set)):
+        return [item for item in (clean(item) for item in value) if item not in (None, "", [], {})]
+    if isinstance(value, float):
+        rounded = float(f"{value:.{FLOAT_DIGITS}g}")
+        return int(rounded) if rounded.is_integer() else rounded
+    return value
+
+
+def table_rows(value: Any) -> Optional[List[dict]]:
+    """Return the rows if a value is a list of flat dicts, or a dict of them keyed by name."""
+    if isinstance(value, dict) and len(value) > 1 and all(isinstance(item, dict) for item in value.values()):
+        rows = [{"name": key, **item} for key, item in value.items()]
+    elif isinstance(value, list) and len(value) > 1 and all(isinstance(item, dict) for item in value):
+        rows = value
+    else:
+        return None
+    if any(isinstance(cell, (dict, list)) for row in rows for cell in row.values()):
+        return None
+    return rows
+
+
+def tabulate(rows: List[dict]) -> str:
+    """Render rows as a pipe separated table with one header line."""
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    lines = [" | ".join(columns)]
+    lines += [" | ".join(str(row.get(column, "")) for column in columns) for row in rows]
+    return "\n".join(lines)
+
+
+def render(value: Any) -> str:
+    """Render a cleaned value as compact text, tables for lists of records."""
+    rows = table_rows(value)
+    if rows is not None:
+        return tabulate(rows)
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            text = render(item)
+            if "\n" in text:
+                lines.append(f"{key}:\n  " + text.replace("\n", "\n  "))
+            else:
+                lines.append(f"{key}: {text}")
+        return "\n".join(lines)
+    if isinstance(value, list):
+        if all(not isinstance(item, (dict, list)) for item in value):
+            return ", ".join(str(item) for item in value)
+        return "\n".join("- " + render(item).replace("\n", "\n  ") for item in value)
+    return str(value)
+
+
+def truncate_middle(text: str, budget: int) -> str:
+    """Keep the start and the end of a text within `budget` tokens, whole lines where possible."""
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = text.split("\n")
+    if len(lines) < 3:
+        return truncate_to_tokens(text, budget, marker=" [... output truncated]")
+    head, tail = [], []
+    head_budget, tail_budget = budget * 2 // 3, budget // 3 - 10
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > head_budget:
+            break
+        head.append(line)
+        used += cost
+    used = 0
+    for line in reversed(lines[len(head):]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > tail_budget:
+            break
+        tail.insert(0, line)
+        used += cost
+    if not head:
+        head = [truncate_to_tokens(lines[0], head_budget)]
+    cut = len(lines) - len(head) - len(tail)
+    return "\n".join(head + [f"[... {cut} lines cut ...]"] + tail)
+
+
+def compact_output(output: Any, budget: int = TOOL_OUTPUT_BUDGET) -> str:
+    """Turn a tool output into text of at most about `budget` tokens.
+
+    Structured outputs are cleaned of empty values, their floats rounded and
+    lists of records rendered as tables. Text that is still over the budget
+    keeps its start and end.
+
+    Args:
+        output (Any): The value returned by a tool.
+        budget (int): Maximum tokens of the returned text.
+
+    Returns:
+        str: The compacted output.
+    """
+    if isinstance(output, str):
+        try:
+            # Some tools return JSON text
+            parsed = json.loads(output)
+            text = render(clean(parsed)) if isinstance(parsed, (dict, list)) else output
+        except ValueError:
+            text = output
+    else:
+        text = render(clean(output))
+    return truncate_middle(text, budget)
+
+
+class BudgetedTool(BaseTool):
+    """
+    Tool wrapper that compacts the output of another tool.
+
+    It sits between the AgentExecutor and the wrapped tool and exposes the
+    same name, description and arguments, so the model sees no difference
+    except that outputs never exceed the token budget.
+
+    Attributes:
+        tool: wrapped tool
+        budget: maximum tokens of one output
+    """
+
+    tool: BaseTool
+    budget: int = TOOL_OUTPUT_BUDGET
+
+    def _run(self, *args, run_manager=None, **kwargs) -> str:
+        tool_input = kwargs if kwargs else (args[0] if args else {})
+        output = self.tool.invoke(tool_input, config={"callbacks": run_manager.get_child() if run_manager else None})
+        return compact_output(output, self.budget)
+
+    async def _arun(self, *args, run_manager=None, **kwargs) -> str:
+        tool_input = kwargs if kwargs else (args[0] if args else {})
+        output = await self.tool.ainvoke(tool_input, config={"callbacks": run_manager.get_child() if run_manager else None})
+        return compact_output(output, self.budget)
+
+
+def budget_tools(tools: List[BaseTool], budget: int = TOOL_OUTPUT_BUDGET,
+                 budgets: Optional[Dict[str, int]] = None) -> List[BaseTool]:
+    """Wrap tools so their outputs are compacted to a token budget.
+
+    Args:
+        tools (List[BaseTool]): Tools given to the agent.
+        budget (int): Default budget of an output in tokens.
+        budgets (Optional[Dict[str, int]]): Budgets of single tools by tool name.
+
+    Returns:
+        List[BaseTool]: The wrapped tools.
+    """
+    budgets = budgets or {}
+    return [
+        BudgetedTool(name=tool.name, description=tool.description, args_schema=tool.args_schema,
+                     return_direct=tool.return_direct, tool=tool, budget=budgets.get(tool.name, budget))
+        for tool in tools
+    ]
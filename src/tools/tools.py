@@ -1,13 +1,20 @@
 # python
 import os
-import requests
 # 3rd party
-from AppOpener import open as open_app, close as close_app
 from langchain.tools import tool
 from dotenv import load_dotenv
+# project
+from src.tools.app_index import app_index
+from src.tools.http_client import get_session
+try:
+    # Windows only, used for apps that are not in the application index
+    from AppOpener import open as open_app, close as close_app
+except ImportError:
+    open_app = close_app = None
 load_dotenv()
 
 TOMORROW_API_KEY = os.getenv("TOMORROW_API_KEY")
+TOMORROW_API_URL = os.getenv("TOMORROW_API_URL", "https://api.tomorrow.io/v4")
 
 
 @tool
@@ -53,6 +60,12 @@ def open_app_tool(app: str) -> str:
     """
 
     try:
+        entry = app_index.resolve(app)
+        if entry is not None:
+            app_index.launch(entry)
+            return f'{entry.name} opened successfully.'
+        if open_app is None:
+            return f"Error opening {app}: no installed application matches this name."
         open_app(app.lower(), match_closest=True, throw_error=True)
         return f'{app} opened successfully.'
     except Exception as e:
@@ -69,7 +82,18 @@ def close_app_tool(app: str) -> str:
         str: A message about the closing app.
     """
     try:
-        close_app(app.lower(), match_closest=True, throw_error=True)
+        # Only an exact match is closed, a similar name could stop another application
+        entry = app_index.resolve(app, exact=True)
+        if entry is not None and not entry.executables:
+            return (f"Error closing {app}: it is started through a launcher, "
+                    f"so its processes cannot be told apart from other programs.")
+        processes = app_index.processes(entry, app)
+        if processes:
+            app_index.close(processes)
+            return f'{entry.name if entry else app} closed successfully.'
+        if close_app is None:
+            return f"Error closing {app}: the application is not running."
+        close_app(app.lower(), match_closest=False, throw_error=True)
         return f'{app} closed successfully.'
     except Exception as e:
         return f"Error closing {app}: {e}"
@@ -84,18 +108,23 @@ def get_weather_tool(location: str) -> str:
     Returns:
         str: A message about the current weather in the specified location.
     """
-    try:
-        headers = {
-            "accept": "application/json"
-        }
-        response = requests.get(
-            f"https://api.tomorrow.io/v4/weather/realtime?location={location.lower()}&apikey={TOMORROW_API_KEY}",
-            headers=headers
-        )
-        data = response.json()
-        return f"Current weather in {location}:\n" \
-            f"Temperature: {data['data']['values']['temperature']}°C,\n" \
-            f"Temperature Apparent: {data['data']['values']['temperatureApparent']}°C,\n" \
-            f"Humidity: {data['data']['values']['humidity']}%,"
-    except Exception as e:
-        return f"Error getting weather for {location}: {e}"
+    # The key goes in a header, an error message with the URL must not reveal it
+    headers = {
+        "accept": "application/json",
+        "apikey": TOMORROW_API_KEY or "",
+    }
+    response = get_session().get(
+        f"{TOMORROW_API_URL}/weather/realtime",
+        params={"location": location.lower()},
+        headers=headers
+    )
+    if 400 <= response.status_code < 500:
+        # E.g. an unknown location, the model can correct it in the next call
+        return f"Error getting weather for {location}: {response.status_code} {response.text[:200]}"
+    # Failures of the weather service raise, so the tool guard counts them
+    response.raise_for_status()
+    data = response.json()
+    return f"Current weather in {location}:\n" \
+        f"Temperature: {data['data']['values']['temperature']}°C,\n" \
+        f"Temperature Apparent: {data['data']['values']['temperatureApparent']}°C,\n" \
+        f"Humidity: {data['data']['values']['humidity']}%,"
@@ -0,0 +1,187 @@
+"""Registry of the agent tools.
+
+The tools are described to the agent from metadata read out of the tool
+modules' source with `ast`: name, docstring and argument types of every
+`@tool` function. A module is only imported when one of its tools is first
+called, so speedtest, AppOpener, the search clients and the GPU libraries
+are not loaded at startup unless they are used.
+
+Usage:
+    python -m src.tools.tools_list
+prints the import time and memory of the tools loaded eagerly and lazily.
+"""
+# python
+import argparse
+import ast
+import importlib
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+# 3rd party
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, create_model
+
+ROOT = Path(__file__).resolve().parents[2]
+# Tools of the agent in the order they are offered to the model, as (module, function)
+AGENT_TOOLS: List[Tuple[str, str]] = [
+    ("src.tools.internet_speed", "test_internet_speed"),
+    ("src.tools.jobs", "job_status_tool"),
+    ("src.tools.jobs", "cancel_job_tool"),
+    ("src.tools.tools", "open_app_tool"),
+    ("src.tools.tools", "close_app_tool"),
+    ("src.tools.tools", "turn_off_pc_tool"),
+    ("src.tools.tools", "restart_pc_tool"),
+    ("src.tools.web_work_tools", "tavily_web_search_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "start_monitoring_cpu_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "stop_monitoring_cpu_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "start_monitoring_gpu_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "stop_monitoring_gpu_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "start_monitoring_system_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "stop_monitoring_system_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "get_system_metrics_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "get_metric_history_tool"),
+    ("src.tools.computer_state_tools.monitoring_tools.monitoring_tool", "query_metrics_store_tool"),
+    ("src.tools.tools", "get_weather_tool"),
+    ("src.tools.computer_state_tools.drives_info", "get_drives_info"),
+    ("src.tools.computer_state_tools.processes_info", "get_top_processes_tool"),
+    ("src.tools.file_search", "search_files_tool"),
+]
+# Names usable in the argument annotations of tool functions
+ANNOTATION_NAMES = {
+    "str": str, "int": int, "float": float, "bool": bool, "dict": dict, "list": list,
+    "Optional": Optional, "List": List, "Dict": Dict, "Any": Any,
+}
+
+
+class ToolSpec:
+    """Name, description and arguments of a tool function, read without importing it."""
+
+    def __init__(self, module: str, name: str, description: str, args_schema: Type[BaseModel]):
+        self.module = module
+        self.name = name
+        self.description = description
+        self.args_schema = args_schema
+
+
+def module_path(module: str) -> Path:
+    return ROOT.joinpath(*module.split(".")).with_suffix(".py")
+
+
+def read_specs(module: str) -> Dict[str, ToolSpec]:
+    """Read the `@tool` functions of a module from its source.
+
+    Raises:
+        ValueError: If an argument has an annotation or default that is not a plain literal.
+    """
+    tree = ast.parse(module_path(module).read_text(encoding="utf-8"))
+    specs = {}
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        if not any(isinstance(decorator, ast.Name) and decorator.id == "tool" for decorator in node.decorator_list):
+            continue
+        arguments = node.args.args
+        defaults = [None] * (len(arguments) - len(node.args.defaults)) + node.args.defaults
+        fields = {}
+        for argument, default in zip(arguments, defaults):
+            annotation = eval(ast.unparse(argument.annotation), {"__builtins__": {}}, ANNOTATION_NAMES) \
+                if argument.annotation is not None else Any
+            fields[argument.arg] = (annotation, ast.literal_eval(default) if default is not None else ...)
+        specs[node.name] = ToolSpec(module, node.name, ast.get_docstring(node) or "",
+                                    create_model(node.name, **fields))
+    return specs
+
+
+_loaded: Dict[Tuple[str, str], BaseTool] = {}
+_load_lock = threading.Lock()
+
+
+class LazyTool(BaseTool):
+    """
+    Tool that imports its implementing module on the first call.
+
+    Attributes:
+        module: module with the tool
+        attribute: name of the tool in the module
+    """
+
+    module: str
+    attribute: str
+
+    def load(self) -> BaseTool:
+        """Import the implementing tool, once."""
+        key = (self.module, self.attribute)
+        with _load_lock:
+            if key not in _loaded:
+                _loaded[key] = getattr(importlib.import_module(self.module), self.attribute)
+            return _loaded[key]
+
+    def _run(self, *args, run_manager=None, **kwargs) -> Any:
+        tool_input = kwargs if kwargs else (args[0] if args else {})
+        return self.load().invoke(tool_input, config={"callbacks": run_manager.get_child() if run_manager else None})
+
+    async def _arun(self, *args, run_manager=None, **kwargs) -> Any:
+        tool_input = kwargs if kwargs else (args[0] if args else {})
+        return await self.load().ainvoke(tool_input, config={"callbacks": run_manager.get_child() if run_manager else None})
+
+
+def lazy_tools(tools: List[Tuple[str, str]] = AGENT_TOOLS) -> List[BaseTool]:
+    """Create the agent tools without importing their modules.
+
+    Args:
+        tools (List[Tuple[str, str]]): (module, function) of every tool.
+
+    Returns:
+        List[BaseTool]: Tools with the names, descriptions and argument schemas of the real ones.
+    """
+    specs: Dict[str, Dict[str, ToolSpec]] = {}
+    result = []
+    for module, attribute in tools:
+        if module not in specs:
+            specs[module] = read_specs(module)
+        spec = specs[module][attribute]
+        result.append(LazyTool(name=spec.name, description=spec.description, args_schema=spec.args_schema,
+                               module=module, attribute=attribute))
+    return result
+
+
+def eager_tools(tools: List[Tuple[str, str]] = AGENT_TOOLS) -> List[BaseTool]:
+    """Import every tool module and return the real tools."""
+    return [getattr(importlib.import_module(module), attribute) for module, attribute in tools]
+
+
+MEASURE = """
+import time, psutil
+process = psutil.Process()
+rss = process.memory_info().rss
+start = time.perf_counter()
+from src.tools.tools_list import {function}
+tools = {function}()
+print(time.perf_counter() - start, process.memory_info().rss - rss, len(tools))
+"""
+
+
+def measure(function: str) -> Tuple[float, float]:
+    """Load the tools in a fresh interpreter, return the seconds and MB it took."""
+    output = subprocess.run([sys.executable, "-c", MEASURE.format(function=function)], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), int(output[1]) / 1024 ** 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare eager and lazy loading of the agent tools.")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per loading mode")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'seconds':>10}{'RSS MB':>10}")
+    for mode, function in (("eager", "eager_tools"), ("lazy", "lazy_tools")):
+        runs = [measure(function) for _ in range(args.runs)]
+        seconds = min(run[0] for run in runs)
+        memory = min(run[1] for run in runs)
+        print(f"{mode:<8}{seconds:>10.3f}{memory:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,25 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 # 3rd party
 from langchain.tools import tool
 from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_tavily import TavilySearch
 import webbrowser
+# project
+from src.tools.http_client import get_session
+from src.tools.search_results import SearchHit, compact_results
 
 load_dotenv()
 
 TAVILY_API_KEY = os.getenv('TAVILY_API_KEY')
+TAVILY_API_URL = os.getenv('TAVILY_API_URL', 'https://api.tavily.com')
+SEARCH_MAX_RESULTS = 8
+
+
+@lru_cache(maxsize=1)
+def get_duckduckgo_search() -> DuckDuckGoSearchRun:
+    """Return the shared DuckDuckGo search tool, created once."""
+    return DuckDuckGoSearchRun()
 
 
 @tool
@@ -19,11 +30,13 @@ def search_web_tool(query: str) -> str:
         query (str): The search query.
 
     Returns:
-        str: The search results.
+        str: The most relevant sentences of the search results.
     """
-    search = DuckDuckGoSearchRun()
-    result = search.run(query)
-    return result
+    results = get_duckduckgo_search().api_wrapper.results(query, max_results=SEARCH_MAX_RESULTS)
+    return compact_results(query, [
+        SearchHit(result.get("title", ""), result.get("link", ""), result.get("snippet", ""))
+        for result in results
+    ])
 
 
 @tool
@@ -49,13 +62,18 @@ def tavily_web_search_tool(query: str) -> str:
     Args:
         query (str): The search query.
     Returns:
-        str: A message indicating the result of the operation.
+        str: The most relevant sentences of the search results.
     """
-    try:
-        search = TavilySearch(
-
-        )
-        result = search.run(query)
-        return result
-    except Exception as e:
-        return f"Error performing deep web search: {e}"
+    # Called through the shared session, so repeated searches reuse the connection.
+    # Failures of the service raise, so the tool guard counts them
+    response = get_session().post(
+        f"{TAVILY_API_URL}/search",
+        json={"query": query, "max_results": SEARCH_MAX_RESULTS, "topic": "general"},
+        headers={"Authorization": f"Bearer {TAVILY_API_KEY}"},
+    )
+    response.raise_for_status()
+    data = response.json()
+    return compact_results(query, [
+        SearchHit(result.get("title", ""), result.get("url", ""), result.get("content", ""))
+        for result in data.get("results", [])
+    ], answer=data.get("answer"))
@@ -0,0 +1,225 @@
+# python
+import queue
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+# 3rd party
+import numpy as np
+import scipy.io.wavfile as wav
+from scipy.signal import resample_poly
+
+
+class AudioSource(ABC):
+    """
+    Base abstract class for all audio sources used by VoiceRecognition.
+
+    Sources push fixed-size mono float32 chunks of shape (block_size, 1) into
+    an internal queue. `read` returns the next chunk, raises `queue.Empty` on
+    timeout and returns None once the source is exhausted.
+
+    Attributes:
+        sample_rate: sample rate of the produced chunks
+        block_size: number of samples per chunk
+        last_chunk_time: wall clock time when the last read chunk became available
+        last_read_time: wall clock time when the last chunk was read
+    """
+
+    def __init__(self, sample_rate: int = 16000, block_size: int = 1600):
+        """
+        Initializes the AudioSource class.
+
+        Args:
+            sample_rate: sample rate of the produced chunks
+            block_size: number of samples per chunk
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.queue: queue.Queue = queue.Queue()
+        self.last_chunk_time = 0.0
+        self.last_read_time = 0.0
+
+    def _put(self, chunk: Optional[np.ndarray]) -> None:
+        """Push a chunk (or None for end of stream) with its arrival time."""
+        self.queue.put((time.perf_counter(), chunk))
+
+    def read(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """Read the next chunk.
+
+        Args:
+            timeout (float): Seconds to wait for a chunk.
+
+        Returns:
+            Optional[np.ndarray]: The next chunk or None at the end of stream.
+        """
+        arrival_time, chunk = self.queue.get(timeout=timeout)
+        self.last_chunk_time = arrival_time
+        self.last_read_time = time.perf_counter()
+        return chunk
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start producing audio chunks."""
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop producing audio chunks and release resources."""
+        pass
+
+
+class MicrophoneSource(AudioSource):
+    """Live microphone input through sounddevice."""
+
+    def __init__(self, sample_rate: int = 16000, block_size: int = 1600):
+        super().__init__(sample_rate, block_size)
+        self.stream = None
+
+    def _callback(self, indata, frames, time, status):
+        """Capture audio into buffer"""
+        if status:
+            print(f"Status: {status}")
+        self._put(indata.copy())
+
+    def start(self) -> None:
+        # Imported here so offline sources work without PortAudio installed
+        import sounddevice as sd
+
+        self.stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            callback=self._callback,
+            blocksize=self.block_size
+        )
+        self.stream.start()
+
+    def stop(self) -> None:
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+class ArraySource(AudioSource):
+    """
+    Replays a NumPy array as a stream of chunks.
+
+    With `speed=1.0` chunks are released at real time, `speed=2.0` twice as
+    fast and `speed=0` as fast as the consumer reads them.
+    """
+
+    def __init__(self, audio: np.ndarray, sample_rate: int = 16000,
+                 block_size: int = 1600, speed: float = 1.0):
+        """
+        Initializes the ArraySource class.
+
+        Args:
+            audio: mono audio samples, float32 in [-1, 1] or int16
+            sample_rate: sample rate of `audio`
+            block_size: number of samples per chunk
+            speed: replay speed relative to real time, 0 for no pacing
+        """
+        super().__init__(sample_rate, block_size)
+        self.audio = to_float32_mono(audio)
+        self.speed = speed
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio in seconds."""
+        return len(self.audio) / self.sample_rate
+
+    def _feed(self) -> None:
+        start = time.perf_counter()
+        for i, offset in enumerate(range(0, len(self.audio), self.block_size)):
+            if self._stop_event.is_set():
+                break
+            if self.speed > 0:
+                due = start + i * self.block_size / self.sample_rate / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            chunk = self.audio[offset:offset + self.block_size]
+            if len(chunk) < self.block_size:
+                chunk = np.pad(chunk, (0, self.block_size - len(chunk)))
+            self._put(chunk.reshape(-1, 1))
+        self._put(None)
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class FileSource(ArraySource):
+    """Replays a WAV file, converted to mono and resampled if needed."""
+
+    def __init__(self, path: str, sample_rate: int = 16000,
+                 block_size: int = 1600, speed: float = 1.0):
+        file_rate, audio = wav.read(path)
+        audio = to_float32_mono(audio)
+        if file_rate != sample_rate:
+            audio = resample_poly(audio, sample_rate, file_rate).astype(np.float32)
+        super().__init__(audio, sample_rate, block_size, speed)
+        self.path = path
+
+
+class StdinPCMSource(AudioSource):
+    """Reads raw signed 16-bit little-endian mono PCM from a binary stream."""
+
+    def __init__(self, sample_rate: int = 16000, block_size: int = 1600,
+                 stream: Optional[BinaryIO] = None):
+        super().__init__(sample_rate, block_size)
+        self.stream = stream or sys.stdin.buffer
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _feed(self) -> None:
+        chunk_bytes = self.block_size * 2
+        while not self._stop_event.is_set():
+            data = self.stream.read(chunk_bytes)
+            if not data:
+                break
+            samples = np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2")
+            chunk = to_float32_mono(samples)
+            if len(chunk) < self.block_size:
+                chunk = np.pad(chunk, (0, self.block_size - len(chunk)))
+            self._put(chunk.reshape(-1, 1))
+        self._put(None)
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def to_float32_mono(audio: np.ndarray) -> np.ndarray:
+    """Convert PCM samples of any common dtype to a 1-D float32 array in [-1, 1].
+
+    Args:
+        audio (np.ndarray): Samples with shape (n,) or (n, channels).
+
+    Returns:
+        np.ndarray: Mono float32 samples.
+    """
+    if audio.dtype == np.int16:
+        audio = audio / 32768.0
+    elif audio.dtype == np.int32:
+        audio = audio / 2147483648.0
+    elif audio.dtype == np.uint8:
+        audio = (audio.astype(np.float32) - 128.0) / 128.0
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio.astype(np.float32, copy=False)
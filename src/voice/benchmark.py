@@ -0,0 +1,180 @@
+"""Offline benchmark for the voice pipeline.
+
+Replays a directory of WAV files through the same segmentation and
+transcription path as the live microphone and reports real-time factor,
+end-of-speech-to-text latency, segment counts and word error rate against
+reference transcripts (`<name>.txt` next to `<name>.wav`).
+
+Usage:
+    python -m src.voice.benchmark path/to/wavs --speed 0
+"""
+# python
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional
+# project
+from src.voice.audio_sources import FileSource
+from src.voice.voice_recognition import VoiceRecognition
+# 3rd party
+import numpy as np
+
+
+class BenchmarkRecognition(VoiceRecognition):
+    """VoiceRecognition that records timings for every transcribed block."""
+
+    def __init__(self, **kwargs):
+        super().__init__(on_transcribe_callback=None, **kwargs)
+        self.texts: List[str] = []
+        self.latencies: List[float] = []
+        self.transcribe_time = 0.0
+
+    def _transcribe_block(self, block: np.ndarray) -> List[str]:
+        start = time.perf_counter()
+        texts = super()._transcribe_block(block)
+        end = time.perf_counter()
+        self.transcribe_time += end - start
+        # Time from the chunk that closed the segment to the text being ready. Paced
+        # sources release chunks as a microphone would, so the time a chunk waited
+        # in the queue counts. Unpaced ones queue the whole file at once, there the
+        # chunk only becomes due when the recognizer reads it.
+        if self.source is not None:
+            paced = getattr(self.source, "speed", 1.0) > 0
+            due = self.source.last_chunk_time if paced else self.source.last_read_time
+            self.latencies.append(end - due)
+        self.texts.extend(texts)
+        return texts
+
+    def run(self, source: FileSource) -> None:
+        """Replay one source until it is exhausted."""
+        self.texts, self.latencies, self.transcribe_time = [], [], 0.0
+        self.audio_source = source
+        self.start_recording()
+
+
+def normalize_text(text: str) -> List[str]:
+    """Lowercase the text, strip punctuation and split it into words."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Compute the word error rate between a reference and a hypothesis.
+
+    Args:
+        reference (str): Reference transcript.
+        hypothesis (str): Recognized text.
+
+    Returns:
+        float: (substitutions + deletions + insertions) / reference words.
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1,
+                             current[j - 1] + 1,
+                             previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def benchmark_directory(directory: Path, speed: float = 0.0, model_size: str = "tiny",
+                        block_duration: int = 4) -> dict:
+    """Run the benchmark over every WAV file in a directory.
+
+    Args:
+        directory (Path): Directory with `.wav` files and optional `.txt` references.
+        speed (float): Replay speed relative to real time, 0 for no pacing.
+        model_size (str): Whisper model size.
+        block_duration (int): Maximum block duration in seconds.
+
+    Returns:
+        dict: Per-file results and a summary.
+    """
+    recognizer = BenchmarkRecognition(BLOCK_DURATION=block_duration, model_size=model_size)
+    recognizer._initialize_model()
+
+    files = []
+    for wav_path in sorted(directory.glob("*.wav")):
+        source = FileSource(str(wav_path), sample_rate=recognizer.SAMPLE_RATE,
+                            block_size=int(recognizer.SAMPLE_RATE * recognizer.CHUNK_DURATION),
+                            speed=speed)
+        start = time.perf_counter()
+        recognizer.run(source)
+        wall_time = time.perf_counter() - start
+
+        hypothesis = " ".join(recognizer.texts)
+        reference_path = wav_path.with_suffix(".txt")
+        wer: Optional[float] = None
+        if reference_path.exists():
+            wer = word_error_rate(reference_path.read_text(encoding="utf-8"), hypothesis)
+
+        files.append({
+            "file": wav_path.name,
+            "audio_seconds": round(source.duration, 3),
+            "wall_rtf": round(wall_time / source.duration, 4) if source.duration else None,
+            "compute_rtf": round(recognizer.transcribe_time / source.duration, 4) if source.duration else None,
+            "segments": len(recognizer.latencies),
+            "latencies": [round(latency, 4) for latency in recognizer.latencies],
+            "wer": None if wer is None else round(wer, 4),
+            "text": hypothesis,
+        })
+
+    audio_seconds = sum(f["audio_seconds"] for f in files)
+    latencies = [latency for f in files for latency in f["latencies"]]
+    wers = [f["wer"] for f in files if f["wer"] is not None]
+    summary = {
+        "files": len(files),
+        "audio_seconds": round(audio_seconds, 3),
+        "segments": len(latencies),
+        "compute_rtf": round(sum(f["compute_rtf"] * f["audio_seconds"] for f in files
+                                 if f["compute_rtf"] is not None) / audio_seconds, 4)
+        if audio_seconds else None,
+        "latency_mean": round(statistics.mean(latencies), 4) if latencies else None,
+        "latency_p50": round(float(np.percentile(latencies, 50)), 4) if latencies else None,
+        "latency_p95": round(float(np.percentile(latencies, 95)), 4) if latencies else None,
+        "wer_mean": round(statistics.mean(wers), 4) if wers else None,
+    }
+    return {"files": files, "summary": summary}
+
+
+def print_report(results: dict) -> None:
+    """Print benchmark results as a table."""
+    print(f"{'file':<32}{'audio s':>9}{'RTF':>8}{'segs':>6}{'lat mean':>10}{'WER':>8}")
+    for f in results["files"]:
+        latency = statistics.mean(f["latencies"]) if f["latencies"] else float("nan")
+        wer = "-" if f["wer"] is None else f"{f['wer']:.3f}"
+        print(f"{f['file']:<32}{f['audio_seconds']:>9.2f}{f['compute_rtf'] or 0.0:>8.3f}"
+              f"{f['segments']:>6}{latency:>10.3f}{wer:>8}")
+    print("Summary:")
+    for key, value in results["summary"].items():
+        print(f"  {key}: {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay WAV files through the voice pipeline.")
+    parser.add_argument("directory", type=Path, help="Directory with .wav files and .txt references")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay speed relative to real time (0 = as fast as possible)")
+    parser.add_argument("--model", default="tiny", help="Whisper model size")
+    parser.add_argument("--block-duration", type=int, default=4,
+                        help="Maximum block duration in seconds")
+    parser.add_argument("--json", type=Path, help="Write the full results to a JSON file")
+    args = parser.parse_args()
+
+    results = benchmark_directory(args.directory, speed=args.speed, model_size=args.model,
+                                  block_duration=args.block_duration)
+    print_report(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
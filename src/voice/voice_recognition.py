@@ -1,9 +1,12 @@
+# python
+from typing import List, Optional
+# project
+from src.voice.audio_sources import AudioSource, MicrophoneSource
+from src.voice.wake_word import WakeWordDetector
+from src.pages.update_scheduler import get_update_scheduler
 # 3rd party
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
 import queue
-import tempfile
 from faster_whisper import WhisperModel
 import torch
 import flet as ft
@@ -12,124 +15,221 @@ import flet as ft
 class VoiceRecognition:
     """Class for real-time voice recognition using Whisper model."""
 
-    def __init__(self, on_transcribe_callback, SAMPLE_RATE: int = 16000, BLOCK_DURATION: int = 4):
+    def __init__(self, on_transcribe_callback, SAMPLE_RATE: int = 16000, BLOCK_DURATION: int = 4,
+                 audio_source: Optional[AudioSource] = None, model_size: str = "tiny",
+                 wake_word: Optional[WakeWordDetector] = None, awake_timeout: float = 8.0,
+                 on_wake_callback=None, wake_word_fallback: bool = False):
         self.SAMPLE_RATE = SAMPLE_RATE
         self.BLOCK_DURATION = BLOCK_DURATION
+        self.CHUNK_DURATION = 0.1  # 100ms chunks
         self.recording = False
-        self.queue = queue.Queue()
-        self.stream = None
+        self.audio_source = audio_source
+        self.source = None
         self.silence_threshold = 0.005
         self.min_speech_duration = 1.0
         self.pause_duration = 0.7
         self.model = None
+        self.model_size = model_size
         self.on_transcribe_callback = on_transcribe_callback
+        # Wake word mode: Whisper only runs for awake_timeout seconds of
+        # silence after the wake word fires
+        self.wake_word = wake_word
+        self.awake_timeout = awake_timeout
+        self.on_wake_callback = on_wake_callback
+        self.awake = wake_word is None
+        self._awake_remaining = 0.0
+        # Checking speech bursts with Whisper costs the CPU the wake word saves, so
+        # without enrolled templates it is only done when asked for
+        if wake_word_fallback and self.wake_word is not None and self.wake_word.fallback_transcribe is None:
+            self.wake_word.fallback_transcribe = self._transcribe_wake_word
+        self._reset_segmenter()
 
     def _initialize_model(self):
         """Initialize the Whisper model if not already initialized."""
         if self.model is None:
             print("Initializing voice recognition model...")
-            self.model = WhisperModel("tiny", compute_type="int8",
+            self.model = WhisperModel(self.model_size, compute_type="int8",
                                       device="cuda" if torch.cuda.is_available() else "cpu")
             print("Model initialized!")
 
-    def _callback(self, indata, frames, time, status):
-        """Capture audio into buffer"""
-        if status:
-            print(f"Status: {status}")
-        self.queue.put(indata.copy())
+    def _create_source(self) -> AudioSource:
+        """Return the configured audio source or a live microphone."""
+        if self.audio_source is not None:
+            return self.audio_source
+        return MicrophoneSource(sample_rate=self.SAMPLE_RATE,
+                                block_size=int(self.SAMPLE_RATE * self.CHUNK_DURATION))
 
     def _is_silent(self, audio_data: np.ndarray) -> bool:
         """Check if the audio chunk is silent."""
         return np.max(np.abs(audio_data)) < self.silence_threshold
 
-    def _record_and_transcribe(self, container: ft.Container, page: ft.Page) -> None:
+    def _reset_segmenter(self) -> None:
+        """Reset the speech segmentation state."""
+        self._chunks: List[np.ndarray] = []
+        self._buffered = 0
+        self._silence_duration = 0.0
+        self._speech_duration = 0.0
+
+    def _take_buffer(self) -> np.ndarray:
+        """Return the buffered audio as one block and reset the segmenter."""
+        block = np.concatenate(self._chunks, axis=0) if self._chunks \
+            else np.empty((0, 1), dtype=np.float32)
+        self._reset_segmenter()
+        return block
+
+    def _segment(self, data: np.ndarray, silent: bool) -> Optional[np.ndarray]:
+        """Feed one chunk to the segmenter.
+
+        A block is cut when the buffer reaches BLOCK_DURATION seconds or when a
+        pause follows enough speech.
+
+        Args:
+            data (np.ndarray): Audio chunk of shape (n, 1).
+            silent (bool): Whether the chunk is silent.
+
+        Returns:
+            Optional[np.ndarray]: Audio block to transcribe, if one is ready.
+        """
+        chunk_duration = len(data) / self.SAMPLE_RATE
+        if silent:
+            self._silence_duration += chunk_duration
+        else:
+            self._silence_duration = 0.0
+            self._speech_duration += chunk_duration
+
+        self._chunks.append(data)
+        self._buffered += len(data)
+
+        if self._buffered >= self.SAMPLE_RATE * self.BLOCK_DURATION:
+            return self._take_buffer()
+        if self._silence_duration >= self.pause_duration:
+            if self._speech_duration >= self.min_speech_duration:
+                return self._take_buffer()
+            if self._speech_duration == 0:
+                # Drop leading silence instead of growing the buffer
+                self._reset_segmenter()
+        return None
+
+    def _flush(self) -> Optional[np.ndarray]:
+        """Return the remaining buffered speech at the end of a stream."""
+        if self._speech_duration >= self.min_speech_duration:
+            return self._take_buffer()
+        self._reset_segmenter()
+        return None
+
+    def _transcribe_block(self, block: np.ndarray) -> List[str]:
+        """Transcribe one audio block.
+
+        Args:
+            block (np.ndarray): Audio block of shape (n, 1).
+
+        Returns:
+            List[str]: Transcribed segment texts.
+        """
+        if not self.model:
+            print("Warning: Model not initialized")
+            return []
+        print("Recognizing...")
+        segments, _ = self.model.transcribe(block.reshape(-1))
+        texts = []
+        for seg in segments:
+            transcribed_text = seg.text.strip()
+            print(f"Transcribed: {transcribed_text}")
+            texts.append(transcribed_text)
+        return texts
+
+    def _transcribe_wake_word(self, audio: np.ndarray) -> str:
+        """Cheap greedy transcription of a short utterance for wake word matching."""
+        if not self.model:
+            return ""
+        segments, _ = self.model.transcribe(audio.reshape(-1), beam_size=1,
+                                            without_timestamps=True,
+                                            condition_on_previous_text=False)
+        return " ".join(seg.text.strip() for seg in segments)
+
+    def _update_wake_state(self, data: np.ndarray, silent: bool) -> bool:
+        """Run the wake word spotter and track the awake timeout.
+
+        Args:
+            data (np.ndarray): Audio chunk.
+            silent (bool): Whether the chunk is silent.
+
+        Returns:
+            bool: True if the chunk should go to the Whisper pipeline.
+        """
+        if self.wake_word is None:
+            return True
+        if not self.awake:
+            if self.wake_word.process(data):
+                print("Wake word detected")
+                self.awake = True
+                self._awake_remaining = self.awake_timeout
+                self._reset_segmenter()
+                if self.on_wake_callback:
+                    self.on_wake_callback()
+            return False
+
+        if silent:
+            self._awake_remaining -= len(data) / self.SAMPLE_RATE
+        else:
+            self._awake_remaining = self.awake_timeout
+        if self._awake_remaining <= 0:
+            print("Going back to sleep")
+            self._handle_block(self._flush())
+            self.awake = False
+            self.wake_word.reset()
+            return False
+        return True
+
+    def _handle_block(self, block: Optional[np.ndarray]) -> None:
+        """Transcribe a ready block and pass the texts to the callback."""
+        if block is None or len(block) == 0:
+            return
+        for transcribed_text in self._transcribe_block(block):
+            if self.on_transcribe_callback:
+                self.on_transcribe_callback(transcribed_text)
+
+    def _record_and_transcribe(self, container: Optional[ft.Container] = None,
+                               page: Optional[ft.Page] = None) -> None:
         """Record audio and transcribe it using the Whisper model."""
-        # self._initialize_model()
-
-        self.stream = sd.InputStream(
-            samplerate=self.SAMPLE_RATE,
-            channels=1,
-            callback=self._callback,
-            blocksize=int(self.SAMPLE_RATE * 0.1)  # 100ms chunks
-        )
-        self.stream.start()
-
-        audio_buffer = np.empty((0, 1), dtype=np.float32)
-        silence_duration = 0
-        speech_duration = 0
-        last_speech_time = 0
+        self.source = self._create_source()
+        self._reset_segmenter()
+        self.awake = self.wake_word is None
+        if self.wake_word is not None:
+            self.wake_word.reset()
+        self.source.start()
 
         try:
             while self.recording:
                 try:
-                    data = self.queue.get(timeout=0.1)
-                    current_time = len(audio_buffer) / self.SAMPLE_RATE
-
-                    if self._is_silent(data):
-                        container.scale = 1.0
-                        page.update()
-                        silence_duration += 0.1  # 100ms chunk
-                        if silence_duration >= self.pause_duration and speech_duration >= self.min_speech_duration:
-                            block = audio_buffer
-                            audio_buffer = np.empty((0, 1), dtype=np.float32)
-                            silence_duration = 0
-                            speech_duration = 0
-                    else:
-                        container.scale = 1.2
-                        page.update()
-                        silence_duration = 0
-                        speech_duration = current_time - last_speech_time
-                        last_speech_time = current_time
-
-                    audio_buffer = np.concatenate((audio_buffer, data), axis=0)
-
-                    process_buffer = False
-                    block = None
-
-                    if len(audio_buffer) >= self.SAMPLE_RATE * self.BLOCK_DURATION:
-                        block = audio_buffer[:self.SAMPLE_RATE *
-                                             self.BLOCK_DURATION]
-                        audio_buffer = audio_buffer[self.SAMPLE_RATE *
-                                                    self.BLOCK_DURATION:]
-                        process_buffer = True
-
-                    elif silence_duration >= self.pause_duration and speech_duration >= self.min_speech_duration:
-                        block = audio_buffer
-                        audio_buffer = np.empty((0, 1), dtype=np.float32)
-                        process_buffer = True
-                        silence_duration = 0
-                        speech_duration = 0
-                    if process_buffer and block is not None and len(block) > 0:
-
-                        if self.model:
-                            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmpfile:
-                                wav.write(tmpfile.name,
-                                          self.SAMPLE_RATE, block)
-                                print("Recognizing...")
-                                segments, _ = self.model.transcribe(
-                                    tmpfile.name)
-
-                                for seg in segments:
-                                    transcribed_text = seg.text.strip()
-                                    print(f"Transcribed: {transcribed_text}")
-                                    if self.on_transcribe_callback:
-                                        self.on_transcribe_callback(
-                                            transcribed_text)
-                        else:
-                            print("Warning: Model not initialized")
+                    data = self.source.read(timeout=0.1)
                 except queue.Empty:
-                    if not self.recording:
-                        break
                     continue
+                if data is None:
+                    # End of a finite source
+                    self._handle_block(self._flush())
+                    break
+
+                silent = self._is_silent(data)
+                if not self._update_wake_state(data, silent):
+                    continue
+                scale = 1.0 if silent else 1.2
+                if container is not None and page is not None and container.scale != scale:
+                    # Only the microphone button changes, and only when speech starts or stops
+                    container.scale = scale
+                    get_update_scheduler(page).schedule(container)
+
+                self._handle_block(self._segment(data, silent))
         except KeyboardInterrupt:
             print("Stopped by user.")
         finally:
-            if self.stream:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
+            self.recording = False
+            if self.source:
+                self.source.stop()
+                self.source = None
 
-    def start_recording(self, container: ft.Container, page: ft.Page):
+    def start_recording(self, container: Optional[ft.Container] = None,
+                        page: Optional[ft.Page] = None):
         """Start recording audio."""
         if not self.recording:
             print("Starting audio recording...")
@@ -137,14 +237,12 @@ class VoiceRecognition:
             self.recording = True
             self._record_and_transcribe(container=container, page=page)
 
-    def stop_recording(self, container: ft.Container, page: ft.Page):
+    def stop_recording(self, container: Optional[ft.Container] = None,
+                       page: Optional[ft.Page] = None):
         """Stop recording audio."""
         if self.recording:
             print("Stopping audio recording...")
-            container.scale = 1.0
-            page.update()
+            if container is not None and page is not None:
+                container.scale = 1.0
+                get_update_scheduler(page).schedule(container)
             self.recording = False
-            if self.stream:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
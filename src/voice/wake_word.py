@@ -0,0 +1,309 @@
+"""Low-CPU wake word spotting for VoiceRecognition.
+
+Audio is gated by a cheap energy check, so silent chunks cost almost nothing.
+Voiced frames are turned into MFCC features and, once a short utterance ends,
+compared with enrolled templates using dynamic time warping. The match
+threshold is calibrated from the distances between the templates, so at
+least MIN_TEMPLATES are needed. Without them the detector can fall back to
+a transcriber callback run on short speech bursts, which costs far more CPU
+and is only used when it is enabled explicitly.
+
+Enroll templates with:
+    python -m src.voice.wake_word enroll --count 3
+"""
+# python
+import argparse
+import difflib
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+# 3rd party
+import numpy as np
+import scipy.io.wavfile as wav
+from scipy.fft import dct
+# project
+from src.voice.audio_sources import to_float32_mono
+
+TEMPLATES_DIR = Path("src/voice/wake_word_templates")
+# Templates needed to calibrate the match threshold from their spread
+MIN_TEMPLATES = 2
+
+
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Build a triangular mel filterbank of shape (n_mels, n_fft // 2 + 1)."""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+    filterbank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            filterbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filterbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filterbank
+
+
+class MFCCExtractor:
+    """Streaming MFCC extractor with 25 ms frames and a 10 ms hop."""
+
+    def __init__(self, sample_rate: int = 16000, n_mels: int = 26, n_ceps: int = 13):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * 0.025)
+        self.hop_length = int(sample_rate * 0.010)
+        self.n_fft = 512
+        self.n_ceps = n_ceps
+        self.window = np.hamming(self.frame_length).astype(np.float32)
+        self.filterbank = _mel_filterbank(sample_rate, self.n_fft, n_mels)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the carried-over samples between chunks."""
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def __call__(self, samples: np.ndarray) -> np.ndarray:
+        """Compute MFCC frames for a chunk, continuing from the previous one.
+
+        Args:
+            samples (np.ndarray): Mono float32 samples.
+
+        Returns:
+            np.ndarray: Features of shape (frames, n_ceps).
+        """
+        signal = np.concatenate((self._tail, samples.reshape(-1)))
+        n_frames = 1 + (len(signal) - self.frame_length) // self.hop_length
+        if n_frames <= 0:
+            self._tail = signal
+            return np.empty((0, self.n_ceps), dtype=np.float32)
+        self._tail = signal[n_frames * self.hop_length:]
+
+        emphasized = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+        indices = (np.arange(self.frame_length)[None, :]
+                   + self.hop_length * np.arange(n_frames)[:, None])
+        frames = emphasized[indices] * self.window
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2 / self.n_fft
+        mel_energies = np.log(power @ self.filterbank.T + 1e-10)
+        return dct(mel_energies, type=2, axis=1, norm="ortho")[:, :self.n_ceps].astype(np.float32)
+
+
+def dtw_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Length-normalized DTW distance between two feature sequences.
+
+    Args:
+        a (np.ndarray): Features of shape (n, d).
+        b (np.ndarray): Features of shape (m, d).
+
+    Returns:
+        float: Accumulated Euclidean distance divided by n + m.
+    """
+    cost = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+    n, m = cost.shape
+    previous = np.full(m + 1, np.inf)
+    previous[0] = 0.0
+    for i in range(n):
+        current = np.full(m + 1, np.inf)
+        # Vertical and diagonal moves are vectorized, horizontal ones need a scan
+        step = cost[i] + np.minimum(previous[1:], previous[:-1])
+        for j in range(m):
+            current[j + 1] = min(step[j], cost[i, j] + current[j])
+        previous = current
+    return float(previous[m] / (n + m))
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    """Apply cepstral mean normalization."""
+    return features - features.mean(axis=0, keepdims=True)
+
+
+class WakeWordDetector:
+    """
+    Keyword spotter that decides whether a short utterance is the wake word.
+
+    Attributes:
+        phrase: wake phrase, used by the transcriber fallback
+        templates: normalized MFCC templates of the enrolled wake word, only
+            used once there are MIN_TEMPLATES of them
+        threshold: maximum DTW distance accepted as a match, None until calibrated
+    """
+
+    def __init__(self, phrase: str = "hey slothy", sample_rate: int = 16000,
+                 templates_dir: Path = TEMPLATES_DIR, sensitivity: float = 1.3,
+                 energy_threshold: float = 0.005,
+                 fallback_transcribe: Optional[Callable[[np.ndarray], str]] = None):
+        """
+        Initializes the WakeWordDetector class.
+
+        Args:
+            phrase: wake phrase
+            sample_rate: sample rate of the incoming chunks
+            templates_dir: directory with enrolled `.wav` templates
+            sensitivity: threshold multiplier over the spread between templates
+            energy_threshold: peak amplitude below which a chunk counts as silent
+            fallback_transcribe: transcriber used when fewer than MIN_TEMPLATES are enrolled
+        """
+        self.phrase = phrase
+        self.sample_rate = sample_rate
+        self.templates_dir = Path(templates_dir)
+        self.sensitivity = sensitivity
+        self.energy_threshold = energy_threshold
+        self.fallback_transcribe = fallback_transcribe
+        self.min_utterance = 0.3
+        self.max_utterance = 2.0
+        self.end_silence = 0.3
+        self.extractor = MFCCExtractor(sample_rate)
+        self.templates: List[np.ndarray] = []
+        self.threshold: Optional[float] = None
+        self.load_templates()
+        self.reset()
+
+    def load_templates(self) -> None:
+        """Load enrolled templates and calibrate the match threshold.
+
+        The threshold is the mean DTW distance between the templates times
+        `sensitivity`. A single template gives no spread to calibrate from,
+        so templates are ignored until there are MIN_TEMPLATES of them.
+        """
+        templates = []
+        if self.templates_dir.exists():
+            for path in sorted(self.templates_dir.glob("*.wav")):
+                rate, audio = wav.read(path)
+                templates.append(self._features(to_float32_mono(audio), rate))
+        self.templates, self.threshold = [], None
+        if len(templates) >= MIN_TEMPLATES:
+            distances = [dtw_distance(a, b) for i, a in enumerate(templates)
+                         for b in templates[i + 1:]]
+            self.templates = templates
+            self.threshold = float(np.mean(distances)) * self.sensitivity
+        elif templates:
+            print(f"Warning: {len(templates)} wake word template found, enroll at least "
+                  f"{MIN_TEMPLATES} to use them.")
+
+    @property
+    def ready(self) -> bool:
+        """True if the detector can spot the wake word, by templates or the fallback."""
+        return bool(self.templates) or self.fallback_transcribe is not None
+
+    def _features(self, audio: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
+        extractor = MFCCExtractor(sample_rate or self.sample_rate)
+        return _normalize(extractor(audio))
+
+    def reset(self) -> None:
+        """Forget the current utterance."""
+        self.extractor.reset()
+        self._features_buffer: List[np.ndarray] = []
+        self._audio_buffer: List[np.ndarray] = []
+        self._speech = 0.0
+        self._silence = 0.0
+
+    def process(self, chunk: np.ndarray) -> bool:
+        """Feed one audio chunk.
+
+        Args:
+            chunk (np.ndarray): Mono float32 chunk.
+
+        Returns:
+            bool: True when the chunk completes a wake word utterance.
+        """
+        duration = len(chunk) / self.sample_rate
+        silent = np.max(np.abs(chunk)) < self.energy_threshold
+        if silent and self._speech == 0:
+            # Idle path: nothing but the peak check above
+            return False
+
+        if silent:
+            self._silence += duration
+        else:
+            self._silence = 0.0
+            self._speech += duration
+
+        if self._speech > self.max_utterance:
+            # Too long for a wake word, wait for the next pause
+            if silent and self._silence >= self.end_silence:
+                self.reset()
+            else:
+                self._features_buffer, self._audio_buffer = [], []
+            return False
+
+        if not silent:
+            # Trailing silence is left out so it does not skew the comparison
+            if self.templates:
+                self._features_buffer.append(self.extractor(chunk))
+            else:
+                self._audio_buffer.append(chunk.reshape(-1))
+
+        if self._silence < self.end_silence:
+            return False
+
+        detected = self._speech >= self.min_utterance and self._matches()
+        self.reset()
+        return detected
+
+    def _matches(self) -> bool:
+        """Check the buffered utterance against the templates or the phrase."""
+        if self.templates:
+            features = _normalize(np.concatenate(self._features_buffer))
+            return min(dtw_distance(features, t) for t in self.templates) <= self.threshold
+        if self.fallback_transcribe and self._audio_buffer:
+            text = self.fallback_transcribe(np.concatenate(self._audio_buffer))
+            return self.matches_phrase(text)
+        return False
+
+    def matches_phrase(self, text: str) -> bool:
+        """Fuzzy-compare a transcript with the wake phrase."""
+        text = re.sub(r"[^\w\s]", "", text.lower()).strip()
+        phrase = self.phrase.lower()
+        if not text:
+            return False
+        return phrase in text or difflib.SequenceMatcher(None, text, phrase).ratio() >= 0.75
+
+
+def enroll(count: int = 3, phrase: str = "hey slothy", templates_dir: Path = TEMPLATES_DIR,
+           sample_rate: int = 16000) -> None:
+    """Record wake word templates from the microphone.
+
+    Args:
+        count (int): Number of templates to record, at least MIN_TEMPLATES.
+        phrase (str): Phrase the user is asked to say.
+        templates_dir (Path): Where to save the templates.
+        sample_rate (int): Recording sample rate.
+    """
+    import sounddevice as sd
+
+    if count < MIN_TEMPLATES:
+        raise ValueError(f"At least {MIN_TEMPLATES} templates are needed to calibrate the threshold.")
+    templates_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        input(f"[{i + 1}/{count}] Press Enter and say '{phrase}'...")
+        audio = sd.rec(int(2.5 * sample_rate), samplerate=sample_rate, channels=1, dtype="float32")
+        sd.wait()
+        audio = audio.reshape(-1)
+        voiced = np.flatnonzero(np.abs(audio) >= 0.005)
+        if len(voiced) == 0:
+            print("Nothing was heard, try again.")
+            continue
+        margin = int(0.1 * sample_rate)
+        audio = audio[max(voiced[0] - margin, 0):voiced[-1] + margin]
+        path = templates_dir / f"template_{int(time.time() * 1000)}.wav"
+        wav.write(path, sample_rate, audio)
+        print(f"Saved {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wake word tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    enroll_parser = subparsers.add_parser("enroll", help="Record wake word templates")
+    enroll_parser.add_argument("--count", type=int, default=3)
+    enroll_parser.add_argument("--phrase", default="hey slothy")
+    args = parser.parse_args()
+    if args.command == "enroll":
+        enroll(count=args.count, phrase=args.phrase)
+
+
+if __name__ == "__main__":
+    main()